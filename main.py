@@ -18,9 +18,28 @@ import json
 import os
 import pyttsx3
 from PIL import Image, ImageTk  
-import numpy as np
 import screeninfo
 import keyboard
+import sys
+from pathlib import Path
+
+# Share gesture recognition with the packaged desktop app in src/
+SRC_DIR = Path(__file__).resolve().parent / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from jarvis.desktop.motion.gesture_recognizer import GestureRecognizer
+from jarvis.desktop.motion.landmarks import landmarks_to_array
+from jarvis.desktop.motion.temporal import GestureSmoother
+from jarvis.desktop.motion.vision_engine import VisionEngine
+from jarvis.desktop.camera.frame_buffer import FrameRingBuffer
+from jarvis.desktop.camera.governor import PerformanceGovernor
+from jarvis.desktop.camera.video_recorder import VideoRecorder
+from jarvis.desktop.camera.preroll import PrerollBuffer, parse_duration
+from jarvis.desktop.image_writer import ImageWriter
+from jarvis.config.settings import (
+    CAMERA_INDEX, VIDEO_OVERLAY, PREROLL_GESTURE, SCREENSHOT_FORMAT, PICTURE_FORMAT
+)
 
 class JarvisApp:
     def __init__(self, root):
@@ -40,27 +59,31 @@ class JarvisApp:
             self.microphone = None
             self.microphone_available = False
         
-        if MEDIAPIPE_AVAILABLE:
-            self.hands = mp.solutions.hands.Hands(
-                static_image_mode=False,
-                max_num_hands=2,
-                min_detection_confidence=0.7,
-                min_tracking_confidence=0.5
-            )
-            self.np_pose = mp.solutions.pose
-            self.drawing_utils = mp.solutions.drawing_utils
-        else:
-            self.hands = None
-            self.np_pose = None
-            self.drawing_utils = None
+        # Hands, pose and segmentation models are built once and reused for every frame
+        self.vision_engine = VisionEngine(hands=False)
+        self.gesture_recognizer = GestureRecognizer(with_detector=False)
+        # Encodes recorded frames on a background thread
+        self.video_recorder = VideoRecorder()
+        # Recent footage kept in memory for "save last N seconds"
+        self.preroll_buffer = PrerollBuffer()
+        self.preroll_buffer.on_saved = lambda success, msg: self.log_message(msg)
+        # Screenshots and pictures are encoded and saved in the background
+        self.image_writer = ImageWriter()
         
         self.voice_active = False
         self.motion_active = False
         self.camera_active = False
         self.cap = None
+        # The display loop owns self.cap; other threads take frames from here
+        self.frame_handoff = FrameRingBuffer(2)
         
-        self.last_gesture = None
-        self.gesture_cooldown = 0
+        # Debounces per-frame predictions over time, like the desktop app's pipeline
+        self.gesture_smoother = GestureSmoother()
+        # Trades capture resolution, vision stride and display rate for latency, like the desktop app
+        self.governor = PerformanceGovernor()
+        self.vision_frames = 0
+        self.last_vision = None
+        self.last_vision_shape = None
         
         self.setup_gui()
         
@@ -170,10 +193,17 @@ class JarvisApp:
     def update_camera_feed(self):
         if self.camera_active and self.cap is not None:
             ret, frame = self.cap.read()
+            started = time.monotonic()
             if ret:
-                # Process hand gestures if motion control is active
-                if self.motion_active and MEDIAPIPE_AVAILABLE:
-                    frame = self.process_hand_gestures(frame)
+                self.frame_handoff.write_slot(frame.shape, frame.dtype)[...] = frame
+                self.frame_handoff.publish()
+                if not VIDEO_OVERLAY:
+                    self.record_frame(frame)
+                # Run hand tracking (if motion control is active), pose and segmentation
+                if MEDIAPIPE_AVAILABLE:
+                    frame = self.process_vision_frame(frame)
+                if VIDEO_OVERLAY:
+                    self.record_frame(frame)
                 
                 # Convert frame for display
                 frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -183,43 +213,67 @@ class JarvisApp:
                 
                 self.camera_label.config(image=img)
                 self.camera_label.image = img
+                self.governor.display_latency.record(time.monotonic() - started)
             else:
                 # Camera read failed, try to reinitialize
                 if self.camera_active:
                     self.log_message("Camera read failed, attempting to reinitialize...")
                     try:
                         self.cap.release()
-                        self.cap = cv2.VideoCapture(0)
+                        self.cap = cv2.VideoCapture(CAMERA_INDEX)
                     except Exception as e:
                         self.log_message(f"Camera reinitialization failed: {str(e)}")
             
-            self.root.after(10, self.update_camera_feed)
+            self.adjust_quality()
+            # Refresh at the governed display rate, minus the time this update took
+            remaining = self.governor.display_interval - (time.monotonic() - started)
+            self.root.after(max(1, int(remaining * 1000)), self.update_camera_feed)
+
+    def adjust_quality(self):
+        """Let the governor trade capture resolution, vision stride and display FPS for latency"""
+        if self.governor.update():
+            width, height = self.governor.resolution
+            # The display loop owns self.cap, so the resolution is changed here
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+            stats = self.governor.stats()
+            self.log_message(
+                f"Performance: {stats['resolution']}, vision every "
+                f"{stats['inference_stride']} frame(s), {stats['display_fps']} FPS display"
+            )
+
+    def record_frame(self, frame):
+        """Hand a frame to the video recorder and the pre-roll buffer"""
+        if self.video_recorder.is_recording():
+            self.video_recorder.write(frame)
+        self.preroll_buffer.add(frame)
 
-    def process_hand_gestures(self, frame):
-        if not MEDIAPIPE_AVAILABLE or self.hands is None:
+    def process_vision_frame(self, frame):
+        """Run the enabled vision models on a frame, draw their results and handle gestures"""
+        self.vision_engine.enable("hands", self.motion_active)
+        self.vision_frames += 1
+        # Under load the governor runs the models on every Nth frame only; the
+        # frames in between are drawn with the previous results
+        reusable = self.last_vision is not None and self.last_vision_shape == frame.shape
+        if reusable and self.vision_frames % self.governor.inference_stride:
+            self.vision_engine.draw(frame, self.last_vision)
             return frame
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(rgb_frame)
+        results = self.vision_engine.process(frame)
+        self.last_vision, self.last_vision_shape = results, frame.shape
+        self.vision_engine.draw(frame, results)
         
-        if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                # Draw hand landmarks
-                if self.drawing_utils:
-                    self.drawing_utils.draw_landmarks(
-                        frame,
-                        hand_landmarks,
-                        mp.solutions.hands.HAND_CONNECTIONS
-                    )
-                
-                # Process gestures
-                if self.gesture_cooldown <= 0:
-                    gesture = self.recognize_gesture(hand_landmarks)
-                    if gesture != self.last_gesture:
-                        self.handle_gesture(gesture)
-                        self.last_gesture = gesture
-                        self.gesture_cooldown = 20  # Prevent rapid gesture changes
-                
-                self.gesture_cooldown = max(0, self.gesture_cooldown - 1)
+        if not self.motion_active:
+            return frame
+        if results.hand_landmarks:
+            points = landmarks_to_array(results.hand_landmarks[0])
+            gesture, confidence = self.gesture_recognizer.classify_points(points)
+        else:
+            gesture, confidence = None, 1.0
+        # Fires once per held gesture, with the cooldown measured in seconds rather than frames
+        fired = self.gesture_smoother.update(gesture, confidence)
+        if fired:
+            self.current_gesture.set(f"Current Gesture: {fired}")
+            self.handle_gesture(fired)
         
         return frame
 
@@ -261,13 +315,12 @@ class JarvisApp:
         """toggle camera control on or off"""
         if not self.camera_active:
             try:
-                self.cap = cv2.VideoCapture(0)
+                self.cap = cv2.VideoCapture(CAMERA_INDEX)
                 self.camera_active = True
                 self.camera_button.config(text="Stop Camera Control")
                 self.camera_status.config(text="Camera: On", fg='green')
                 self.update_camera_feed()
                 self.log_message("Camera control started.")
-                threading.Thread(target=self.update_camera_feed, daemon=True).start()
             except Exception as e:
                 self.log_message("Camera initialization failed: " + str(e))
         else:
@@ -277,6 +330,9 @@ class JarvisApp:
         """Stop camera control"""
         if self.camera_active:
             self.camera_active = False
+            if self.video_recorder.is_recording():
+                self.stop_video()
+            self.preroll_buffer.clear()
             if self.cap is not None:
                 self.cap.release()
                 self.cap = None
@@ -327,16 +383,30 @@ class JarvisApp:
                 self.mute_volume()
             elif "unmute volume" in command:
                 self.unmute_volume()
-            elif "take picture" in command or "take screenshot" in command:
+            elif "burst" in command and ("picture" in command or "photo" in command):
+                self.take_burst(picture=True)
+            elif "burst" in command and "screenshot" in command:
+                self.take_burst(picture=False)
+            elif "take picture" in command or "take a picture" in command:
                 self.take_picture()
-            elif "record video" in command:
-                self.record_video()
-            elif "stop video" in command:
+            elif "take screenshot" in command or "take a screenshot" in command:
+                self.take_screenshot()
+            elif "stop video" in command or "stop recording" in command:
                 self.stop_video()
+            elif "record video" in command or "start recording" in command:
+                self.record_video()
+            elif "save last" in command or "save the last" in command or "save clip" in command:
+                self.save_preroll(command)
             elif "scroll up" in command:
                 self.scroll_up()
             elif "scroll down" in command:
                 self.scroll_down()
+            elif "show pose" in command or "hide pose" in command:
+                self.set_vision_feature("pose", "show pose" in command)
+            elif "segment background" in command or "stop segmentation" in command:
+                self.set_vision_feature("segmentation", "segment background" in command)
+            elif "fast tracking" in command or "accurate tracking" in command:
+                self.set_tracking_quality("accurate tracking" in command)
             elif "what is the time" in command or "tell time" in command:
                 self.tell_time()
             elif "open" in command:
@@ -425,32 +495,73 @@ class JarvisApp:
     def take_screenshot(self):
         """Take a screenshot"""
         self.log_message("Taking screenshot")
-        self.speak_text("Taking screenshot")
-        filename = f"screenshot_{int(time.time())}.png"
-        self.speak_text(f"Saving screenshot as {filename}")
         screenshot = pyautogui.screenshot()
-        screenshot.save(filename)
+        result = self.image_writer.submit(screenshot, "screenshot", SCREENSHOT_FORMAT, on_done=self.log_saved_image)
+        self.speak_text(f"Saving screenshot as {result.filename}")
 
     def take_picture(self):
         """Take a picture from camera"""
-        if self.camera_active and self.cap is not None:
-            ret, frame = self.cap.read()
-            if ret:
-                filename = f"picture_{int(time.time())}.jpg"
-                cv2.imwrite(filename, frame)
-                self.log_message(f"Picture saved as {filename}")
-                self.speak_text(f"Picture saved as {filename}")
+        frame = self.grab_frame()
+        if frame is not None:
+            result = self.image_writer.submit(frame, "picture", PICTURE_FORMAT, on_done=self.log_saved_image)
+            self.speak_text(f"Saving picture as {result.filename}")
+
+    def grab_frame(self, timeout=0.5):
+        """Copy of the next frame the display loop reads, or None if the camera is off"""
+        if not self.camera_active or self.cap is None:
+            return None
+        frame, _, _ = self.frame_handoff.wait(self.frame_handoff.seq, timeout)
+        return frame
+
+    def take_burst(self, picture):
+        """Take a burst of camera pictures or screenshots"""
+        if picture:
+            if not self.camera_active or self.cap is None:
+                self.speak_text("Please start the camera first.")
+                return
+            results = self.image_writer.burst(
+                self.grab_frame, "picture", fmt=PICTURE_FORMAT, on_done=self.log_saved_image
+            )
+        else:
+            results = self.image_writer.burst(
+                pyautogui.screenshot, "screenshot", fmt=SCREENSHOT_FORMAT, on_done=self.log_saved_image
+            )
+        self.speak_text(f"Taking {len(results)} {'pictures' if picture else 'screenshots'}")
+
+    def log_saved_image(self, result):
+        """Log the outcome of a background image save"""
+        if result.error:
+            self.log_message(f"Failed to save {result.filename}: {result.error}")
+        else:
+            self.log_message(f"Saved {result.filename}")
 
     def record_video(self):
         """Start recording video"""
-        self.log_message("Recording video started")
-        self.speak_text("Recording video")
-        # Video recording implementation would go here
+        if not self.camera_active or self.cap is None:
+            self.log_message("Cannot record video: Camera not active")
+            self.speak_text("Please start the camera first.")
+            return
+        success, msg = self.video_recorder.start()
+        self.log_message(msg)
+        if success:
+            self.speak_text("Recording video")
 
     def stop_video(self):
         """Stop recording video"""
-        self.log_message("Recording video stopped")
-        self.speak_text("Recording stopped")
+        success, msg = self.video_recorder.stop()
+        self.log_message(msg)
+        if success:
+            self.speak_text("Recording stopped")
+
+    def save_preroll(self, command=""):
+        """Save the buffered camera feed, e.g. "save last 30 seconds" or "save clip" for all of it"""
+        if not self.preroll_buffer.is_enabled():
+            self.log_message("Pre-roll buffer is disabled; set PREROLL_SECONDS to enable it")
+            self.speak_text("The pre-roll buffer is disabled.")
+            return
+        success, msg = self.preroll_buffer.save(parse_duration(command))
+        self.log_message(msg)
+        self.speak_text("Saving clip" if success else msg)
 
     def scroll_up(self):
         """Scroll up"""
@@ -499,7 +610,7 @@ class JarvisApp:
         """Start camera"""
         if self.cap is None:
             try:
-                self.cap = cv2.VideoCapture(0)
+                self.cap = cv2.VideoCapture(CAMERA_INDEX)
                 self.camera_active = True
                 self.log_message("Camera started")
                 self.update_camera_feed()
@@ -530,6 +641,7 @@ class JarvisApp:
             self.speak_text("Motion control activated")
         else:
             self.motion_active = False
+            self.gesture_smoother.reset()
             self.motion_button.config(text="Start Motion Control")
             self.motion_status.config(text="Motion: Off", fg='red')
             self.log_message("Motion control stopped")
@@ -541,6 +653,26 @@ class JarvisApp:
             self.cap.release()
             self.cap = None
     
+    def set_vision_feature(self, feature, enabled):
+        """Turn pose tracking or background segmentation on or off"""
+        if not self.vision_engine.is_available():
+            self.speak_text("This feature requires MediaPipe.")
+            return
+        self.vision_engine.enable(feature, enabled)
+        state = "on" if enabled else "off"
+        self.log_message(f"{feature.capitalize()} {state}")
+        self.speak_text(f"{feature.capitalize()} turned {state}")
+    
+    def set_tracking_quality(self, accurate):
+        """Trade tracking speed for accuracy by switching model complexity"""
+        if accurate:
+            self.vision_engine.set_complexity(hands=1, pose=2, segmentation=0)
+        else:
+            self.vision_engine.set_complexity(hands=0, pose=0, segmentation=1)
+        mode = "accurate" if accurate else "fast"
+        self.log_message(f"Tracking mode: {mode}")
+        self.speak_text(f"Switched to {mode} tracking")
+    
     def speak_text(self, text):
         """Speak the given text using the text-to-speech engine"""
         self.log_message(f"Speaking text: {text}")
@@ -550,152 +682,18 @@ class JarvisApp:
         except Exception as e:
             self.log_message(f"Error speaking text: {str(e)}")
 
-    def update_camera_feed_mp(self):
-        """Update the camera feed Mediapipe processing"""
-        if not MEDIAPIPE_AVAILABLE:
-            return
-        mp_hands = mp.solutions.hands
-        with mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=2,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.5
-        ) as hands:
-            while self.camera_active:
-                ret, frame = self.cap.read()
-                if not ret:
-                    self.log_message("Failed to grab frame from camera.")
-                    break
-                mp_pose = mp.solutions.pose
-                with mp_pose.Pose(
-                    static_image_mode=False,
-                    model_complexity=2,
-                    enable_segmentation=True,
-                    min_detection_confidence=0.7,
-                    min_tracking_confidence=0.5
-                ) as pose:
-                    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    results = pose.process(rgb_frame)
-                # Process hands
-                hands_results = hands.process(rgb_frame)
-                if hands_results.multi_hand_landmarks and self.drawing_utils:
-                    for hand_landmarks in hands_results.multi_hand_landmarks:
-                        self.drawing_utils.draw_landmarks(
-                            frame,
-                            hand_landmarks,
-                            mp.solutions.hands.HAND_CONNECTIONS
-                        )
-                # Flip the frame horizontally for a later selfie-view display
-                frame = cv2.flip(frame, 1)
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                
-                # Process the frame and detect hands
-                results = hands.process(rgb_frame)
-                
-                # Draw hand landmarks
-                if results.multi_hand_landmarks and self.drawing_utils:
-                    for hand_landmarks in results.multi_hand_landmarks:
-                        self.drawing_utils.draw_landmarks(
-                            frame,
-                            hand_landmarks,
-                            mp.solutions.hands.HAND_CONNECTIONS
-                        )
-                if self.motion_active:
-                    frame = self.process_hand_gestures(frame)
-                    if self.gesture_cooldown <= 0:
-                        gesture = self.recognize_gesture(hand_landmarks)
-                        if gesture != self.last_gesture:
-                            self.handle_gesture(gesture)
-                            self.last_gesture = gesture
-                            self.gesture_cooldown = 20  # Prevent rapid gesture changes
-                self.gesture_cooldown = max(0, self.gesture_cooldown - 1)   
-                if results.pose_landmarks and self.drawing_utils and self.np_pose:
-                    self.drawing_utils.draw_landmarks(
-                        frame,
-                        results.pose_landmarks,
-                        self.np_pose.POSE_CONNECTIONS
-                    )
-                # Convert frame to ImageTk format
-                img = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                img = Image.fromarray(img)
-                img = ImageTk.PhotoImage(image=img)
-                
-                # Update the camera label
-                self.camera_label.config(image=img)
-                self.camera_label.image = img
-                self.message_queue.put("Camera feed updated.")
-                if cv2.waitKey(1) & 0xFF == ord('q'):
-                    break  
-                time.sleep(0.03)  # Small delay to control frame rate
-    
-    def process_gesture(self, hand_landmarks, frame):
-        """Process hand gestures from landmarks"""
-        if hand_landmarpks is None:  # pyright: ignore[reportUndefinedVariable]
-            return frame
-        if self.motion_active:
-            frame = self.process_hand_gestures(frame)
-            if self.gesture_cooldown <= 0:
-                gesture = self.recognize_gesture(hand_landmarks)
-                if gesture != self.last_gesture and gesture != "None":
-                    self.handle_gesture(gesture)
-                    self.last_gesture = gesture
-                    self.gesture_cooldown = 20  # Prevent rapid gesture changes
-        self.gesture_cooldown = max(0, self.gesture_cooldown - 1)
-        return frame
-
     def handle_gesture(self, gesture):
         """Handle different hand gestures"""
-        if gesture == "pointing up":
+        if gesture == PREROLL_GESTURE and self.preroll_buffer.is_enabled():
+            self.save_preroll()
+        elif gesture == "pointing up":
             # This will be handled in process_hand_gestures
             pass
         elif gesture == "thumbs down":
             self.volume_down()
-            self.gesture_cooldown = 20
         elif gesture == "open palm":
             keyboard.press_and_release('play/pause media')
-            self.gesture_cooldown = 10
-
-    def recognize_gesture(self, hand_landmarks):
-        """Recognize gesture from hand landmarks"""
-        if not MEDIAPIPE_AVAILABLE or hand_landmarks is None:
-            return "None"
-        landmarks = hand_landmarks.landmark
-        thumb_tip = landmarks[mp.solutions.hands.HandLandmark.THUMB_TIP]
-        index_finger_tip = landmarks[mp.solutions.hands.HandLandmark.INDEX_FINGER_TIP]
-        middle_finger_tip = landmarks[mp.solutions.hands.HandLandmark.MIDDLE_FINGER_TIP]
-        ring_finger_tip = landmarks[mp.solutions.hands.HandLandmark.RING_FINGER_TIP]
-        pinky_tip = landmarks[mp.solutions.hands.HandLandmark.PINKY_TIP]
-        
-        thumb_index_dist = np.sqrt(
-            (thumb_tip.x - index_finger_tip.x)**2 + 
-            (thumb_tip.y - index_finger_tip.y)**2
-        )
-        
-        thumb_tip_y = thumb_tip.y
-        index_tip_y = index_finger_tip.y
-        middle_tip_y = middle_finger_tip.y
-        ring_tip_y = ring_finger_tip.y
-        pinky_tip_y = pinky_tip.y
-        
-        # Check for thumbs down
-        if (thumb_tip_y > index_tip_y and 
-            thumb_tip_y > middle_tip_y and
-            thumb_tip_y > ring_tip_y and 
-            thumb_tip_y > pinky_tip_y):
-            return "thumbs down"
-        
-        # Check for pointing
-        if thumb_index_dist < 0.05:
-            return "pointing up"
-        
-        # Check for open palm
-        all_extended = (index_tip_y < middle_tip_y < ring_tip_y < pinky_tip_y and 
-                       thumb_tip.x < index_finger_tip.x)
-        if all_extended:
-            return "open palm"
-        
-        return "Unknown"
-    
+
     def process_messages(self):
         """Process messages from the queue and update GUI"""
         try:
@@ -739,6 +737,10 @@ class JarvisApp:
         self.voice_active = False
         self.motion_active = False
         self.camera_active = False
+        self.video_recorder.stop()
+        # Let queued screenshots and pictures finish saving
+        self.image_writer.shutdown()
+        self.vision_engine.close()
         if self.cap is not None:
             self.cap.release()
             cv2.destroyAllWindows()
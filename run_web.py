@@ -9,10 +9,10 @@ SRC_DIR = BASE_DIR / "src"
 if str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
 
-from jarvis.config.settings import FLASK_DEBUG, FLASK_HOST, FLASK_PORT
 from jarvis.web.app import create_app
+from jarvis.web.serve import serve
 
 app = create_app()
 
 if __name__ == "__main__":
-    app.run(debug=FLASK_DEBUG, host=FLASK_HOST, port=FLASK_PORT)
+    serve()
@@ -0,0 +1,134 @@
+"""Batch Prompt Processing Module"""
+import asyncio
+import json
+import time
+from collections import deque
+from functools import partial
+
+from jarvis.api.resilience import is_retryable
+
+
+def parse_jsonl(lines):
+    """
+    Parse JSONL records lazily, one line at a time
+    
+    Args:
+        lines: Iterable of str or bytes lines
+    
+    Yields:
+        dict: One record per non-blank line; malformed lines yield {'_error': ...}
+    """
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            record = {'_error': f"Invalid JSON: {str(e)}"}
+        if not isinstance(record, dict):
+            record = {'_error': "Each line must be a JSON object"}
+        yield record
+
+
+def record_prompt(record):
+    """
+    Get the prompt text from a batch record
+    
+    Accepts {"message": ...}, {"prompt": ...}, or backlog-style
+    {"request_id", "title", "body"} records.
+    """
+    prompt = record.get('message') or record.get('prompt')
+    if prompt:
+        return prompt
+    parts = [record.get('title'), record.get('body')]
+    return "\n\n".join(part for part in parts if part)
+
+
+async def _run_one(index, record, process, retries, backoff, max_backoff, limit):
+    """Process one record, retrying transient failures with capped exponential backoff"""
+    result = {'index': index}
+    if 'request_id' in record:
+        result['request_id'] = record['request_id']
+    
+    if '_error' in record:
+        result.update({'success': False, 'error': record['_error'], 'attempts': 0})
+        return result
+    
+    prompt = record_prompt(record)
+    if not prompt:
+        result.update({'success': False, 'error': 'Message cannot be empty', 'attempts': 0})
+        return result
+    
+    async with limit:
+        started = time.perf_counter()
+        for attempt in range(1, retries + 2):
+            try:
+                response = await process(prompt)
+                error = None
+            except Exception as e:
+                error = e
+            # Bad requests, safety blocks, an open circuit or a quota timeout will not recover
+            if error is None or attempt > retries or not is_retryable(error):
+                break
+            await asyncio.sleep(min(max_backoff, backoff * (2 ** min(attempt - 1, 30))))
+    
+    result['attempts'] = attempt
+    result['latency_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    if error is None:
+        result.update({'success': True, 'response': response})
+    else:
+        result.update({'success': False, 'error': str(error), 'error_type': type(error).__name__})
+    return result
+
+
+def run_batch(records, process=None, concurrency=8, retries=2, backoff=1.0, max_backoff=30.0):
+    """
+    Process records with bounded concurrency, yielding results in input order
+    
+    Records run as coroutines on the Gemini client's shared event loop, so
+    a batch needs no threads of its own. At most `concurrency` records are
+    in flight and at most twice that many are buffered, so memory stays
+    constant however long the batch is.
+    
+    Args:
+        records: Iterable of record dicts (e.g. from parse_jsonl)
+        process (callable): Coroutine function mapping a prompt to a response
+            and raising on failure; defaults to generate_async with a single
+            upstream attempt, since retries happen here
+        concurrency (int): Maximum records processed at once
+        retries (int): Extra attempts for a record failing with a transient error
+        backoff (float): Seconds before the first retry, doubled each time
+        max_backoff (float): Longest wait between attempts
+    
+    Yields:
+        dict: One result per record, in the same order as the input
+    """
+    from jarvis.api.gemini_client import submit_async
+    if process is None:
+        from jarvis.api.gemini_client import generate_async
+        # Retrying is left to this loop, so each try makes one upstream attempt
+        process = partial(generate_async, max_attempts=1)
+    
+    concurrency = max(1, concurrency)
+    limit = asyncio.Semaphore(concurrency)
+    pending = deque()
+    try:
+        for index, record in enumerate(records):
+            pending.append(submit_async(_run_one(index, record, process, retries, backoff, max_backoff, limit)))
+            # Results leave in order, so a slow head record holds back the window
+            while len(pending) >= concurrency * 2 or (pending and pending[0].done()):
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        # Stop records nobody will read, e.g. after the client disconnected
+        for future in pending:
+            future.cancel()
+
+
+def format_result(result):
+    """Serialize a batch result as one JSONL line"""
+    return json.dumps(result, ensure_ascii=False) + "\n"
@@ -0,0 +1,253 @@
+"""Response Cache Module"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_prompt(prompt):
+    """Normalize a prompt so trivially different spellings share a cache entry"""
+    return " ".join(prompt.lower().split())
+
+
+def make_cache_key(prompt, model_name, generation_config=None, history=None):
+    """
+    Build a cache key from the prompt, model and generation settings
+    
+    Args:
+        prompt (str): The user's prompt/question
+        model_name (str): The Gemini model the response came from
+        generation_config (dict): Generation settings (temperature, etc.)
+        history (list): Conversation turns sent before the prompt; without
+            any, a chat's first turn shares its key with a stateless prompt
+    
+    Returns:
+        str: Hex digest identifying the request
+    """
+    parts = [normalize_prompt(prompt), model_name, generation_config or {}]
+    if history:
+        parts.append(history)
+    payload = json.dumps(parts, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Base class for response caches with LRU bounds and per-entry TTL"""
+    
+    backend = "base"
+    # Whether get()/set() block on I/O, so async callers should run them in a thread
+    blocking = False
+    
+    def __init__(self, max_entries=1024, ttl=3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Get a cached response, or None on a miss or expired entry"""
+        with self._lock:
+            value = self._get(key, time.time())
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+    
+    def set(self, key, value):
+        """Store a response, evicting the least recently used entries"""
+        with self._lock:
+            self.evictions += self._set(key, value, time.time())
+    
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            self._clear()
+    
+    def reopen(self):
+        """Reopen backend resources, e.g. in a forked worker process"""
+        self._lock = threading.Lock()
+    
+    def stats(self):
+        """Get cache counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'backend': self.backend,
+                'entries': self._size(),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+    
+    def _get(self, key, now):
+        raise NotImplementedError
+    
+    def _set(self, key, value, now):
+        raise NotImplementedError
+    
+    def _clear(self):
+        raise NotImplementedError
+    
+    def _size(self):
+        raise NotImplementedError
+
+
+class MemoryCache(ResponseCache):
+    """In-process LRU cache backed by an OrderedDict"""
+    
+    backend = "memory"
+    
+    def __init__(self, max_entries=1024, ttl=3600):
+        super().__init__(max_entries, ttl)
+        self._entries = OrderedDict()
+    
+    def _get(self, key, now):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at < now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+    
+    def _set(self, key, value, now):
+        self._entries[key] = (value, now + self.ttl)
+        self._entries.move_to_end(key)
+        evicted = 0
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            evicted += 1
+        return evicted
+    
+    def _clear(self):
+        self._entries.clear()
+    
+    def _size(self):
+        return len(self._entries)
+
+
+class SQLiteCache(ResponseCache):
+    """
+    On-disk LRU cache backed by SQLite, shared across processes
+    
+    Expired rows are swept every `sweep_interval` seconds rather than on
+    every write, and the row count is tracked as rows are added and deleted
+    instead of counted. Other processes write to the same file, so the
+    count is re-read from the table at each sweep.
+    """
+    
+    backend = "sqlite"
+    blocking = True
+    
+    def __init__(self, path, max_entries=1024, ttl=3600, sweep_interval=60):
+        super().__init__(max_entries, ttl)
+        self.path = path
+        self.sweep_interval = sweep_interval
+        self._conn = self._connect()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires_at)"
+        )
+        self._count = self._count_rows()
+        self._swept_at = time.time()
+    
+    def _connect(self):
+        return sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+    
+    def reopen(self):
+        """Open a new connection; SQLite connections must not cross fork()"""
+        super().reopen()
+        self._conn = self._connect()
+        self._count = self._count_rows()
+    
+    def _get(self, key, now):
+        row = self._conn.execute(
+            "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at < now:
+            self._count -= self._conn.execute("DELETE FROM responses WHERE key = ?", (key,)).rowcount
+            return None
+        self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        return value
+    
+    def _set(self, key, value, now):
+        exists = self._conn.execute("SELECT 1 FROM responses WHERE key = ?", (key,)).fetchone()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses (key, value, expires_at, accessed_at) "
+            "VALUES (?, ?, ?, ?)",
+            (key, value, now + self.ttl, now)
+        )
+        if exists is None:
+            self._count += 1
+        if now - self._swept_at >= self.sweep_interval:
+            self._sweep(now)
+        overflow = self._count - self.max_entries
+        if overflow <= 0:
+            return 0
+        evicted = self._conn.execute(
+            "DELETE FROM responses WHERE key IN "
+            "(SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+            (overflow,)
+        ).rowcount
+        self._count -= evicted
+        return evicted
+    
+    def _sweep(self, now):
+        """Delete expired rows and resync the row count with other processes' writes"""
+        self._conn.execute("DELETE FROM responses WHERE expires_at < ?", (now,))
+        self._count = self._count_rows()
+        self._swept_at = now
+    
+    def _count_rows(self):
+        return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    
+    def _clear(self):
+        self._conn.execute("DELETE FROM responses")
+        self._count = 0
+    
+    def _size(self):
+        return self._count
+
+
+def create_cache(backend, max_entries=1024, ttl=3600, path=None):
+    """
+    Create a response cache for the configured backend
+    
+    Args:
+        backend (str): "memory", "sqlite" or "none"
+        max_entries (int): LRU size bound
+        ttl (float): Seconds before an entry expires
+        path (str): Database file for the sqlite backend
+    
+    Returns:
+        ResponseCache: The cache, or None when caching is disabled
+    """
+    backend = (backend or "none").lower()
+    if backend == "memory":
+        return MemoryCache(max_entries, ttl)
+    if backend == "sqlite":
+        return SQLiteCache(path, max_entries, ttl)
+    if backend == "none":
+        return None
+    raise ValueError(f"Unknown response cache backend: {backend}")
@@ -1,5 +1,9 @@
 """Command-line interface for Gemini API"""
+import argparse
+import sys
+from jarvis.api.batch import format_result, parse_jsonl, run_batch
 from jarvis.api.gemini_client import process_prompt
+from jarvis.config.settings import BATCH_CONCURRENCY, BATCH_RETRIES, BATCH_MAX_RETRIES, BATCH_MAX_BACKOFF
 
 
 def main():
@@ -17,7 +21,51 @@ def main():
         print(f"CHATBOT: {response}\n")
 
 
-if __name__ == "__main__":
-    main()
+def batch(input_path, output_path=None, concurrency=BATCH_CONCURRENCY, retries=BATCH_RETRIES):
+    """
+    Run a JSONL file of prompts through Gemini, writing JSONL results
+    
+    Args:
+        input_path (str): JSONL input file, or "-" for stdin
+        output_path (str): JSONL output file, or None for stdout
+        concurrency (int): Maximum prompts processed at once
+        retries (int): Extra attempts for a failed prompt
+        
+    Returns:
+        tuple: (succeeded, failed) counts
+    """
+    retries = max(0, min(retries, BATCH_MAX_RETRIES))
+    source = sys.stdin if input_path == "-" else open(input_path, encoding="utf-8")
+    sink = open(output_path, "w", encoding="utf-8") if output_path else sys.stdout
+    succeeded = failed = 0
+    try:
+        results = run_batch(parse_jsonl(source), None, concurrency, retries, max_backoff=BATCH_MAX_BACKOFF)
+        for result in results:
+            sink.write(format_result(result))
+            sink.flush()
+            if result['success']:
+                succeeded += 1
+            else:
+                failed += 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    print(f"Batch complete: {succeeded} succeeded, {failed} failed", file=sys.stderr)
+    return succeeded, failed
 
 
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="JARVIS 3.0 - Gemini API CLI")
+    parser.add_argument("--batch", metavar="FILE", help="JSONL file of prompts to run ('-' for stdin)")
+    parser.add_argument("--output", metavar="FILE", help="Write JSONL results here instead of stdout")
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY, help="Prompts processed at once")
+    parser.add_argument("--retries", type=int, default=BATCH_RETRIES, help="Extra attempts for a failed prompt")
+    args = parser.parse_args()
+    
+    if args.batch:
+        _, failed = batch(args.batch, args.output, args.concurrency, args.retries)
+        sys.exit(1 if failed else 0)
+    else:
+        main()
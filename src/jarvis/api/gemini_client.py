@@ -1,21 +1,365 @@
 """Gemini AI Client Module"""
+import asyncio
+import threading
+import weakref
+from contextlib import aclosing
 import google.generativeai as genai
-from jarvis.config.settings import GEMINI_API_KEY, GEMINI_MODEL
+from jarvis.api.cache import create_cache, make_cache_key
+from jarvis.api.rate_limiter import FairScheduler
+from jarvis.api.resilience import CircuitBreaker, ResilientCaller
+from jarvis.api.semantic_cache import create_semantic_cache
+from jarvis.api.sessions import SessionStore, estimate_tokens
+from jarvis.api.singleflight import SingleFlight
+from jarvis.config.settings import (
+    GEMINI_API_KEY, GEMINI_MODEL, GEMINI_MAX_CONCURRENCY, GEMINI_RETRY_ATTEMPTS,
+    GEMINI_RETRY_BASE_DELAY, GEMINI_RETRY_MAX_DELAY, GEMINI_RETRY_DEADLINE,
+    GEMINI_BREAKER_FAILURES, GEMINI_BREAKER_RESET, GEMINI_REQUESTS_PER_MINUTE,
+    GEMINI_TOKENS_PER_MINUTE, GEMINI_EXPECTED_OUTPUT_TOKENS, GEMINI_QUEUE_TIMEOUT,
+    RESPONSE_CACHE_BACKEND, RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL,
+    RESPONSE_CACHE_PATH, SEMANTIC_CACHE_ENABLED, SEMANTIC_CACHE_MODEL, SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_MAX_ENTRIES, SEMANTIC_CACHE_MAX_MB, SESSION_MAX_SESSIONS,
+    SESSION_IDLE_TIMEOUT, SESSION_HISTORY_TOKENS, SESSION_MAX_MB
+)
+
+model = None
+
+
+def init_client():
+    """Configure Gemini and create the model"""
+    global model
+    if GEMINI_API_KEY:
+        # configure() also discards gRPC clients created before a fork
+        genai.configure(api_key=GEMINI_API_KEY)
+        model = genai.GenerativeModel(GEMINI_MODEL)
+    else:
+        model = None
+
 
 # Configure Gemini
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
-    model = genai.GenerativeModel(GEMINI_MODEL)
-else:
-    model = None
+init_client()
+
+# Retries transient upstream errors and fails fast while Gemini is unhealthy
+upstream = ResilientCaller(
+    max_attempts=GEMINI_RETRY_ATTEMPTS,
+    base_delay=GEMINI_RETRY_BASE_DELAY,
+    max_delay=GEMINI_RETRY_MAX_DELAY,
+    deadline=GEMINI_RETRY_DEADLINE,
+    breaker=CircuitBreaker(GEMINI_BREAKER_FAILURES, GEMINI_BREAKER_RESET)
+)
+
+# Queues upstream calls within the shared key's quota, round-robin per user
+scheduler = FairScheduler(
+    requests_per_minute=GEMINI_REQUESTS_PER_MINUTE,
+    tokens_per_minute=GEMINI_TOKENS_PER_MINUTE,
+    max_wait=GEMINI_QUEUE_TIMEOUT
+)
+
+# Cache of successful responses, keyed on normalized prompt + model
+response_cache = create_cache(
+    RESPONSE_CACHE_BACKEND,
+    max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+    ttl=RESPONSE_CACHE_TTL,
+    path=RESPONSE_CACHE_PATH
+)
+
+# Optional second layer matching near-duplicate prompts (one model per process)
+semantic_cache = create_semantic_cache(
+    SEMANTIC_CACHE_ENABLED,
+    model_name=SEMANTIC_CACHE_MODEL,
+    threshold=SEMANTIC_CACHE_THRESHOLD,
+    max_entries=SEMANTIC_CACHE_MAX_ENTRIES,
+    max_bytes=int(SEMANTIC_CACHE_MAX_MB * 1024 * 1024),
+    ttl=RESPONSE_CACHE_TTL
+)
+
+
+# Identical prompts in flight at the same time share one upstream call
+inflight = SingleFlight()
+
+# Server-side multi-turn history, keyed by client session id
+sessions = SessionStore(
+    max_sessions=SESSION_MAX_SESSIONS,
+    idle_timeout=SESSION_IDLE_TIMEOUT,
+    history_tokens=SESSION_HISTORY_TOKENS,
+    max_bytes=int(SESSION_MAX_MB * 1024 * 1024)
+)
+
+
+def _cache_get(prompt, history=None):
+    """Look up a cached response for a prompt after a conversation history, exact match first"""
+    if response_cache is not None:
+        cached = response_cache.get(make_cache_key(prompt, GEMINI_MODEL, history=history))
+        if cached is not None:
+            return cached
+    # Near-duplicate matching only holds for prompts without conversation context
+    if semantic_cache is not None and not history:
+        return semantic_cache.get(prompt)
+    return None
+
+
+def _cache_set(prompt, text, history=None):
+    """Store a successful response for a prompt after a conversation history"""
+    if not text:
+        return
+    if response_cache is not None:
+        response_cache.set(make_cache_key(prompt, GEMINI_MODEL, history=history), text)
+    if semantic_cache is not None and not history:
+        semantic_cache.set(prompt, text)
+
+
+async def _cache_get_async(prompt, history=None):
+    """_cache_get(), in a worker thread when a cache layer would block the event loop"""
+    if _cache_blocks(history):
+        return await asyncio.to_thread(_cache_get, prompt, history)
+    return _cache_get(prompt, history)
+
+
+async def _cache_set_async(prompt, text, history=None):
+    """_cache_set(), in a worker thread when a cache layer would block the event loop"""
+    if _cache_blocks(history):
+        await asyncio.to_thread(_cache_set, prompt, text, history)
+    else:
+        _cache_set(prompt, text, history)
+
+
+def _cache_blocks(history):
+    """Check whether a cache lookup for this request does disk I/O or model inference"""
+    if response_cache is not None and response_cache.blocking:
+        return True
+    return semantic_cache is not None and not history and semantic_cache.blocking
+
+
+def get_cache_stats():
+    """Get response cache counters"""
+    stats = response_cache.stats() if response_cache is not None else {'backend': 'none'}
+    if semantic_cache is not None:
+        stats['semantic'] = semantic_cache.stats()
+    return stats
+
 
+def get_coalescing_stats():
+    """Get request coalescing counters"""
+    return inflight.stats()
 
-def process_prompt(prompt):
+
+def get_session_stats():
+    """Get conversation session counters"""
+    return sessions.stats()
+
+
+def get_resilience_stats():
+    """Get circuit breaker state, retry count and upstream latency"""
+    return upstream.stats()
+
+
+def get_scheduler_stats():
+    """Get quota queue depth and wait times"""
+    return scheduler.stats()
+
+
+def _quota_tokens(prompt, history_tokens=0):
+    """Estimate the tokens one request will use against the per-minute quota"""
+    return estimate_tokens(prompt) + history_tokens + GEMINI_EXPECTED_OUTPUT_TOKENS
+
+
+def process_prompt(prompt, user_id=None):
     """
     Process a prompt using Gemini AI
     
+    Runs process_prompt_async() on the shared event loop, so every caller
+    shares its connection to Gemini, its in-flight limit and coalescing.
+    
     Args:
         prompt (str): The user's prompt/question
+        user_id (str): Who is asking, for fair sharing of the API quota
+        
+    Returns:
+        str: The AI's response or error message
+    """
+    return run_async(process_prompt_async(prompt, user_id))
+
+
+def stream_prompt(prompt, user_id=None):
+    """
+    Stream a Gemini response chunk by chunk
+    
+    Args:
+        prompt (str): The user's prompt/question
+        user_id (str): Who is asking, for fair sharing of the API quota
+        
+    Yields:
+        str: Text chunks of the AI's response as they are generated
+        
+    Raises:
+        RuntimeError: If the API is not configured
+        Exception: Any upstream error raised while generating
+    """
+    return iterate_async(stream_prompt_async(prompt, user_id))
+
+
+def process_chat(prompt, session_id, user_id=None):
+    """
+    Process a prompt as the next turn of a server-side conversation
+    
+    Only the session's compacted history is sent with the prompt, so the
+    payload stays bounded however long the conversation grows.
+    
+    Args:
+        prompt (str): The user's prompt/question
+        session_id (str): Identifies the conversation
+        user_id (str): Who is asking, for fair sharing of the API quota;
+            defaults to the session id
+        
+    Returns:
+        str: The AI's response or error message
+    """
+    return run_async(process_chat_async(prompt, session_id, user_id))
+
+
+def stream_chat(prompt, session_id, user_id=None):
+    """
+    Stream the next turn of a server-side conversation chunk by chunk
+    
+    Args:
+        prompt (str): The user's prompt/question
+        session_id (str): Identifies the conversation
+        user_id (str): Who is asking, for fair sharing of the API quota;
+            defaults to the session id
+        
+    Yields:
+        str: Text chunks of the AI's response as they are generated
+        
+    Raises:
+        RuntimeError: If the API is not configured
+        Exception: Any upstream error raised while generating
+    """
+    return iterate_async(stream_chat_async(prompt, session_id, user_id))
+
+
+def end_chat(session_id):
+    """Forget a server-side conversation"""
+    return sessions.delete(session_id)
+
+
+# One in-flight limiter per event loop; asyncio primitives are loop-bound
+_semaphores = weakref.WeakKeyDictionary()
+
+# Shared background loop so synchronous callers reuse one async channel
+_loop = None
+_loop_lock = threading.Lock()
+
+# Marks the end of an async generator driven from another thread
+_DONE = object()
+
+
+def _get_semaphore():
+    """Get the in-flight request limiter for the running event loop"""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+def _get_loop():
+    """Get (and lazily start) the shared background event loop"""
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="gemini-async", daemon=True).start()
+        return _loop
+
+
+def submit_async(coro):
+    """
+    Schedule a client coroutine on the shared event loop
+    
+    Returns:
+        concurrent.futures.Future: The coroutine's pending result; cancelling
+        it cancels the coroutine
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop())
+
+
+def run_async(coro, timeout=None):
+    """
+    Run a client coroutine from synchronous code on the shared event loop
+    
+    All callers share one loop, so they share its pooled connection to
+    Gemini and its in-flight limit, instead of each thread opening its own.
+    The calling thread only waits for the result; it must not be the loop's
+    own thread.
+    
+    Args:
+        coro: Coroutine returned by one of the *_async functions
+        timeout (float): Seconds to wait for the result, None for no limit
+        
+    Returns:
+        The coroutine's result
+    """
+    return submit_async(coro).result(timeout)
+
+
+async def _next_item(agen):
+    """Get the next item of an async generator, or _DONE when it is exhausted"""
+    try:
+        return await agen.__anext__()
+    except StopAsyncIteration:
+        return _DONE
+
+
+def iterate_async(agen):
+    """
+    Iterate a client async generator from synchronous code on the shared event loop
+    
+    Closing the iterator early (e.g. when a streaming client disconnects)
+    closes the async generator, releasing its upstream stream and locks.
+    
+    Yields:
+        The async generator's items
+    """
+    try:
+        while True:
+            item = run_async(_next_item(agen))
+            if item is _DONE:
+                return
+            yield item
+    finally:
+        run_async(agen.aclose())
+
+
+def reset_after_fork(workers=1):
+    """
+    Rebuild per-process client state in a freshly forked worker
+    
+    gRPC channels, the background event loop thread, in-flight calls and
+    SQLite connections inherited from the parent process are not usable
+    after fork(), so each worker must create its own.
+    
+    Args:
+        workers (int): Worker processes sharing the API key; each gets
+            that share of the per-minute quota
+    """
+    global _loop, _loop_lock, inflight
+    init_client()
+    _loop = None
+    _loop_lock = threading.Lock()
+    _semaphores.clear()
+    inflight = SingleFlight()
+    scheduler.split(workers)
+    if response_cache is not None:
+        response_cache.reopen()
+
+
+async def process_prompt_async(prompt, user_id=None):
+    """
+    Process a prompt using Gemini AI without blocking the event loop
+    
+    Args:
+        prompt (str): The user's prompt/question
+        user_id (str): Who is asking, for fair sharing of the API quota
         
     Returns:
         str: The AI's response or error message
@@ -27,12 +371,199 @@ def process_prompt(prompt):
         return "Error: Gemini model not initialized. Please check your API key."
     
     try:
-        response = model.generate_content(prompt)
-        return response.text
+        return await _respond_async(prompt, user_id)
     except Exception as e:
         return f"An error occurred: {str(e)}"
 
 
+async def generate_async(prompt, user_id=None, max_attempts=None):
+    """
+    Get Gemini's response to a prompt, raising on failure instead of returning error text
+    
+    Args:
+        prompt (str): The user's prompt/question
+        user_id (str): Who is asking, for fair sharing of the API quota
+        max_attempts (int): Upstream attempts, e.g. 1 for callers that retry
+            on their own (defaults to GEMINI_RETRY_ATTEMPTS)
+        
+    Returns:
+        str: The AI's response
+        
+    Raises:
+        RuntimeError: If the API is not configured
+        CircuitOpenError: If Gemini is currently considered unhealthy
+        QueueTimeoutError: If the request waited too long for quota
+        Exception: Any upstream error left once retries are exhausted
+    """
+    if not is_api_configured():
+        raise RuntimeError("API key not configured. Please set GEMINI_API_KEY environment variable.")
+    return await _respond_async(prompt, user_id, max_attempts=max_attempts)
+
+
+async def _respond_async(prompt, user_id=None, history=None, history_tokens=0, max_attempts=None):
+    """Answer from the cache, or join or make the upstream call for the same request"""
+    cached = await _cache_get_async(prompt, history)
+    if cached is not None:
+        return cached
+    # A caller that retries on its own (max_attempts=1) must not be joined by
+    # one that expects the full retry budget, so the budget is part of the key
+    budget = max_attempts or GEMINI_RETRY_ATTEMPTS
+    key = (make_cache_key(prompt, GEMINI_MODEL, history=history), budget)
+    return await inflight.do_async(
+        key, _generate_async, prompt, user_id, history, history_tokens, max_attempts
+    )
+
+
+def _request_async(prompt, history=None, **kwargs):
+    """Start one Gemini request, in a fresh chat when there is history to send"""
+    if history:
+        return model.start_chat(history=history).send_message_async(prompt, **kwargs)
+    return model.generate_content_async(prompt, **kwargs)
+
+
+async def _generate_async(prompt, user_id=None, history=None, history_tokens=0, max_attempts=None):
+    """Call Gemini for a prompt after any conversation history and cache a successful response"""
+    async with _get_semaphore():
+        await scheduler.acquire_async(user_id, _quota_tokens(prompt, history_tokens))
+        response = await upstream.call_async(_request_async, prompt, history, max_attempts=max_attempts)
+        await _cache_set_async(prompt, response.text, history)
+        return response.text
+
+
+async def process_prompts_async(prompts, user_id=None):
+    """
+    Process several prompts concurrently, bounded by GEMINI_MAX_CONCURRENCY
+    
+    Args:
+        prompts (list): The prompts to process
+        user_id (str): Who is asking, for fair sharing of the API quota
+        
+    Returns:
+        list: Responses or error messages, in the same order as prompts
+    """
+    return await asyncio.gather(*(process_prompt_async(prompt, user_id) for prompt in prompts))
+
+
+async def stream_prompt_async(prompt, user_id=None):
+    """
+    Stream a Gemini response chunk by chunk without blocking the event loop
+    
+    Args:
+        prompt (str): The user's prompt/question
+        user_id (str): Who is asking, for fair sharing of the API quota
+        
+    Yields:
+        str: Text chunks of the AI's response as they are generated
+        
+    Raises:
+        RuntimeError: If the API is not configured
+        Exception: Any upstream error raised while generating
+    """
+    if not is_api_configured():
+        raise RuntimeError("API key not configured. Please set GEMINI_API_KEY environment variable.")
+    
+    async with aclosing(_stream_async(prompt, user_id)) as stream:
+        async for text in stream:
+            yield text
+
+
+async def _stream_async(prompt, user_id=None, history=None, history_tokens=0, chunks=None):
+    """
+    Stream the response to a prompt after any conversation history, from the cache if possible
+    
+    Args:
+        chunks (list): Collects the streamed text, for callers that need the whole reply
+    """
+    chunks = [] if chunks is None else chunks
+    cached = await _cache_get_async(prompt, history)
+    if cached is not None:
+        chunks.append(cached)
+        yield cached
+        return
+    
+    # The slot is held for the whole stream, since the upstream call is open
+    async with _get_semaphore():
+        await scheduler.acquire_async(user_id, _quota_tokens(prompt, history_tokens))
+        # Mid-stream failures reach the breaker too, not just opening the stream
+        stream = upstream.stream_async(_request_async, prompt, history, stream=True)
+        async with aclosing(stream):
+            async for chunk in stream:
+                # Chunks without text parts (e.g. safety-only chunks) raise on .text
+                try:
+                    text = chunk.text
+                except ValueError:
+                    continue
+                if text:
+                    chunks.append(text)
+                    yield text
+    await _cache_set_async(prompt, "".join(chunks), history)
+
+
+async def process_chat_async(prompt, session_id, user_id=None):
+    """
+    Process the next turn of a server-side conversation without blocking the event loop
+    
+    Turns are cached and coalesced on the prompt plus the history sent with
+    it, so a conversation's first turn shares entries with stateless prompts.
+    
+    Args:
+        prompt (str): The user's prompt/question
+        session_id (str): Identifies the conversation
+        user_id (str): Who is asking, for fair sharing of the API quota;
+            defaults to the session id
+        
+    Returns:
+        str: The AI's response or error message
+    """
+    if not GEMINI_API_KEY:
+        return "Error: API key not configured. Please set GEMINI_API_KEY environment variable."
+    
+    if not model:
+        return "Error: Gemini model not initialized. Please check your API key."
+    
+    session = sessions.get(session_id)
+    # Turns of one conversation must be applied in order
+    async with session.lock:
+        try:
+            text = await _respond_async(prompt, user_id or session_id, session.to_history(),
+                                        session.history_tokens())
+        except Exception as e:
+            return f"An error occurred: {str(e)}"
+        sessions.record_turn(session, prompt, text)
+        return text
+
+
+async def stream_chat_async(prompt, session_id, user_id=None):
+    """
+    Stream the next turn of a server-side conversation without blocking the event loop
+    
+    Args:
+        prompt (str): The user's prompt/question
+        session_id (str): Identifies the conversation
+        user_id (str): Who is asking, for fair sharing of the API quota;
+            defaults to the session id
+        
+    Yields:
+        str: Text chunks of the AI's response as they are generated
+        
+    Raises:
+        RuntimeError: If the API is not configured
+        Exception: Any upstream error raised while generating
+    """
+    if not is_api_configured():
+        raise RuntimeError("API key not configured. Please set GEMINI_API_KEY environment variable.")
+    
+    session = sessions.get(session_id)
+    async with session.lock:
+        chunks = []
+        stream = _stream_async(prompt, user_id or session_id, session.to_history(),
+                               session.history_tokens(), chunks)
+        async with aclosing(stream):
+            async for text in stream:
+                yield text
+        sessions.record_turn(session, prompt, "".join(chunks))
+
+
 def is_api_configured():
     """Check if API is properly configured"""
     return bool(GEMINI_API_KEY and model)
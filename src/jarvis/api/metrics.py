@@ -0,0 +1,88 @@
+"""API Metrics Module"""
+import threading
+from collections import deque
+
+
+class LatencyTracker:
+    """Thread-safe rolling window of latency samples"""
+    
+    def __init__(self, window=1000):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self._lock = threading.Lock()
+    
+    def record(self, seconds):
+        """Record a latency sample in seconds"""
+        with self._lock:
+            self.samples.append(seconds)
+            self.count += 1
+    
+    def snapshot(self):
+        """Get summary statistics in milliseconds"""
+        with self._lock:
+            samples = sorted(self.samples)
+            count = self.count
+        
+        if not samples:
+            return {'count': count, 'avg_ms': None, 'p50_ms': None, 'p95_ms': None, 'p99_ms': None}
+        
+        def percentile(p):
+            idx = min(len(samples) - 1, int(round(p * (len(samples) - 1))))
+            return round(samples[idx] * 1000, 2)
+        
+        return {
+            'count': count,
+            'avg_ms': round(sum(samples) / len(samples) * 1000, 2),
+            'p50_ms': percentile(0.50),
+            'p95_ms': percentile(0.95),
+            'p99_ms': percentile(0.99),
+        }
+
+
+class LatencyHistogram:
+    """Thread-safe cumulative latency histogram with fixed bucket bounds"""
+    
+    # Upper bounds in milliseconds; the last bucket catches everything slower
+    BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+    
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.total_seconds = 0.0
+        self._lock = threading.Lock()
+    
+    def record(self, seconds):
+        """Record a latency sample in seconds"""
+        ms = seconds * 1000
+        index = next((i for i, bound in enumerate(self.BUCKETS_MS) if ms <= bound), len(self.BUCKETS_MS))
+        with self._lock:
+            self.counts[index] += 1
+            self.total_seconds += seconds
+    
+    def snapshot(self):
+        """Get bucket counts keyed by upper bound in milliseconds"""
+        with self._lock:
+            counts = list(self.counts)
+            total = sum(counts)
+            buckets = {f"le_{bound}": count for bound, count in zip(self.BUCKETS_MS, counts)}
+            buckets["inf"] = counts[-1]
+            return {
+                'count': total,
+                'avg_ms': round(self.total_seconds / total * 1000, 2) if total else None,
+                'buckets': buckets,
+            }
+
+
+# Time from request arrival to the first streamed token
+time_to_first_token = LatencyTracker()
+
+# Time from request arrival to the complete response
+time_to_last_token = LatencyTracker()
+
+
+def get_metrics():
+    """Get a snapshot of all API metrics"""
+    return {
+        'time_to_first_token': time_to_first_token.snapshot(),
+        'time_to_last_token': time_to_last_token.snapshot(),
+    }
+
@@ -0,0 +1,250 @@
+"""Client-side Rate Limiting Module"""
+import asyncio
+import threading
+import time
+from collections import deque
+
+from jarvis.api.metrics import LatencyTracker
+
+
+class QueueTimeoutError(Exception):
+    """Raised when a request waited too long for quota"""
+
+
+class TokenBucket:
+    """Continuously refilling token bucket; a rate of 0 means unlimited"""
+    
+    def __init__(self, per_minute, capacity=None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.level = float(self.capacity)
+        self._updated = time.monotonic()
+    
+    def _refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def wait_time(self, amount, now):
+        """Seconds until `amount` can be taken (0 if it can be taken now)"""
+        if self.rate <= 0:
+            return 0.0
+        self._refill(now)
+        # Requests bigger than the bucket only need it to be full
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.level) / self.rate)
+    
+    def take(self, amount):
+        """Take tokens; call only after wait_time() returned 0"""
+        if self.rate > 0:
+            self.level -= min(amount, self.capacity)
+    
+    def give(self, amount):
+        """Return tokens taken for a request that was never made"""
+        if self.rate > 0:
+            self.level = min(self.capacity, self.level + min(amount, self.capacity))
+
+
+class _Ticket:
+    """One caller waiting for quota"""
+    
+    __slots__ = ("user_id", "tokens", "enqueued", "loop", "future", "granted")
+    
+    def __init__(self, user_id, tokens, loop):
+        self.user_id = user_id
+        self.tokens = tokens
+        self.enqueued = time.monotonic()
+        self.loop = loop
+        self.future = loop.create_future()
+        self.granted = False
+
+
+class FairScheduler:
+    """
+    Queues upstream calls against requests/min and tokens/min budgets
+    
+    Waiting callers are grouped by user and admitted round-robin across
+    users, so one user's burst cannot starve everyone else's requests.
+    Waiters are futures the scheduler resolves, so waiting costs no thread.
+    
+    The budgets are per process: with several worker processes sharing one
+    API key, each takes its part with split().
+    """
+    
+    def __init__(self, requests_per_minute=60, tokens_per_minute=1000000, max_wait=60):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_wait = max_wait
+        self.admitted = 0
+        self.timed_out = 0
+        self.cancelled = 0
+        self.wait_time = LatencyTracker()
+        self._queues = {}
+        self._turns = deque()
+        self._timer_due = None
+        self._lock = threading.RLock()
+    
+    def split(self, parts):
+        """Keep 1/parts of the quota, for one of `parts` processes sharing the API key"""
+        parts = max(1, parts)
+        with self._lock:
+            self.requests = TokenBucket(self.requests_per_minute / parts)
+            self.tokens = TokenBucket(self.tokens_per_minute / parts)
+    
+    async def acquire_async(self, user_id, estimated_tokens):
+        """
+        Wait until the caller may make one upstream request
+        
+        A caller cancelled while waiting leaves the queue; one cancelled
+        right after being admitted gives its quota back.
+        
+        Args:
+            user_id (str): Fairness key (client address, batch job, ...)
+            estimated_tokens (int): Expected prompt + response tokens
+        
+        Raises:
+            QueueTimeoutError: If quota did not free up within max_wait seconds
+        """
+        ticket = _Ticket(user_id or "anonymous", estimated_tokens, asyncio.get_running_loop())
+        with self._lock:
+            if ticket.user_id not in self._queues:
+                self._queues[ticket.user_id] = deque()
+                self._turns.append(ticket.user_id)
+            self._queues[ticket.user_id].append(ticket)
+            self._dispatch()
+        
+        try:
+            await asyncio.wait_for(asyncio.shield(ticket.future), max(0.0, self.max_wait))
+        except asyncio.TimeoutError:
+            # Admission may have raced the timeout; if so, keep it
+            if not self._abandon(ticket, keep_grant=True):
+                self.timed_out += 1
+                raise QueueTimeoutError(
+                    f"Gemini quota exhausted; request waited {self.max_wait:.0f}s"
+                )
+        except asyncio.CancelledError:
+            self._abandon(ticket, keep_grant=False)
+            raise
+        self.wait_time.record(time.monotonic() - ticket.enqueued)
+    
+    def _dispatch(self):
+        """Admit waiters round-robin while quota lasts; call with the lock held"""
+        while self._turns:
+            now = time.monotonic()
+            user_id = self._turns[0]
+            ticket = self._queues[user_id][0]
+            wait = max(
+                self.requests.wait_time(1, now),
+                self.tokens.wait_time(ticket.tokens, now)
+            )
+            if wait > 0:
+                self._wake_after(ticket.loop, now, wait)
+                return
+            self.requests.take(1)
+            self.tokens.take(ticket.tokens)
+            ticket.granted = True
+            self.admitted += 1
+            self._admit(user_id)
+            self._call_soon(ticket.loop, self._resolve, ticket)
+    
+    def _resolve(self, ticket):
+        """Wake an admitted waiter on its loop, or refund it if it has gone"""
+        with self._lock:
+            if ticket.future.done():
+                self._refund(ticket)
+            else:
+                ticket.future.set_result(None)
+    
+    def _abandon(self, ticket, keep_grant):
+        """
+        Take a waiter that stopped waiting out of the queue
+        
+        Returns:
+            bool: True if it had been admitted and keeps its quota
+        """
+        with self._lock:
+            if ticket.future.done() and not ticket.future.cancelled():
+                if keep_grant:
+                    return True
+                self._refund(ticket)
+            else:
+                # A grant still on its way to the loop is refunded by _resolve()
+                ticket.future.cancel()
+                if not ticket.granted:
+                    self._withdraw(ticket)
+                    if not keep_grant:
+                        self.cancelled += 1
+            self._dispatch()
+            return False
+    
+    def _refund(self, ticket):
+        """Give back the quota of an admitted waiter that will not use it"""
+        self.requests.give(1)
+        self.tokens.give(ticket.tokens)
+        self.admitted -= 1
+        self.cancelled += 1
+        self._dispatch()
+    
+    def _admit(self, user_id):
+        """Remove the admitted ticket and pass the turn to the next user"""
+        queue = self._queues[user_id]
+        queue.popleft()
+        self._turns.popleft()
+        if queue:
+            self._turns.append(user_id)
+        else:
+            del self._queues[user_id]
+    
+    def _withdraw(self, ticket):
+        """Remove a ticket that gave up waiting"""
+        queue = self._queues.get(ticket.user_id)
+        if queue is None or ticket not in queue:
+            return
+        queue.remove(ticket)
+        if not queue:
+            del self._queues[ticket.user_id]
+            self._turns.remove(ticket.user_id)
+    
+    def _wake_after(self, loop, now, wait):
+        """Dispatch again once quota has refilled, unless a wake-up is already due sooner"""
+        due = now + wait
+        if self._timer_due is not None and now < self._timer_due <= due:
+            return
+        self._timer_due = due
+        self._call_soon(loop, loop.call_later, wait, self._on_timer)
+    
+    def _on_timer(self):
+        """Dispatch waiters whose quota should have refilled"""
+        with self._lock:
+            self._timer_due = None
+            self._dispatch()
+    
+    @staticmethod
+    def _call_soon(loop, callback, *args):
+        """Run callback on loop: right away when already on it, otherwise thread-safely"""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            callback(*args)
+        else:
+            loop.call_soon_threadsafe(callback, *args)
+    
+    def stats(self):
+        """Get queue depth, wait times and remaining quota for monitoring"""
+        with self._lock:
+            now = time.monotonic()
+            self.requests.wait_time(0, now)
+            self.tokens.wait_time(0, now)
+            return {
+                'queue_depth': sum(len(queue) for queue in self._queues.values()),
+                'users_waiting': len(self._queues),
+                'admitted': self.admitted,
+                'timed_out': self.timed_out,
+                'cancelled': self.cancelled,
+                'requests_available': round(self.requests.level, 1) if self.requests.rate else None,
+                'tokens_available': round(self.tokens.level) if self.tokens.rate else None,
+                'wait_time': self.wait_time.snapshot(),
+            }
@@ -0,0 +1,260 @@
+"""Upstream Resilience Module - retries, backoff and circuit breaking"""
+import asyncio
+import random
+import threading
+import time
+
+from jarvis.api.metrics import LatencyHistogram
+
+# HTTP statuses worth retrying: timeouts, rate limits and server errors
+RETRYABLE_STATUS = frozenset([408, 429, 500, 502, 503, 504])
+
+# google.api_core / gRPC exception names for the same conditions
+RETRYABLE_NAMES = frozenset([
+    "DeadlineExceeded", "ResourceExhausted", "TooManyRequests", "InternalServerError",
+    "BadGateway", "ServiceUnavailable", "GatewayTimeout", "Aborted",
+])
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream that is known to be unhealthy"""
+
+
+def is_retryable(error):
+    """Check whether an upstream error is transient"""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    code = getattr(error, "code", None)
+    if isinstance(code, int) and code in RETRYABLE_STATUS:
+        return True
+    return type(error).__name__ in RETRYABLE_NAMES
+
+
+def retry_after(error):
+    """Get the server-requested retry delay in seconds from an error, if any"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("Retry-After") if hasattr(headers, "get") else None
+    if value is not None:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+    # gRPC errors carry google.rpc.RetryInfo in their details
+    for detail in getattr(error, "details", None) or []:
+        delay = getattr(detail, "retry_delay", None)
+        if delay is not None:
+            return delay.seconds + delay.nanos / 1e9
+    return None
+
+
+class CircuitBreaker:
+    """Fails fast after repeated upstream failures, probing again after a cool-down"""
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._probing = False
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+    
+    def allow(self):
+        """Reserve permission to call upstream, or raise CircuitOpenError"""
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.CLOSED:
+                return
+            # Let one probe through to test the upstream; a probe that never
+            # reported back (e.g. a cancelled request) is replaced after a cool-down
+            if self.state == self.HALF_OPEN and (
+                not self._probing or time.monotonic() - self._probe_started >= self.reset_timeout
+            ):
+                self._probing = True
+                self._probe_started = time.monotonic()
+                return
+            self.rejected += 1
+            remaining = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+        raise CircuitOpenError(
+            f"Gemini is temporarily unavailable; retry in {remaining:.0f}s"
+        )
+    
+    def record_success(self):
+        """Close the circuit after a successful call"""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+    
+    def record_neutral(self):
+        """Release the probe slot after a call that says nothing about upstream health"""
+        with self._lock:
+            self._probing = False
+    
+    def record_failure(self):
+        """Count a failed call, opening the circuit past the threshold"""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._probing = False
+    
+    def stats(self):
+        """Get breaker state for monitoring"""
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'rejected': self.rejected,
+            }
+
+
+class ResilientCaller:
+    """Calls upstream with jittered exponential backoff behind a circuit breaker"""
+    
+    def __init__(self, max_attempts=3, base_delay=0.5, max_delay=8.0, deadline=30.0,
+                 breaker=None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.breaker = breaker or CircuitBreaker()
+        # Complete calls, and streamed calls from opening to their last chunk
+        self.latency = LatencyHistogram()
+        self.stream_latency = LatencyHistogram()
+        self.first_chunk_latency = LatencyHistogram()
+        self.retries = 0
+        self.stream_failures = 0
+    
+    def _next_delay(self, attempt, error, started, max_attempts=None):
+        """Seconds to wait before the next attempt, or None to give up"""
+        if attempt >= (max_attempts or self.max_attempts) or not is_retryable(error):
+            return None
+        # Full jitter spreads retries from many clients across the window
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+        requested = retry_after(error)
+        if requested is not None:
+            delay = max(delay, requested)
+        if time.monotonic() - started + delay > self.deadline:
+            return None
+        self.retries += 1
+        return delay
+    
+    def _attempt_finished(self, error, attempt_started, histogram=None):
+        """Update breaker and latency histogram after one attempt"""
+        (histogram or self.latency).record(time.monotonic() - attempt_started)
+        if error is None:
+            self.breaker.record_success()
+        elif is_retryable(error):
+            self.breaker.record_failure()
+        else:
+            # Client errors (bad request, safety blocks) say nothing about upstream health
+            self.breaker.record_neutral()
+    
+    def call(self, fn, *args, **kwargs):
+        """
+        Call fn, retrying transient failures within the deadline
+        
+        Raises:
+            CircuitOpenError: If the upstream is currently considered unhealthy
+            Exception: The last error once retries are exhausted
+        """
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            self.breaker.allow()
+            attempt_started = time.monotonic()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                self._attempt_finished(e, attempt_started)
+                delay = self._next_delay(attempt, e, started)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            self._attempt_finished(None, attempt_started)
+            return result
+    
+    async def call_async(self, fn, *args, max_attempts=None, **kwargs):
+        """
+        Await fn(*args, **kwargs) with the same policy as call()
+        
+        Args:
+            max_attempts (int): Override the attempt limit, e.g. 1 for callers
+                that retry on their own
+        """
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            self.breaker.allow()
+            attempt_started = time.monotonic()
+            try:
+                result = await fn(*args, **kwargs)
+            except Exception as e:
+                self._attempt_finished(e, attempt_started)
+                delay = self._next_delay(attempt, e, started, max_attempts)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            self._attempt_finished(None, attempt_started)
+            return result
+    
+    async def stream_async(self, fn, *args, max_attempts=None, **kwargs):
+        """
+        Yield the chunks of an awaited streaming response with the same policy as call()
+        
+        The whole stream counts as one attempt. Failures before the first
+        chunk are retried; after that the chunks already yielded cannot be
+        taken back, so the error is recorded against the breaker and raised.
+        """
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            self.breaker.allow()
+            attempt_started = time.monotonic()
+            received = False
+            try:
+                response = await fn(*args, **kwargs)
+                async for chunk in response:
+                    if not received:
+                        self.first_chunk_latency.record(time.monotonic() - attempt_started)
+                        received = True
+                    yield chunk
+            except Exception as e:
+                self._attempt_finished(e, attempt_started, self.stream_latency)
+                if received:
+                    self.stream_failures += 1
+                    raise
+                delay = self._next_delay(attempt, e, started, max_attempts)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            self._attempt_finished(None, attempt_started, self.stream_latency)
+            return
+    
+    def stats(self):
+        """Get breaker state, retry counts and upstream latency histograms"""
+        return {
+            'circuit': self.breaker.stats(),
+            'retries': self.retries,
+            'stream_failures': self.stream_failures,
+            'upstream_latency': self.latency.snapshot(),
+            'stream_latency': self.stream_latency.snapshot(),
+            'first_chunk_latency': self.first_chunk_latency.snapshot(),
+        }
@@ -1,7 +1,36 @@
 """Flask API Routes"""
-from flask import jsonify, request
+import json
+import time
+from functools import partial
+from flask import Response, jsonify, request, stream_with_context
 from datetime import datetime
-from jarvis.api.gemini_client import process_prompt, is_api_configured
+from jarvis.api import metrics
+from jarvis.api.batch import format_result, parse_jsonl, run_batch
+from jarvis.api.gemini_client import (
+    process_prompt, generate_async, stream_prompt, process_chat, stream_chat, end_chat,
+    is_api_configured, get_cache_stats, get_coalescing_stats, get_session_stats,
+    get_resilience_stats, get_scheduler_stats
+)
+from jarvis.config.settings import (
+    BATCH_CONCURRENCY, BATCH_MAX_CONCURRENCY, BATCH_RETRIES, BATCH_MAX_RETRIES, BATCH_MAX_BACKOFF
+)
+
+# Longest client-supplied session id accepted
+_MAX_SESSION_ID_LENGTH = 128
+
+
+def _sse_event(data, event=None):
+    """Format a payload as a Server-Sent Events frame"""
+    frame = f"event: {event}\n" if event else ""
+    return frame + f"data: {json.dumps(data)}\n\n"
+
+
+def _get_session_id(data):
+    """Get a valid session id from a request payload, or None"""
+    session_id = data.get('session_id')
+    if isinstance(session_id, str) and 0 < len(session_id) <= _MAX_SESSION_ID_LENGTH:
+        return session_id
+    return None
 
 
 def register_routes(app):
@@ -26,8 +55,14 @@ def register_routes(app):
                     'error': 'Message cannot be empty'
                 }), 400
             
-            # Generate response
-            response_text = process_prompt(prompt)
+            # Generate response; quota is shared per client, not per (client-chosen) session
+            session_id = _get_session_id(data)
+            started = time.perf_counter()
+            if session_id:
+                response_text = process_chat(prompt, session_id, request.remote_addr)
+            else:
+                response_text = process_prompt(prompt, request.remote_addr)
+            metrics.time_to_last_token.record(time.perf_counter() - started)
             
             return jsonify({
                 'success': True,
@@ -41,12 +76,106 @@ def register_routes(app):
                 'error': str(e)
             }), 500
     
+    @app.route('/api/chat/stream', methods=['POST'])
+    def chat_stream():
+        """Stream chat responses token by token as Server-Sent Events"""
+        data = request.get_json(silent=True) or {}
+        prompt = data.get('message', '')
+        
+        if not is_api_configured():
+            return jsonify({
+                'success': False,
+                'error': 'API key not configured. Please set GEMINI_API_KEY environment variable.'
+            }), 400
+        
+        if not prompt:
+            return jsonify({
+                'success': False,
+                'error': 'Message cannot be empty'
+            }), 400
+        
+        session_id = _get_session_id(data)
+        client = request.remote_addr
+        started = time.perf_counter()
+        
+        def generate():
+            first_token_at = None
+            if session_id:
+                tokens = stream_chat(prompt, session_id, client)
+            else:
+                tokens = stream_prompt(prompt, client)
+            try:
+                for token in tokens:
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                        metrics.time_to_first_token.record(first_token_at - started)
+                    yield _sse_event({'token': token})
+            except Exception as e:
+                yield _sse_event({'error': str(e)}, event='error')
+                return
+            
+            finished = time.perf_counter()
+            metrics.time_to_last_token.record(finished - started)
+            yield _sse_event({
+                'timestamp': datetime.now().isoformat(),
+                'ttft_ms': round((first_token_at - started) * 1000, 2) if first_token_at else None,
+                'total_ms': round((finished - started) * 1000, 2)
+            }, event='done')
+        
+        return Response(
+            stream_with_context(generate()),
+            mimetype='text/event-stream',
+            headers={
+                'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no'
+            }
+        )
+    
+    @app.route('/api/chat/batch', methods=['POST'])
+    def chat_batch():
+        """Process a JSONL batch of prompts, streaming JSONL results in input order"""
+        if not is_api_configured():
+            return jsonify({
+                'success': False,
+                'error': 'API key not configured. Please set GEMINI_API_KEY environment variable.'
+            }), 400
+        
+        concurrency = request.args.get('concurrency', BATCH_CONCURRENCY, type=int)
+        concurrency = max(1, min(concurrency, BATCH_MAX_CONCURRENCY))
+        retries = request.args.get('retries', BATCH_RETRIES, type=int)
+        retries = max(0, min(retries, BATCH_MAX_RETRIES))
+        
+        # Read the body line by line so large batches are never held in memory
+        records = parse_jsonl(request.stream)
+        # Batch work queues as its own user so it cannot starve interactive chat;
+        # run_batch does the retrying, so each try is a single upstream attempt
+        process = partial(generate_async, user_id=f"batch:{request.remote_addr}", max_attempts=1)
+        results = run_batch(records, process, concurrency=concurrency, retries=retries,
+                            max_backoff=BATCH_MAX_BACKOFF)
+        
+        return Response(
+            stream_with_context(format_result(result) for result in results),
+            mimetype='application/x-ndjson'
+        )
+    
+    @app.route('/api/sessions/<session_id>', methods=['DELETE'])
+    def delete_session(session_id):
+        """Forget a server-side conversation"""
+        return jsonify({
+            'success': True,
+            'deleted': end_chat(session_id)
+        })
+    
     @app.route('/api/health', methods=['GET'])
     def health():
         """Health check endpoint"""
         return jsonify({
             'status': 'healthy',
-            'api_configured': is_api_configured()
+            'api_configured': is_api_configured(),
+            'metrics': metrics.get_metrics(),
+            'cache': get_cache_stats(),
+            'coalescing': get_coalescing_stats(),
+            'sessions': get_session_stats(),
+            'resilience': get_resilience_stats(),
+            'rate_limit': get_scheduler_stats()
         })
-
-
@@ -0,0 +1,348 @@
+"""Semantic Response Cache Module"""
+import re
+import threading
+import time
+
+from jarvis.api.cache import MemoryCache
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+# Words that never change what is being asked
+_FILLER = frozenset(["please", "hey", "hi", "jarvis", "ok", "okay", "um", "the", "a", "an"])
+
+# Openings that only frame a request ("what's the weather" / "weather")
+_LEADS = (("whats",), ("what", "is"), ("tell", "me"), ("can", "you"), ("could", "you"))
+
+# Words that flip a prompt's meaning while barely moving its embedding
+_NEGATIONS = frozenset([
+    "not", "no", "never", "none", "nothing", "without", "nor", "neither", "cannot",
+    "dont", "doesnt", "didnt", "isnt", "arent", "wasnt", "werent", "cant", "couldnt",
+    "wont", "wouldnt", "shouldnt", "havent", "hasnt",
+])
+
+
+def _tokens(text):
+    """Lowercase words and numbers, with apostrophes dropped ("don't" -> "dont") and "7am" split"""
+    return re.findall(r"\d+|[^\W\d_]+", text.lower().replace("'", "").replace("’", ""))
+
+
+def canonical_prompt(text):
+    """
+    Reduce a prompt to its meaningful words: no case, punctuation, filler or framing opening
+    
+    Returns "" for prompts made only of filler ("hi", "hey jarvis"), which
+    must not be cached: they would all share one answer.
+    """
+    tokens = [token for token in _tokens(text) if token not in _FILLER]
+    for lead in _LEADS:
+        if tuple(tokens[:len(lead)]) == lead:
+            tokens = tokens[len(lead):]
+            break
+    return " ".join(tokens)
+
+
+def meaning_markers(text):
+    """
+    Negations, numbers and am/pm in a prompt
+    
+    Embeddings place "is it safe" next to "is it not safe" and "7 am" next
+    to "7 pm", so two prompts only share an answer if these agree exactly.
+    """
+    return frozenset(
+        token for token in _tokens(text)
+        if token in _NEGATIONS or token in ("am", "pm") or token.isdigit()
+    )
+
+
+class NormalizedCache(MemoryCache):
+    """
+    Exact-match cache keyed on a prompt's canonical form
+    
+    Catches rewordings that differ only in punctuation, contractions or
+    filler words ("Hey Jarvis, what's the time?" / "whats the time").
+    """
+    
+    backend = "normalized"
+    
+    def get(self, prompt):
+        """Get the response cached for the same canonical prompt, or None"""
+        key = canonical_prompt(prompt)
+        return super().get(key) if key else None
+    
+    def set(self, prompt, response):
+        """Store a response under the prompt's canonical form, unless it has none"""
+        key = canonical_prompt(prompt)
+        if key:
+            super().set(key, response)
+
+
+class SemanticCache:
+    """
+    Cache that answers prompts whose sentence embeddings are similar to one already seen
+    
+    A match also needs the same meaning_markers(), since negation and
+    numbers are exactly what sentence embeddings are weakest at.
+    """
+    
+    backend = "semantic"
+    # Embedding a prompt runs the model, so async callers use a worker thread
+    blocking = True
+    
+    def __init__(self, embed, dim, threshold=0.9, max_entries=4096, max_bytes=16 * 1024 * 1024,
+                 ttl=3600):
+        """
+        Args:
+            embed (callable): Maps text to an L2-normalized float32 vector of shape (dim,)
+            dim (int): Embedding width
+        """
+        self.embed = embed
+        self.threshold = threshold
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.dim = dim
+        self._row_bytes = dim * 4
+        self.capacity = max(1, min(max_entries, max_bytes // self._row_bytes))
+        
+        # Rows [0, size) are live; evicted rows are back-filled from the end
+        self._vectors = np.zeros((self.capacity, dim), dtype=np.float32)
+        self._expires = np.zeros(self.capacity, dtype=np.float64)
+        self._last_used = np.zeros(self.capacity, dtype=np.float64)
+        self._responses = [None] * self.capacity
+        self._markers = [None] * self.capacity
+        self._text_bytes = 0
+        self._size = 0
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lookup_seconds = 0.0
+        self._lock = threading.Lock()
+    
+    def get(self, prompt):
+        """Get the response cached for the most similar prompt, or None"""
+        if not canonical_prompt(prompt):
+            return None
+        query = self.embed(prompt)
+        markers = meaning_markers(prompt)
+        with self._lock:
+            started = time.perf_counter()
+            now = time.time()
+            result = None
+            best = self._best_match(query, markers, self.threshold, now)
+            if best is not None:
+                self._last_used[best] = now
+                result = self._responses[best]
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            self._lookup_seconds += time.perf_counter() - started
+            return result
+    
+    def set(self, prompt, response):
+        """Store a response, evicting least recently used entries to fit"""
+        if not canonical_prompt(prompt):
+            return
+        vector = self.embed(prompt)
+        markers = meaning_markers(prompt)
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            now = time.time()
+            duplicate = self._best_match(vector, markers, 0.999, None)
+            if duplicate is not None:
+                self._remove(duplicate)
+            
+            while self._size and (
+                self._size >= self.capacity
+                or (self._size + 1) * self._row_bytes + self._text_bytes + size > self.max_bytes
+            ):
+                self._evict_one(now)
+            
+            slot = self._size
+            self._vectors[slot] = vector
+            self._expires[slot] = now + self.ttl
+            self._last_used[slot] = now
+            self._responses[slot] = response
+            self._markers[slot] = markers
+            self._text_bytes += size
+            self._size += 1
+    
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            self._responses = [None] * self.capacity
+            self._markers = [None] * self.capacity
+            self._text_bytes = 0
+            self._size = 0
+    
+    def stats(self):
+        """Get cache counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'backend': self.backend,
+                'entries': self._size,
+                'capacity': self.capacity,
+                'threshold': self.threshold,
+                'memory_bytes': self._size * self._row_bytes + self._text_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'avg_lookup_ms': round(self._lookup_seconds / lookups * 1000, 4) if lookups else None,
+            }
+    
+    def _best_match(self, vector, markers, threshold, now):
+        """Index of the most similar live row at or above threshold with the same markers"""
+        if not self._size:
+            return None
+        scores = self._vectors[:self._size] @ vector
+        if now is not None:
+            scores[self._expires[:self._size] < now] = -1.0
+        candidates = np.flatnonzero(scores >= threshold)
+        for index in candidates[np.argsort(-scores[candidates])]:
+            if self._markers[index] == markers:
+                return int(index)
+        return None
+    
+    def _evict_one(self, now):
+        """Evict an expired entry if any, else the least recently used one"""
+        live = self._size
+        expired = np.flatnonzero(self._expires[:live] < now)
+        victim = int(expired[0]) if len(expired) else int(np.argmin(self._last_used[:live]))
+        self._remove(victim)
+        self.evictions += 1
+    
+    def _remove(self, index):
+        """Remove a row, moving the last live row into its place"""
+        last = self._size - 1
+        self._text_bytes -= len(self._responses[index].encode("utf-8"))
+        if index != last:
+            self._vectors[index] = self._vectors[last]
+            self._expires[index] = self._expires[last]
+            self._last_used[index] = self._last_used[last]
+            self._responses[index] = self._responses[last]
+            self._markers[index] = self._markers[last]
+        self._responses[last] = None
+        self._markers[last] = None
+        self._size = last
+
+
+def create_semantic_cache(enabled, model_name="", threshold=0.9, max_entries=4096,
+                          max_bytes=16 * 1024 * 1024, ttl=3600):
+    """
+    Create the near-duplicate cache layer if enabled
+    
+    With a sentence-transformers model name the layer matches paraphrases
+    by embedding similarity; otherwise, or if the model cannot be loaded,
+    it only matches prompts with the same canonical form.
+    
+    Returns:
+        SemanticCache or NormalizedCache: The cache, or None when disabled
+    """
+    if not enabled:
+        return None
+    if model_name:
+        if not (SENTENCE_TRANSFORMERS_AVAILABLE and NUMPY_AVAILABLE):
+            print("Warning: sentence-transformers not available. "
+                  "Semantic cache will only match normalized prompts.")
+        else:
+            try:
+                encoder = SentenceTransformer(model_name, device="cpu")
+            except Exception as e:
+                print(f"Warning: could not load {model_name} ({str(e)}). "
+                      "Semantic cache will only match normalized prompts.")
+            else:
+                return SemanticCache(
+                    lambda text: encoder.encode(text, normalize_embeddings=True).astype(np.float32),
+                    encoder.get_sentence_embedding_dimension(),
+                    threshold, max_entries, max_bytes, ttl
+                )
+    return NormalizedCache(max_entries, ttl)
+
+
+# Prompt pairs that should share an answer: rewordings, then real paraphrases
+_BENCHMARK_MATCHES = [
+    ("What's the weather in Kolkata?", "whats the weather in kolkata"),
+    ("what's the weather in kolkata", "weather in Kolkata?"),
+    ("Hey Jarvis, tell me a joke", "tell me a joke please"),
+    ("who made you?", "Who made you"),
+    ("How do I reverse a list in Python?", "What's the way to invert a Python list?"),
+    ("What is the capital of France?", "Which city is France's capital?"),
+    ("Explain quantum computing in simple terms", "Give me a beginner's explanation of quantum computing"),
+    ("How tall is Mount Everest?", "What is the height of Mount Everest?"),
+    ("Recommend a good sci-fi book", "Suggest a science fiction novel worth reading"),
+]
+# Pairs that look alike but need different answers: negations, numbers, opposites
+_BENCHMARK_MISSES = [
+    ("Is ibuprofen safe during pregnancy?", "Is ibuprofen not safe during pregnancy?"),
+    ("Set an alarm for 7 am", "Set an alarm for 7 pm"),
+    ("Should I buy bitcoin now?", "Should I sell bitcoin now?"),
+    ("Convert 10 miles to km", "Convert 100 miles to km"),
+    ("What's the weather in Kolkata?", "What's the weather in Mumbai?"),
+    ("Write a Python function to sort a list", "Write a Python function to reverse a list"),
+    ("Can you help me?", "Can I help you?"),
+    ("Hi", "Hey Jarvis"),
+]
+
+
+def benchmark(model_name="", threshold=0.9, entries=4096):
+    """
+    Measure precision, recall and lookup latency of the layer create_semantic_cache() builds
+    
+    Args:
+        model_name (str): sentence-transformers model, or "" for normalized matching
+        threshold (float): Similarity threshold to evaluate
+        entries (int): Number of filler entries for the latency measurement
+    
+    Returns:
+        dict: precision, recall, false_hit_rate and lookup latency percentiles in ms
+    """
+    cache = create_semantic_cache(True, model_name, threshold, max_entries=entries + 64)
+    hits = misses_hit = 0
+    for cached, query in _BENCHMARK_MATCHES:
+        cache.clear()
+        cache.set(cached, cached)
+        hits += cache.get(query) == cached
+    for cached, query in _BENCHMARK_MISSES:
+        cache.clear()
+        cache.set(cached, cached)
+        misses_hit += cache.get(query) is not None
+    
+    for i in range(entries):
+        cache.set(f"filler question number {i} about topic {i * 7919 % 1000}", "filler")
+    timings = []
+    for i in range(1000):
+        started = time.perf_counter()
+        cache.get(f"unrelated lookup {i}")
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    
+    answered = hits + misses_hit
+    return {
+        'backend': cache.backend,
+        'threshold': threshold if cache.backend == SemanticCache.backend else None,
+        'precision': round(hits / answered, 3) if answered else None,
+        'recall': round(hits / len(_BENCHMARK_MATCHES), 3),
+        'false_hit_rate': round(misses_hit / len(_BENCHMARK_MISSES), 3),
+        'p50_ms': round(timings[len(timings) // 2] * 1000, 4),
+        'p99_ms': round(timings[int(len(timings) * 0.99)] * 1000, 4),
+    }
+
+
+if __name__ == "__main__":
+    import sys
+    name = sys.argv[1] if len(sys.argv) > 1 else ""
+    for value in ((0.75, 0.8, 0.85, 0.9, 0.95) if name else (None,)):
+        print(benchmark(name, threshold=value))
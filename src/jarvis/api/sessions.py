@@ -0,0 +1,148 @@
+"""Conversation Session Module"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+
+# Characters kept per turn when old turns are folded into the summary
+_SUMMARY_CLIP = 160
+
+
+def estimate_tokens(text):
+    """Roughly estimate the token count of text (about 4 characters per token)"""
+    return len(text) // 4 + 1
+
+
+def _clip(text):
+    """Shorten text to a single summary line"""
+    text = " ".join(text.split())
+    return text if len(text) <= _SUMMARY_CLIP else text[:_SUMMARY_CLIP - 3] + "..."
+
+
+class ConversationSession:
+    """Multi-turn history for one conversation"""
+    
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.turns = []
+        self.summary_lines = []
+        self.last_active = time.time()
+        # Held for a whole turn, on the client's event loop
+        self.lock = asyncio.Lock()
+    
+    def size_bytes(self):
+        """Approximate memory held by the session's text"""
+        return sum(len(u) + len(m) for u, m in self.turns) + sum(len(line) for line in self.summary_lines)
+    
+    def history_tokens(self):
+        """Estimated tokens the session adds to each prompt"""
+        return (
+            sum(estimate_tokens(u) + estimate_tokens(m) for u, m in self.turns)
+            + sum(estimate_tokens(line) for line in self.summary_lines)
+        )
+    
+    def to_history(self):
+        """Build the history list for a Gemini ChatSession"""
+        history = []
+        if self.summary_lines:
+            summary = "Summary of earlier conversation:\n" + "\n".join(self.summary_lines)
+            history.append({'role': 'user', 'parts': [summary]})
+            history.append({'role': 'model', 'parts': ["Understood."]})
+        for user_text, model_text in self.turns:
+            history.append({'role': 'user', 'parts': [user_text]})
+            history.append({'role': 'model', 'parts': [model_text]})
+        return history
+
+
+class SessionStore:
+    """Bounded store of conversation sessions with LRU eviction of idle ones"""
+    
+    def __init__(self, max_sessions=1000, idle_timeout=1800, history_tokens=2000,
+                 max_bytes=64 * 1024 * 1024):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.history_tokens = history_tokens
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self.compactions = 0
+        self._sessions = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+    
+    def get(self, session_id):
+        """Get a session by id, creating it if needed"""
+        with self._lock:
+            self._evict_idle(time.time())
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = ConversationSession(session_id)
+                self._sessions[session_id] = session
+                self._evict_over_limit()
+            self._sessions.move_to_end(session_id)
+            session.last_active = time.time()
+            return session
+    
+    def record_turn(self, session, user_text, model_text):
+        """Append a completed turn and compact the history to its token budget"""
+        with self._lock:
+            before = session.size_bytes()
+            session.turns.append((user_text, model_text))
+            session.last_active = time.time()
+            self._compact(session)
+            if self._sessions.get(session.session_id) is session:
+                self._bytes += session.size_bytes() - before
+                self._evict_over_limit()
+    
+    def delete(self, session_id):
+        """Forget a session"""
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                self._bytes -= session.size_bytes()
+            return session is not None
+    
+    def stats(self):
+        """Get session counters for monitoring"""
+        with self._lock:
+            return {
+                'sessions': len(self._sessions),
+                'max_sessions': self.max_sessions,
+                'memory_bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'history_tokens': self.history_tokens,
+                'evictions': self.evictions,
+                'compactions': self.compactions,
+            }
+    
+    def _compact(self, session):
+        """Fold the oldest turns into summary lines until the history fits"""
+        # The summary may use at most a quarter of the budget
+        summary_budget = self.history_tokens // 4
+        while session.history_tokens() > self.history_tokens and len(session.turns) > 1:
+            user_text, model_text = session.turns.pop(0)
+            session.summary_lines.append(f"User: {_clip(user_text)} / Jarvis: {_clip(model_text)}")
+            self.compactions += 1
+            while (sum(estimate_tokens(line) for line in session.summary_lines) > summary_budget
+                   and session.summary_lines):
+                session.summary_lines.pop(0)
+    
+    def _evict_idle(self, now):
+        """Drop sessions idle for longer than the timeout"""
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_active <= self.idle_timeout:
+                break
+            self._drop_oldest()
+    
+    def _evict_over_limit(self):
+        """Drop least recently used sessions beyond the count and memory limits"""
+        while len(self._sessions) > self.max_sessions or (
+            self._bytes > self.max_bytes and len(self._sessions) > 1
+        ):
+            self._drop_oldest()
+    
+    def _drop_oldest(self):
+        """Evict the least recently used session"""
+        _, session = self._sessions.popitem(last=False)
+        self._bytes -= session.size_bytes()
+        self.evictions += 1
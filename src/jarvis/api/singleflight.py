@@ -0,0 +1,88 @@
+"""Request Coalescing Module"""
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Shares one in-flight call between concurrent callers with the same key"""
+    
+    def __init__(self):
+        self.executed = 0
+        self.deduplicated = 0
+        self._calls = {}
+        self._tasks = {}
+        self._lock = threading.Lock()
+    
+    def do(self, key, fn, *args):
+        """
+        Call fn(*args), or wait for an identical call already in flight
+        
+        Args:
+            key (str): Identifies calls that may share a result
+            fn (callable): The function to run if no call is in flight
+        
+        Returns:
+            The result of the shared call; its exception is raised to every waiter
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.executed += 1
+            else:
+                self.deduplicated += 1
+        
+        if not leader:
+            return future.result()
+        
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+        return future.result()
+    
+    async def do_async(self, key, coro_fn, *args):
+        """
+        Await coro_fn(*args), or join an identical call already in flight
+        
+        Args:
+            key (str): Identifies calls that may share a result
+            coro_fn (callable): Coroutine function to run if no call is in flight
+        
+        Returns:
+            The result of the shared call; its exception is raised to every waiter
+        """
+        loop_key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            task = self._tasks.get(loop_key)
+            if task is not None:
+                self.deduplicated += 1
+            else:
+                task = asyncio.ensure_future(coro_fn(*args))
+                self._tasks[loop_key] = task
+                self.executed += 1
+                task.add_done_callback(lambda _: self._forget(loop_key, task))
+        
+        # Shield so one cancelled waiter does not cancel the call for the rest
+        return await asyncio.shield(task)
+    
+    def _forget(self, loop_key, task):
+        """Drop a finished task so later calls start a fresh one"""
+        with self._lock:
+            if self._tasks.get(loop_key) is task:
+                del self._tasks[loop_key]
+    
+    def stats(self):
+        """Get coalescing counters for monitoring"""
+        with self._lock:
+            return {
+                'in_flight': len(self._calls) + len(self._tasks),
+                'executed': self.executed,
+                'deduplicated': self.deduplicated,
+            }
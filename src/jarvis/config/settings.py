@@ -11,26 +11,184 @@ except ImportError:
 # API Configuration
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash-exp")
+# Maximum number of in-flight Gemini requests per process (async client)
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "64"))
+
+# Upstream Resilience Configuration
+GEMINI_RETRY_ATTEMPTS = int(os.getenv("GEMINI_RETRY_ATTEMPTS", "3"))
+GEMINI_RETRY_BASE_DELAY = float(os.getenv("GEMINI_RETRY_BASE_DELAY", "0.5"))
+GEMINI_RETRY_MAX_DELAY = float(os.getenv("GEMINI_RETRY_MAX_DELAY", "8"))
+# Total time budget for one request, across all attempts and waits
+GEMINI_RETRY_DEADLINE = float(os.getenv("GEMINI_RETRY_DEADLINE", "30"))
+GEMINI_BREAKER_FAILURES = int(os.getenv("GEMINI_BREAKER_FAILURES", "5"))
+GEMINI_BREAKER_RESET = float(os.getenv("GEMINI_BREAKER_RESET", "30"))
+
+# Quota Scheduling Configuration (shared API key; 0 disables a limit). Under
+# gunicorn each of the WEB_WORKERS processes gets its share of these limits
+GEMINI_REQUESTS_PER_MINUTE = int(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "60"))
+GEMINI_TOKENS_PER_MINUTE = int(os.getenv("GEMINI_TOKENS_PER_MINUTE", "1000000"))
+# Tokens budgeted for each response, on top of the prompt's own estimate
+GEMINI_EXPECTED_OUTPUT_TOKENS = int(os.getenv("GEMINI_EXPECTED_OUTPUT_TOKENS", "500"))
+GEMINI_QUEUE_TIMEOUT = float(os.getenv("GEMINI_QUEUE_TIMEOUT", "60"))
+
+# Response Cache Configuration ("memory", "sqlite" or "none")
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "3600"))
+RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH", "jarvis_cache.sqlite3")
+
+# Semantic Cache Configuration (near-duplicate prompt matching). Without a
+# model only rewordings of the same words match; with a sentence-transformers
+# model (e.g. "all-MiniLM-L6-v2", requires numpy) paraphrases scoring at least
+# the threshold match too (python -m jarvis.api.semantic_cache MODEL to tune it)
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "False").lower() == "true"
+SEMANTIC_CACHE_MODEL = os.getenv("SEMANTIC_CACHE_MODEL", "")
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.9"))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "4096"))
+SEMANTIC_CACHE_MAX_MB = float(os.getenv("SEMANTIC_CACHE_MAX_MB", "16"))
+
+# Conversation Session Configuration
+SESSION_MAX_SESSIONS = int(os.getenv("SESSION_MAX_SESSIONS", "1000"))
+SESSION_IDLE_TIMEOUT = float(os.getenv("SESSION_IDLE_TIMEOUT", "1800"))
+SESSION_HISTORY_TOKENS = int(os.getenv("SESSION_HISTORY_TOKENS", "2000"))
+SESSION_MAX_MB = float(os.getenv("SESSION_MAX_MB", "64"))
 
 # Flask Configuration
 FLASK_HOST = os.getenv("FLASK_HOST", "0.0.0.0")
 FLASK_PORT = int(os.getenv("FLASK_PORT", "5000"))
-FLASK_DEBUG = os.getenv("FLASK_DEBUG", "True").lower() == "true"
+FLASK_DEBUG = os.getenv("FLASK_DEBUG", "False").lower() == "true"
+
+# Batch Chat Configuration
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "32"))
+BATCH_RETRIES = int(os.getenv("BATCH_RETRIES", "2"))
+BATCH_MAX_RETRIES = int(os.getenv("BATCH_MAX_RETRIES", "5"))
+# Longest wait between attempts at one record, in seconds
+BATCH_MAX_BACKOFF = float(os.getenv("BATCH_MAX_BACKOFF", "30"))
+
+# Production Server Configuration ("auto", "gunicorn", "waitress" or "flask")
+WEB_SERVER = os.getenv("WEB_SERVER", "auto")
+# Sessions and caches are per process; keep one worker unless requests for a
+# session are routed to the same worker
+WEB_WORKERS = int(os.getenv("WEB_WORKERS", "1"))
+# Request threads per worker; they only wait while Gemini calls run on the
+# shared event loop, so this can be well above GEMINI_MAX_CONCURRENCY
+WEB_THREADS = int(os.getenv("WEB_THREADS", "32"))
+# Reverse proxies in front of the app whose X-Forwarded-For entries are trusted
+# for client addresses (0 when clients connect directly)
+WEB_TRUSTED_PROXIES = int(os.getenv("WEB_TRUSTED_PROXIES", "0"))
+WEB_KEEPALIVE = int(os.getenv("WEB_KEEPALIVE", "5"))
+# Not a request deadline: gunicorn's worker heartbeat timeout, or waitress's
+# idle-connection timeout (seconds without socket activity)
+WEB_TIMEOUT = int(os.getenv("WEB_TIMEOUT", "120"))
+WEB_GRACEFUL_TIMEOUT = int(os.getenv("WEB_GRACEFUL_TIMEOUT", "30"))
 
 # Desktop App Configuration
 DESKTOP_APP_TITLE = "Jarvis 3.0 - multimodel Assistant"
 DESKTOP_APP_GEOMETRY = "1200x800"
 DESKTOP_BG_COLOR = '#0a0a1a'
 
+# Camera Configuration
+CAMERA_INDEX = int(os.getenv("CAMERA_INDEX", "0"))
+# Video file or image sequence (directory, glob or frames/%04d.png) played in
+# place of the primary camera; empty uses the camera itself
+CAMERA_SOURCE = os.getenv("CAMERA_SOURCE", "")
+# Frame slots shared by the capture thread and its readers (at least 2)
+CAMERA_BUFFER_SLOTS = int(os.getenv("CAMERA_BUFFER_SLOTS", "3"))
+# Extra cameras, e.g. "1,2"; when empty, indices below CAMERA_MAX_DEVICES are probed
+CAMERA_INDICES = [int(index) for index in os.getenv("CAMERA_INDICES", "").split(",") if index.strip()]
+CAMERA_MAX_DEVICES = int(os.getenv("CAMERA_MAX_DEVICES", "4"))
+# Size of each camera's tile in the composite view
+CAMERA_TILE_WIDTH = int(os.getenv("CAMERA_TILE_WIDTH", "320"))
+CAMERA_TILE_HEIGHT = int(os.getenv("CAMERA_TILE_HEIGHT", "240"))
+# Highest capture resolution and display rate; the governor steps down from these
+CAMERA_WIDTH = int(os.getenv("CAMERA_WIDTH", "640"))
+CAMERA_HEIGHT = int(os.getenv("CAMERA_HEIGHT", "480"))
+DISPLAY_MAX_FPS = float(os.getenv("DISPLAY_MAX_FPS", "30"))
+# Adaptive quality: keep p95 capture-to-display/gesture latency under budget
+GOVERNOR_ENABLED = os.getenv("GOVERNOR_ENABLED", "True").lower() == "true"
+GOVERNOR_TARGET_LATENCY_MS = float(os.getenv("GOVERNOR_TARGET_LATENCY_MS", "150"))
+GOVERNOR_CPU_HIGH = float(os.getenv("GOVERNOR_CPU_HIGH", "85"))
+
 # MediaPipe Configuration
 MEDIAPIPE_MIN_DETECTION_CONFIDENCE = 0.7
 MEDIAPIPE_MIN_TRACKING_CONFIDENCE = 0.5
+# Model complexity, lower is faster: hands 0-1, pose 0-2; segmentation model
+# 0 is the general model, 1 the faster landscape one
+HANDS_MODEL_COMPLEXITY = int(os.getenv("HANDS_MODEL_COMPLEXITY", "1"))
+POSE_MODEL_COMPLEXITY = int(os.getenv("POSE_MODEL_COMPLEXITY", "1"))
+SEGMENTATION_MODEL = int(os.getenv("SEGMENTATION_MODEL", "1"))
 
 # Voice Recognition Configuration
 VOICE_TIMEOUT = 5
 VOICE_PHRASE_TIME_LIMIT = None
 
-# Gesture Configuration
-GESTURE_COOLDOWN = 20
+# Gesture Configuration (time-based, independent of frame rate)
+# Seconds of per-frame predictions voted over, and the share of the window a
+# gesture needs to take over (enter) and to hold on (release)
+GESTURE_WINDOW_SECONDS = float(os.getenv("GESTURE_WINDOW_SECONDS", "0.5"))
+GESTURE_ENTER_SHARE = float(os.getenv("GESTURE_ENTER_SHARE", "0.6"))
+GESTURE_RELEASE_SHARE = float(os.getenv("GESTURE_RELEASE_SHARE", "0.3"))
+GESTURE_COOLDOWN_SECONDS = float(os.getenv("GESTURE_COOLDOWN_SECONDS", "1.0"))
+# Palm travel (fraction of the frame) within the window that counts as a swipe
+SWIPE_WINDOW_SECONDS = float(os.getenv("SWIPE_WINDOW_SECONDS", "0.4"))
+SWIPE_MIN_DISTANCE = float(os.getenv("SWIPE_MIN_DISTANCE", "0.25"))
+# Trained gesture classifier (python -m jarvis.desktop.motion.classifier);
+# the built-in rules are used until a model file exists
+GESTURE_MODEL_PATH = os.getenv("GESTURE_MODEL_PATH", "gesture_model.npz")
+GESTURE_SAMPLES_PATH = os.getenv("GESTURE_SAMPLES_PATH", "gesture_samples.npz")
+# Hand detection cost: whole frames are downscaled to HAND_DETECT_WIDTH. Detectors
+# that do not track hands themselves (MediaPipe's tracking graph does) only get a
+# HAND_ROI_SIZE crop around a tracked hand, with a full detection every
+# HAND_FULL_DETECT_INTERVAL frames (0 disables ROI tracking)
+HAND_DETECT_WIDTH = int(os.getenv("HAND_DETECT_WIDTH", "640"))
+HAND_ROI_SIZE = int(os.getenv("HAND_ROI_SIZE", "256"))
+HAND_ROI_MARGIN = float(os.getenv("HAND_ROI_MARGIN", "0.25"))
+HAND_FULL_DETECT_INTERVAL = int(os.getenv("HAND_FULL_DETECT_INTERVAL", "30"))
+
+# Frames queued in front of each gesture pipeline stage; older ones are dropped
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "1"))
+# When set, every motion control session records its hand landmarks to a new
+# directory here (python -m jarvis.desktop.motion.landmark_store to replay them)
+LANDMARK_RECORD_DIR = os.getenv("LANDMARK_RECORD_DIR", "")
+
+# Video Recording Configuration
+VIDEO_DIR = os.getenv("VIDEO_DIR", "videos")
+# Output is constant frame rate; missed frames are repeated, extra ones skipped
+VIDEO_FPS = float(os.getenv("VIDEO_FPS", "30"))
+# FourCC of the encoder; mp4v/avc1/h264/hev1/hvc1 are written as .mp4, others as .avi
+VIDEO_CODEC = os.getenv("VIDEO_CODEC", "mp4v")
+# Ask OpenCV for a hardware encoder, falling back to software when there is none
+VIDEO_HW_ACCELERATION = os.getenv("VIDEO_HW_ACCELERATION", "True").lower() == "true"
+# Start a new file after this many seconds or megabytes (0 disables either limit)
+VIDEO_SEGMENT_SECONDS = float(os.getenv("VIDEO_SEGMENT_SECONDS", "300"))
+VIDEO_SEGMENT_MB = float(os.getenv("VIDEO_SEGMENT_MB", "500"))
+# Frames waiting for the encoder; beyond this, new frames are dropped and counted
+VIDEO_QUEUE_SIZE = int(os.getenv("VIDEO_QUEUE_SIZE", "8"))
+# Record the frame with landmark overlays drawn on it, or the clean camera image
+VIDEO_OVERLAY = os.getenv("VIDEO_OVERLAY", "True").lower() == "true"
+# Pre-roll: keep the last PREROLL_SECONDS of the feed in memory, up to
+# PREROLL_MEMORY_MB, so "save last N seconds" can write them out (0 disables)
+PREROLL_SECONDS = float(os.getenv("PREROLL_SECONDS", "0"))
+PREROLL_MEMORY_MB = float(os.getenv("PREROLL_MEMORY_MB", "64"))
+# JPEG quality of buffered frames; 0 keeps raw frames (no encoding cost, ~10x the memory)
+PREROLL_JPEG_QUALITY = int(os.getenv("PREROLL_JPEG_QUALITY", "80"))
+# Gesture that saves the pre-roll buffer, e.g. "pointing up"; empty (the default)
+# disables it. A gesture set here no longer triggers its usual action.
+PREROLL_GESTURE = os.getenv("PREROLL_GESTURE", "")
+
+# Image Capture Configuration (screenshots and camera pictures)
+IMAGE_DIR = os.getenv("IMAGE_DIR", ".")
+# "png", "jpg" or "webp"
+SCREENSHOT_FORMAT = os.getenv("SCREENSHOT_FORMAT", "png")
+PICTURE_FORMAT = os.getenv("PICTURE_FORMAT", "jpg")
+# JPEG/WebP quality (0-100) and PNG compression level (0-9, higher is smaller but slower)
+IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", "90"))
+PNG_COMPRESSION = int(os.getenv("PNG_COMPRESSION", "1"))
+# Threads encoding and saving images in the background
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+# Shots and seconds between them for "burst" commands
+BURST_COUNT = int(os.getenv("BURST_COUNT", "5"))
+BURST_INTERVAL = float(os.getenv("BURST_INTERVAL", "0.5"))
 
 
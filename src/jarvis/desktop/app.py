@@ -4,17 +4,19 @@ from tkinter import ttk, scrolledtext
 import queue
 import threading
 import time
-from PIL import Image, ImageTk
 import cv2
 
 from jarvis.desktop.voice.voice_controller import VoiceController
-from jarvis.desktop.motion.gesture_recognizer import GestureRecognizer
-from jarvis.desktop.camera.camera_controller import CameraController
+from jarvis.desktop.camera.capture_manager import CaptureManager
+from jarvis.desktop.camera.governor import PerformanceGovernor
+from jarvis.desktop.camera.preroll import PrerollBuffer
+from jarvis.desktop.camera.video_recorder import VideoRecorder
 from jarvis.desktop.command_processor import CommandProcessor
+from jarvis.desktop.image_writer import ImageWriter
 from jarvis.desktop.gui.components import ConsoleWidget
+from jarvis.desktop.gui.frame_display import FrameDisplay
 from jarvis.config.settings import (
-    DESKTOP_APP_TITLE, DESKTOP_APP_GEOMETRY, DESKTOP_BG_COLOR,
-    GESTURE_COOLDOWN
+    DESKTOP_APP_TITLE, DESKTOP_APP_GEOMETRY, DESKTOP_BG_COLOR, VIDEO_OVERLAY
 )
 
 try:
@@ -36,18 +38,28 @@ class JarvisDesktopApp:
         
         # Initialize controllers
         self.voice_controller = VoiceController()
-        self.gesture_recognizer = GestureRecognizer()
-        self.camera_controller = CameraController()
+        # Every camera gets its own capture thread and gesture pipeline
+        self.capture_manager = CaptureManager()
+        self.camera_controller = self.capture_manager.primary.camera
+        # Frames are encoded on a background thread so recording never stalls the feed
+        self.video_recorder = VideoRecorder()
+        # Recent footage kept in memory for "save last N seconds"
+        self.preroll_buffer = PrerollBuffer()
+        self.preroll_buffer.on_saved = lambda success, msg: self.log_message(msg)
+        self.image_writer = ImageWriter()
         self.command_processor = CommandProcessor(
             self.camera_controller, 
-            self.voice_controller
+            self.voice_controller,
+            self.video_recorder,
+            self.preroll_buffer,
+            self.image_writer
         )
+        self.governor = PerformanceGovernor()
         
         # State variables
         self.voice_active = False
         self.motion_active = False
-        self.last_gesture = None
-        self.gesture_cooldown = 0
+        self.camera_error = None
         
         # MediaPipe drawing utils
         if MEDIAPIPE_AVAILABLE:
@@ -126,6 +138,7 @@ class JarvisDesktopApp:
             height=20
         )
         self.camera_label.pack(fill=tk.BOTH, expand=True)
+        self.frame_display = FrameDisplay(self.camera_label)
         
         # Control buttons frame
         control_frame = ttk.Frame(left_frame)
@@ -155,6 +168,14 @@ class JarvisDesktopApp:
         )
         self.camera_button.pack(side=tk.LEFT, padx=5)
         
+        self.switch_camera_button = ttk.Button(
+            control_frame, 
+            text="Switch Camera", 
+            command=self.switch_camera, 
+            width=15
+        )
+        self.switch_camera_button.pack(side=tk.LEFT, padx=5)
+        
         # Status labels
         self.voice_status = tk.Label(
             control_frame, 
@@ -216,7 +237,7 @@ class JarvisDesktopApp:
             self.voice_status.config(text="Voice: On", fg='green')
             self.start_voice_control()
             # Auto-start camera for voice control
-            if not self.camera_controller.is_active():
+            if not self.capture_manager.is_active():
                 self.toggle_camera()
         else:
             self.voice_active = False
@@ -226,20 +247,26 @@ class JarvisDesktopApp:
     
     def toggle_camera(self):
         """Toggle camera control"""
-        if not self.camera_controller.is_active():
-            success, msg = self.camera_controller.start_camera()
+        if not self.capture_manager.is_active():
+            success, msg = self.capture_manager.start()
             if success:
                 self.camera_button.config(text="Stop Camera")
                 self.camera_status.config(text="Camera: On", fg='green')
-                self.log_message("Camera started")
+                self.log_message(f"Camera started: {msg}")
+                if self.motion_active:
+                    self.capture_manager.start_pipelines()
                 self.update_camera_feed()
             else:
                 self.log_message(f"Camera failed: {msg}")
         else:
-            self.camera_controller.stop_camera()
+            if self.video_recorder.is_recording():
+                success, msg = self.video_recorder.stop()
+                self.log_message(msg)
+            self.capture_manager.stop()
+            self.preroll_buffer.clear()
             self.camera_button.config(text="Start Camera")
             self.camera_status.config(text="Camera: Off", fg='red')
-            self.camera_label.config(image='', text="Camera Feed\n[Click Start Camera]")
+            self.frame_display.clear("Camera Feed\n[Click Start Camera]")
             self.log_message("Camera stopped")
     
     def toggle_motion(self):
@@ -249,10 +276,11 @@ class JarvisDesktopApp:
             return
         
         if not self.motion_active:
-            if not self.camera_controller.is_active():
+            if not self.capture_manager.is_active():
                 self.toggle_camera()
-            if self.camera_controller.is_active():
+            if self.capture_manager.is_active():
                 self.motion_active = True
+                self.capture_manager.start_pipelines()
                 self.motion_button.config(text="Stop Motion Control")
                 self.motion_status.config(text="Motion: On", fg='green')
                 self.log_message("Motion control started")
@@ -260,6 +288,7 @@ class JarvisDesktopApp:
                 self.log_message("Cannot start motion control: Camera not available")
         else:
             self.motion_active = False
+            self.capture_manager.stop_pipelines()
             self.motion_button.config(text="Start Motion Control")
             self.motion_status.config(text="Motion: Off", fg='red')
             self.log_message("Motion control stopped")
@@ -287,57 +316,87 @@ class JarvisDesktopApp:
     
     def update_camera_feed(self):
         """Update camera feed display"""
-        if self.camera_controller.is_active():
-            frame, error = self.camera_controller.read_frame()
+        if self.capture_manager.is_active():
+            started = time.monotonic()
+            # Frames arrive from the capture threads; only redraw when a new one is ready.
+            # Hand tracking runs in the gesture pipelines; only their results are drawn here
+            frame, captured_at = self.capture_manager.next_display_frame(self.prepare_frame)
             if frame is not None:
-                # Process hand gestures if motion control is active
-                if self.motion_active and MEDIAPIPE_AVAILABLE:
-                    frame = self.process_hand_gestures(frame)
-                
-                # Convert frame for display
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                frame = cv2.flip(frame, 1)
-                img = Image.fromarray(frame)
-                img = ImageTk.PhotoImage(image=img)
-                
-                self.camera_label.config(image=img)
-                self.camera_label.image = img
-            else:
-                if error:
-                    self.log_message(f"Camera error: {error}")
+                # The composite view mirrors each tile itself
+                self.frame_display.mirror = self.capture_manager.selected is not None
+                self.frame_display.show(frame)
+                self.governor.display_latency.record(time.monotonic() - captured_at)
+            elif self.camera_controller.last_error != self.camera_error:
+                # Capture failures repeat every retry; report each new one once
+                self.camera_error = self.camera_controller.last_error
+                if self.camera_error:
+                    self.log_message(f"Camera error: {self.camera_error}")
             
-            self.root.after(10, self.update_camera_feed)
+            self.process_gestures()
+            self.adjust_quality()
+            
+            # Refresh at the governed display rate, minus the time this update took
+            remaining = self.governor.display_interval - (time.monotonic() - started)
+            self.root.after(max(1, int(remaining * 1000)), self.update_camera_feed)
     
-    def process_hand_gestures(self, frame):
-        """Process hand gestures in frame"""
-        if not MEDIAPIPE_AVAILABLE or not self.gesture_recognizer.is_available():
-            return frame
-        
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.gesture_recognizer.hands.process(rgb_frame)
+    def adjust_quality(self):
+        """Let the governor trade resolution, inference stride and display FPS for latency"""
+        trackers = [pipeline.end_to_end for pipeline in self.capture_manager.running_pipelines()]
+        if self.governor.update(trackers):
+            width, height = self.governor.resolution
+            self.capture_manager.set_resolution(width, height)
+            self.capture_manager.set_inference_stride(self.governor.inference_stride)
+            stats = self.governor.stats()
+            self.log_message(
+                f"Performance: {stats['resolution']}, inference every "
+                f"{stats['inference_stride']} frame(s), {stats['display_fps']} FPS display"
+            )
+    
+    def switch_camera(self):
+        """Cycle the display through each camera and the composite view"""
+        if not self.capture_manager.is_active():
+            self.log_message("Start the camera first")
+            return
+        selected = self.capture_manager.cycle_display()
+        self.log_message("Showing all cameras" if selected is None else f"Showing camera {selected}")
+    
+    def prepare_frame(self, frame, device):
+        """Record, buffer and annotate a camera frame before it is displayed"""
+        # The shown camera is recorded, or the primary one in the composite view
+        recorded = self.capture_manager.selected
+        if recorded is None:
+            recorded = self.capture_manager.primary.index
+        record = device.index == recorded
         
-        if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                # Draw hand landmarks
-                if self.drawing_utils:
-                    self.drawing_utils.draw_landmarks(
-                        frame,
-                        hand_landmarks,
-                        self.mp_hands.HAND_CONNECTIONS
-                    )
-                
-                # Process gestures
-                if self.gesture_cooldown <= 0:
-                    gesture = self.gesture_recognizer.recognize_gesture(hand_landmarks)
-                    if gesture != self.last_gesture and gesture != "None":
-                        self.handle_gesture(gesture)
-                        self.last_gesture = gesture
-                        self.gesture_cooldown = GESTURE_COOLDOWN
-                
-                self.gesture_cooldown = max(0, self.gesture_cooldown - 1)
-                break  # Process first hand only
+        if record and not VIDEO_OVERLAY:
+            self.record_frame(frame)
+        if self.motion_active and MEDIAPIPE_AVAILABLE:
+            self.draw_hand_landmarks(frame, device)
+        if record and VIDEO_OVERLAY:
+            self.record_frame(frame)
+    
+    def record_frame(self, frame):
+        """Hand a frame to the video recorder and the pre-roll buffer"""
+        if self.video_recorder.is_recording():
+            self.video_recorder.write(frame)
+        self.preroll_buffer.add(frame)
+    
+    def draw_hand_landmarks(self, frame, device):
+        """Draw a camera's latest tracked hand landmarks onto its frame"""
+        if not self.drawing_utils:
+            return
         
-        return frame
+        for hand_landmarks in device.pipeline.latest_landmarks():
+            self.drawing_utils.draw_landmarks(
+                frame,
+                hand_landmarks,
+                self.mp_hands.HAND_CONNECTIONS
+            )
+    
+    def process_gestures(self):
+        """Handle gestures fired by the gesture pipelines"""
+        for _, gesture in self.capture_manager.gestures():
+            self.handle_gesture(gesture)
     
     def handle_gesture(self, gesture):
         """Handle gesture commands"""
@@ -366,7 +425,10 @@ class JarvisDesktopApp:
         """Handle application closing"""
         self.voice_active = False
         self.motion_active = False
-        self.camera_controller.release()
+        self.video_recorder.stop()
+        self.capture_manager.stop()
+        # Let queued screenshots and pictures finish saving
+        self.image_writer.shutdown()
         cv2.destroyAllWindows()
         self.root.destroy()
 
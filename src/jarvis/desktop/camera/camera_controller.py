@@ -1,47 +1,189 @@
 """Camera Control Module"""
 import cv2
+import threading
 import time
+from collections import deque
+
+from jarvis.desktop.camera.frame_buffer import FrameRingBuffer
+from jarvis.desktop.camera.sources import is_device, open_source, source_fps
+from jarvis.config.settings import CAMERA_INDEX, CAMERA_BUFFER_SLOTS, CAMERA_WIDTH, CAMERA_HEIGHT
+
+# Seconds to back off after a failed read so a stalled camera does not spin
+_READ_RETRY_DELAY = 0.01
+
+# Seconds to wait for the previous capture thread before reopening the source
+_REOPEN_TIMEOUT = 5.0
 
 
 class CameraController:
-    """Handles camera operations"""
+    """Handles camera operations on a dedicated capture thread"""
     
-    def __init__(self, camera_index=0):
+    def __init__(self, camera_index=CAMERA_INDEX, buffer_slots=CAMERA_BUFFER_SLOTS, source=None):
         self.camera_index = camera_index
+        # A video file or image sequence (see open_source) can stand in for the camera
+        self.source = camera_index if source is None else source
         self.cap = None
         self.camera_active = False
+        self.buffer = FrameRingBuffer(buffer_slots)
+        self.frames_captured = 0
+        self.read_errors = 0
+        self.last_error = None
+        self._frame_times = deque(maxlen=30)
+        self._stop_event = None
+        self._thread = None
+        self.resolution = (CAMERA_WIDTH, CAMERA_HEIGHT)
+        self._requested_size = None
+        self._size_lock = threading.Lock()
     
     def start_camera(self):
         """Start camera capture"""
+        if self.cap is not None and not self.camera_active:
+            # A file source reached its end; clean up before reopening it
+            self.stop_camera()
         if self.cap is None:
+            if not self._wait_for_capture_thread(_REOPEN_TIMEOUT):
+                # Two threads reading one device would corrupt both streams
+                return False, "Camera is still shutting down; try again"
             try:
-                self.cap = cv2.VideoCapture(self.camera_index)
+                self.cap = open_source(self.source)
                 if self.cap.isOpened():
+                    if is_device(self.source):
+                        # Keep the driver from queueing stale frames ahead of us
+                        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
                     self.camera_active = True
+                    self.last_error = None
+                    self._frame_times.clear()
+                    with self._size_lock:
+                        self._requested_size = self.resolution
+                    # Each capture thread gets its own stop flag, so a stalled old
+                    # thread can never be revived by a restart
+                    self._stop_event = threading.Event()
+                    self._thread = threading.Thread(
+                        target=self._capture_loop, args=(self.cap, self._stop_event), daemon=True
+                    )
+                    self._thread.start()
                     return True, "Camera started successfully"
                 else:
+                    self.cap.release()
+                    self.cap = None
                     return False, "Failed to open camera"
             except Exception as e:
+                self.cap = None
                 return False, f"Failed to start camera: {str(e)}"
         return True, "Camera already started"
     
     def stop_camera(self):
         """Stop camera capture"""
-        if self.cap is not None:
-            self.cap.release()
-            self.cap = None
         self.camera_active = False
+        if self._stop_event is not None:
+            self._stop_event.set()
+        # The capture thread releases the device itself once its read returns;
+        # a read stuck past the timeout is waited for again before reopening
+        self._wait_for_capture_thread(1.0)
+        self.cap = None
+    
+    def _wait_for_capture_thread(self, timeout):
+        """
+        Wait for the previous capture thread to exit
+        
+        Returns:
+            bool: True if no capture thread is left running
+        """
+        if self._thread is None:
+            return True
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            return False
+        self._thread = None
+        return True
+    
+    def _capture_loop(self, cap, stop_event):
+        """Read frames into the ring buffer as fast as the camera delivers them"""
+        shape = None
+        # Files would otherwise be read as fast as they decode, so play them at their own rate
+        interval = None if is_device(self.source) else 1.0 / source_fps(cap)
+        next_due = time.monotonic()
+        try:
+            while not stop_event.is_set():
+                # Take the request and clear it in one step, so a resolution set
+                # in between is applied on the next pass instead of being lost
+                with self._size_lock:
+                    requested, self._requested_size = self._requested_size, None
+                if requested is not None:
+                    # Resolution is changed here because VideoCapture is not thread-safe
+                    width, height = requested
+                    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+                    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+                slot = self.buffer.write_slot(shape) if shape else None
+                ret, frame = cap.read(slot)
+                if not ret and interval is not None:
+                    self.last_error = "End of video"
+                    self.camera_active = False
+                    break
+                if not ret:
+                    self.read_errors += 1
+                    self.last_error = "Failed to read frame"
+                    time.sleep(_READ_RETRY_DELAY)
+                    continue
+                if frame is not slot:
+                    # First frame, or the camera changed resolution
+                    shape = frame.shape
+                    self.buffer.write_slot(shape, frame.dtype)[...] = frame
+                now = time.monotonic()
+                self.buffer.publish(now)
+                self.frames_captured += 1
+                self.last_error = None
+                self._frame_times.append(now)
+                if interval is not None:
+                    next_due = max(next_due + interval, now - interval)
+                    time.sleep(max(0.0, next_due - time.monotonic()))
+        finally:
+            cap.release()
+    
+    def set_resolution(self, width, height):
+        """Ask the capture thread to switch resolution before its next read"""
+        with self._size_lock:
+            self.resolution = (width, height)
+            self._requested_size = self.resolution
     
     def read_frame(self):
-        """Read a frame from the camera"""
-        if self.cap is None or not self.camera_active:
+        """Read the newest frame from the camera without waiting for it"""
+        if not self.camera_active:
             return None, None
         
-        ret, frame = self.cap.read()
-        if ret:
+        frame, _, _ = self.buffer.latest()
+        if frame is not None:
             return frame, None
         else:
-            return None, "Failed to read frame"
+            return None, self.last_error
+    
+    def read_latest(self, after=0, out=None):
+        """
+        Get the newest frame if it is newer than one the caller already has
+        
+        Args:
+            after (int): Sequence number returned by the previous call
+            out (ndarray): Optional preallocated array to copy the frame into
+        
+        Returns:
+            tuple: (frame or None, seq, capture timestamp)
+        """
+        return self.buffer.latest(after, out)
+    
+    def wait_for_frame(self, after=0, timeout=0.1, out=None):
+        """Like read_latest(), but block up to `timeout` seconds for a new frame"""
+        return self.buffer.wait(after, timeout, out)
+    
+    def get_stats(self):
+        """Get capture FPS and frame counters"""
+        times = list(self._frame_times)
+        fps = (len(times) - 1) / (times[-1] - times[0]) if len(times) > 1 and times[-1] > times[0] else 0.0
+        return {
+            'capture_fps': round(fps, 1),
+            'frames_captured': self.frames_captured,
+            'frames_dropped': self.buffer.dropped,
+            'read_errors': self.read_errors,
+        }
     
     def is_active(self):
         """Check if camera is active"""
@@ -50,5 +192,3 @@ class CameraController:
     def release(self):
         """Release camera resources"""
         self.stop_camera()
-
-
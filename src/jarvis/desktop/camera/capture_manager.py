@@ -0,0 +1,270 @@
+"""Multi-Camera Capture Manager Module"""
+import math
+import os
+import time
+
+import cv2
+import numpy as np
+
+from jarvis.desktop.camera.camera_controller import CameraController
+from jarvis.desktop.motion.gesture_recognizer import GestureRecognizer
+from jarvis.desktop.motion.landmark_store import LandmarkWriter
+from jarvis.desktop.motion.pipeline import GesturePipeline
+from jarvis.config.settings import (
+    CAMERA_INDEX, CAMERA_SOURCE, CAMERA_INDICES, CAMERA_MAX_DEVICES,
+    CAMERA_TILE_WIDTH, CAMERA_TILE_HEIGHT, LANDMARK_RECORD_DIR
+)
+
+
+def enumerate_cameras(max_devices=CAMERA_MAX_DEVICES, skip=()):
+    """
+    Probe device indices and return the ones that open
+    
+    Args:
+        max_devices (int): Indices 0..max_devices-1 are tried
+        skip (iterable): Indices not to probe, e.g. cameras already in use
+    
+    Returns:
+        list: Indices of working cameras
+    """
+    found = []
+    for index in range(max_devices):
+        if index in skip:
+            continue
+        cap = cv2.VideoCapture(index)
+        try:
+            if cap.isOpened():
+                found.append(index)
+        finally:
+            cap.release()
+    return found
+
+
+class CameraDevice:
+    """One camera with its own capture thread and gesture pipeline"""
+    
+    def __init__(self, index, source=None):
+        self.index = index
+        self.camera = CameraController(camera_index=index, source=source)
+        # MediaPipe graphs are not shared between threads, so every device gets its own
+        self.pipeline = GesturePipeline(self.camera, GestureRecognizer())
+        self.display_seq = 0
+        self.display_buffer = None
+    
+    def stats(self):
+        """Get capture and pipeline statistics for this camera"""
+        stats = {'active': self.camera.is_active(), 'camera': self.camera.get_stats()}
+        if self.pipeline.is_running():
+            stats['pipeline'] = self.pipeline.get_stats()
+        return stats
+
+
+class CaptureManager:
+    """
+    Runs several cameras side by side, each with an independent pipeline
+    
+    Every device has its own capture thread and, while motion control is on,
+    its own preprocess/inference/classify threads, so throughput grows with
+    the cameras and cores available. The display shows one selected camera
+    or a composite grid of all of them.
+    """
+    
+    def __init__(self, indices=CAMERA_INDICES, primary=CAMERA_INDEX, source=CAMERA_SOURCE or None,
+                 tile_size=(CAMERA_TILE_WIDTH, CAMERA_TILE_HEIGHT), record_dir=LANDMARK_RECORD_DIR):
+        self.tile_size = tile_size
+        self.record_dir = record_dir
+        # The primary camera always exists, so other components can hold its controller
+        self.devices = {primary: CameraDevice(primary, source)}
+        for index in indices:
+            if index not in self.devices:
+                self.devices[index] = CameraDevice(index)
+        self.primary = self.devices[primary]
+        # Probe for more cameras on first start unless they were listed explicitly
+        # or the primary one is replaced by a recording
+        self._discover = not indices and source is None
+        self.selected = primary
+        self._composite = None
+    
+    def start(self):
+        """
+        Start every camera, discovering devices on the first call
+        
+        Returns:
+            tuple: (success, message); succeeds if at least one camera opened
+        """
+        if self._discover:
+            self._discover = False
+            for index in enumerate_cameras(skip=self.devices):
+                self.devices[index] = CameraDevice(index)
+        
+        failed = []
+        for index, device in list(self.devices.items()):
+            success, _ = device.camera.start_camera()
+            if not success:
+                failed.append(index)
+                # Cameras that cannot open are forgotten, except the primary one
+                if device is not self.primary:
+                    del self.devices[index]
+        
+        active = self.active_devices()
+        if not active:
+            return False, "Failed to open camera"
+        if self.selected is not None and self.selected not in self.devices:
+            self.selected = active[0].index
+        msg = f"{len(active)} camera(s) started"
+        if failed:
+            msg += f" ({', '.join(str(index) for index in failed)} failed)"
+        return True, msg
+    
+    def stop(self):
+        """Stop all pipelines and cameras"""
+        self.stop_pipelines()
+        for device in self.devices.values():
+            device.camera.stop_camera()
+            device.display_seq = 0
+    
+    def is_active(self):
+        """Check if any camera is capturing"""
+        return bool(self.active_devices())
+    
+    def active_devices(self):
+        """Devices whose camera is currently capturing"""
+        return [device for device in self.devices.values() if device.camera.is_active()]
+    
+    def start_pipelines(self):
+        """Start a gesture pipeline for every active camera, recording landmarks if configured"""
+        session = time.strftime("%Y%m%d-%H%M%S")
+        for device in self.active_devices():
+            if self.record_dir and not device.pipeline.is_running():
+                path = os.path.join(self.record_dir, f"{session}-camera{device.index}")
+                device.pipeline.recorder = LandmarkWriter(path)
+            device.pipeline.start()
+    
+    def stop_pipelines(self):
+        """Stop all gesture pipelines and close their landmark recordings"""
+        for device in self.devices.values():
+            # Detach the recorder first so a stage still finishing cannot write to it
+            recorder, device.pipeline.recorder = device.pipeline.recorder, None
+            device.pipeline.stop()
+            if recorder is not None:
+                recorder.close()
+    
+    def running_pipelines(self):
+        """Pipelines that are currently running"""
+        return [device.pipeline for device in self.devices.values() if device.pipeline.is_running()]
+    
+    def set_resolution(self, width, height):
+        """Apply a capture resolution to every camera"""
+        for device in self.devices.values():
+            device.camera.set_resolution(width, height)
+    
+    def set_inference_stride(self, stride):
+        """Run hand inference on every Nth frame of every camera"""
+        for device in self.devices.values():
+            device.pipeline.inference_stride = stride
+    
+    def gestures(self):
+        """Take all gestures fired since the last call, as (camera index, gesture) pairs"""
+        fired = []
+        for device in self.devices.values():
+            while not device.pipeline.gestures.empty():
+                fired.append((device.index, device.pipeline.gestures.get_nowait()))
+        return fired
+    
+    def select(self, index):
+        """Show one camera by index, or all of them as a grid with None"""
+        if index is not None and index not in self.devices:
+            raise ValueError(f"Unknown camera: {index}")
+        self.selected = index
+        for device in self.devices.values():
+            # Make the next read return a frame straight away
+            device.display_seq = 0
+    
+    def cycle_display(self):
+        """Step to the next camera, then the composite view, then back to the first"""
+        order = [device.index for device in self.active_devices()]
+        if len(order) > 1:
+            order.append(None)
+        if not order:
+            return self.selected
+        position = order.index(self.selected) + 1 if self.selected in order else 0
+        self.select(order[position % len(order)])
+        return self.selected
+    
+    def next_display_frame(self, draw=None):
+        """
+        Get the frame to display if anything new arrived since the last call
+        
+        Intended for a single consumer (the GUI thread).
+        
+        Args:
+            draw (callable): Optional draw(frame, device) run on each camera
+                frame before it is shown, e.g. to overlay landmarks
+        
+        Returns:
+            tuple: (BGR frame or None, capture timestamp of the oldest new frame);
+                composite frames are already mirrored, single cameras are not
+        """
+        if self.selected is not None:
+            device = self.devices.get(self.selected)
+            if device is None:
+                return None, None
+            frame, captured_at = self._read_device(device, draw)
+            return frame, captured_at
+        return self._read_composite(draw)
+    
+    def _read_device(self, device, draw):
+        """Copy a device's newest frame into its reused display buffer"""
+        frame, seq, captured_at = device.camera.read_latest(device.display_seq, out=device.display_buffer)
+        if frame is None:
+            return None, None
+        device.display_seq = seq
+        device.display_buffer = frame
+        if draw is not None:
+            draw(frame, device)
+        return frame, captured_at
+    
+    def _read_composite(self, draw):
+        """Redraw the grid tiles of cameras that have new frames"""
+        devices = self.active_devices()
+        if not devices:
+            return None, None
+        columns = math.ceil(math.sqrt(len(devices)))
+        rows = math.ceil(len(devices) / columns)
+        tile_width, tile_height = self.tile_size
+        shape = (rows * tile_height, columns * tile_width, 3)
+        if self._composite is None or self._composite.shape != shape:
+            self._composite = np.zeros(shape, dtype=np.uint8)
+            for device in devices:
+                device.display_seq = 0
+        
+        oldest = None
+        for position, device in enumerate(devices):
+            frame, captured_at = self._read_device(device, draw)
+            if frame is None:
+                continue
+            row, column = divmod(position, columns)
+            tile = self._composite[row * tile_height:(row + 1) * tile_height,
+                                   column * tile_width:(column + 1) * tile_width]
+            cv2.resize(frame, self.tile_size, dst=tile, interpolation=cv2.INTER_AREA)
+            # Tiles are mirrored one by one so the grid keeps camera order left to right
+            cv2.flip(tile, 1, dst=tile)
+            cv2.putText(tile, f"Camera {device.index}", (8, 24),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+            oldest = captured_at if oldest is None else min(oldest, captured_at)
+        
+        if oldest is None:
+            return None, None
+        return self._composite, oldest
+    
+    def get_stats(self):
+        """Get per-camera statistics and the combined capture rate"""
+        devices = {index: device.stats() for index, device in self.devices.items()}
+        return {
+            'cameras': len(self.active_devices()),
+            'selected': 'composite' if self.selected is None else self.selected,
+            'capture_fps': round(sum(
+                stats['camera']['capture_fps'] for stats in devices.values() if stats['active']
+            ), 1),
+            'devices': devices,
+        }
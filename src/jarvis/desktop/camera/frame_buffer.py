@@ -0,0 +1,81 @@
+"""Latest-Frame Ring Buffer Module"""
+import threading
+import time
+
+import numpy as np
+
+
+class FrameRingBuffer:
+    """
+    Preallocated ring of frame slots shared by one writer and many readers
+    
+    The writer fills the slot after the newest one in place and then
+    publishes it, so readers always see a complete frame and never wait
+    for the camera. Frames replaced before anyone read them count as dropped.
+    """
+    
+    def __init__(self, slots=3):
+        self.slots = max(2, slots)
+        self._frames = None
+        self._timestamps = [0.0] * self.slots
+        self._latest = -1
+        self._seq = 0
+        self._consumed_seq = 0
+        self.dropped = 0
+        self._cond = threading.Condition()
+    
+    def write_slot(self, shape, dtype=np.uint8):
+        """Get the array the next frame should be written into"""
+        if self._frames is None or self._frames.shape[1:] != tuple(shape):
+            with self._cond:
+                self._frames = np.empty((self.slots,) + tuple(shape), dtype=dtype)
+                self._latest = -1
+        return self._frames[(self._latest + 1) % self.slots]
+    
+    def publish(self, timestamp=None):
+        """Make the slot returned by write_slot() the newest frame"""
+        with self._cond:
+            if self._seq > self._consumed_seq:
+                self.dropped += 1
+            self._latest = (self._latest + 1) % self.slots
+            self._timestamps[self._latest] = timestamp or time.monotonic()
+            self._seq += 1
+            self._cond.notify_all()
+    
+    def latest(self, after=0, out=None):
+        """
+        Copy the newest frame if it is newer than `after`, without blocking
+        
+        Args:
+            after (int): Sequence number of the last frame the caller has seen
+            out (ndarray): Optional preallocated destination of the same shape
+        
+        Returns:
+            tuple: (frame, seq, timestamp); frame is None if nothing newer exists
+        """
+        with self._cond:
+            return self._copy_latest(after, out)
+    
+    def wait(self, after=0, timeout=None, out=None):
+        """Like latest(), but wait up to `timeout` seconds for a newer frame"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq > after, timeout)
+            return self._copy_latest(after, out)
+    
+    def _copy_latest(self, after, out):
+        """Copy the newest slot out while the writer cannot publish over it"""
+        if self._seq <= after or self._latest < 0:
+            return None, self._seq, None
+        frame = self._frames[self._latest]
+        if out is not None and out.shape == frame.shape:
+            np.copyto(out, frame)
+            frame = out
+        else:
+            frame = frame.copy()
+        self._consumed_seq = self._seq
+        return frame, self._seq, self._timestamps[self._latest]
+    
+    @property
+    def seq(self):
+        """Sequence number of the newest frame (0 before the first one)"""
+        return self._seq
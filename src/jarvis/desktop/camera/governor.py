@@ -0,0 +1,152 @@
+"""Adaptive Frame-Rate and Resolution Governor Module"""
+import os
+import time
+
+from jarvis.api.metrics import LatencyTracker
+from jarvis.config.settings import (
+    CAMERA_WIDTH, CAMERA_HEIGHT, DISPLAY_MAX_FPS, GOVERNOR_ENABLED,
+    GOVERNOR_TARGET_LATENCY_MS, GOVERNOR_CPU_HIGH
+)
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# Quality steps from best to cheapest: (capture scale, inference stride, display FPS scale).
+# Skipping inference frames is the cheapest saving, so it is given up first.
+LADDER = (
+    (1.0, 1, 1.0),
+    (1.0, 2, 1.0),
+    (0.75, 2, 1.0),
+    (0.75, 3, 0.75),
+    (0.5, 3, 0.75),
+    (0.5, 4, 0.5),
+)
+
+# Step back up only when latency is below this share of the budget
+_HEADROOM = 0.6
+# ... for this many evaluations in a row
+_CALM_EVALUATIONS = 3
+
+
+class CpuMonitor:
+    """Measures CPU load between calls: system-wide with psutil, else this process"""
+    
+    def __init__(self):
+        self._wall = time.monotonic()
+        self._cpu = time.process_time()
+        if PSUTIL_AVAILABLE:
+            psutil.cpu_percent(interval=None)
+    
+    def sample(self):
+        """CPU load in percent since the previous sample"""
+        if PSUTIL_AVAILABLE:
+            return psutil.cpu_percent(interval=None)
+        wall, cpu = time.monotonic(), time.process_time()
+        elapsed = max(wall - self._wall, 1e-6)
+        load = (cpu - self._cpu) / elapsed / (os.cpu_count() or 1) * 100
+        self._wall, self._cpu = wall, cpu
+        return load
+
+
+class PerformanceGovernor:
+    """
+    Trades capture resolution, inference stride and display FPS for latency
+    
+    Every `interval` seconds the p95 of capture-to-display latency (plus any
+    other stage's latency passed to update()) and the
+    CPU load are compared with the budget. Over budget moves one step down the
+    LADDER; sustained headroom moves one step back up.
+    """
+    
+    def __init__(self, target_latency_ms=GOVERNOR_TARGET_LATENCY_MS,
+                 cpu_high=GOVERNOR_CPU_HIGH, max_width=CAMERA_WIDTH, max_height=CAMERA_HEIGHT,
+                 max_fps=DISPLAY_MAX_FPS, interval=2.0, enabled=GOVERNOR_ENABLED):
+        self.display_latency = LatencyTracker(window=60)
+        self.target_latency_ms = target_latency_ms
+        self.cpu_high = cpu_high
+        self.max_width = max_width
+        self.max_height = max_height
+        self.max_fps = max_fps
+        self.interval = interval
+        self.enabled = enabled
+        self.level = 0
+        self.last_latency_ms = None
+        self.last_cpu = None
+        self._calm = 0
+        self._last_eval = time.monotonic()
+        self._cpu = CpuMonitor()
+    
+    @property
+    def resolution(self):
+        """Capture (width, height) for the current level"""
+        scale = LADDER[self.level][0]
+        return int(self.max_width * scale) // 2 * 2, int(self.max_height * scale) // 2 * 2
+    
+    @property
+    def inference_stride(self):
+        """Run hand inference on every Nth frame"""
+        return LADDER[self.level][1]
+    
+    @property
+    def display_interval(self):
+        """Seconds between display refreshes"""
+        return 1.0 / max(1.0, self.max_fps * LADDER[self.level][2])
+    
+    def update(self, trackers=()):
+        """
+        Re-evaluate the level if an interval has passed
+        
+        Args:
+            trackers: Extra LatencyTrackers to hold to the budget, e.g. the
+                gesture pipeline's end-to-end latency while it runs
+        
+        Returns:
+            bool: True if the level changed and the knobs should be re-applied
+        """
+        now = time.monotonic()
+        if not self.enabled or now - self._last_eval < self.interval:
+            return False
+        self._last_eval = now
+        
+        latencies = [tracker.snapshot()['p95_ms'] for tracker in (self.display_latency, *trackers)]
+        latencies = [value for value in latencies if value is not None]
+        if not latencies:
+            return False
+        self.last_latency_ms = latency = max(latencies)
+        self.last_cpu = cpu = round(self._cpu.sample(), 1)
+        
+        if latency > self.target_latency_ms or cpu > self.cpu_high:
+            self._calm = 0
+            if self.level < len(LADDER) - 1:
+                self.level += 1
+                self._settle(now)
+                return True
+        elif latency < self.target_latency_ms * _HEADROOM and cpu < self.cpu_high * _HEADROOM:
+            self._calm += 1
+            if self._calm >= _CALM_EVALUATIONS and self.level > 0:
+                self._calm = 0
+                self.level -= 1
+                self._settle(now)
+                return True
+        else:
+            self._calm = 0
+        return False
+    
+    def _settle(self, now):
+        """Skip the next evaluation so the trackers refill at the new level"""
+        self._last_eval = now + self.interval
+    
+    def stats(self):
+        """Get the current level, knobs and the measurements behind them"""
+        width, height = self.resolution
+        return {
+            'level': self.level,
+            'resolution': f"{width}x{height}",
+            'inference_stride': self.inference_stride,
+            'display_fps': round(1.0 / self.display_interval, 1),
+            'latency_p95_ms': self.last_latency_ms,
+            'cpu_percent': self.last_cpu,
+        }
@@ -0,0 +1,184 @@
+"""Pre-roll Video Buffer Module"""
+import re
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+from jarvis.desktop.camera.video_recorder import VideoRecorder
+from jarvis.config.settings import (
+    PREROLL_SECONDS, PREROLL_MEMORY_MB, PREROLL_JPEG_QUALITY, VIDEO_DIR, VIDEO_FPS
+)
+
+
+def parse_duration(command):
+    """
+    Find a clip length in a spoken command, e.g. "save the last 2 minutes"
+    
+    Returns:
+        int: Seconds, or None when the command names no duration
+    """
+    match = re.search(r"(\d+)\s*(second|minute)", command.lower())
+    if not match:
+        return None
+    return int(match.group(1)) * (60 if match.group(2) == "minute" else 1)
+
+
+class PrerollBuffer:
+    """
+    Keeps the last few seconds of the camera feed in memory so they can be saved on demand
+    
+    Frames are held as JPEG bytes, or raw when jpeg_quality is 0, and the
+    oldest ones are evicted once they fall outside the time window or the
+    memory cap is reached, so nothing touches the disk until save() is
+    called. Saving snapshots the buffer and encodes it on a background
+    thread; capture carries on meanwhile.
+    """
+    
+    def __init__(self, seconds=PREROLL_SECONDS, memory_mb=PREROLL_MEMORY_MB,
+                 jpeg_quality=PREROLL_JPEG_QUALITY, fps=VIDEO_FPS, directory=VIDEO_DIR):
+        self.seconds = seconds
+        self.memory_bytes = int(memory_mb * 1e6)
+        self.jpeg_quality = jpeg_quality
+        self.fps = fps
+        self.directory = directory
+        self.frames_added = 0
+        self.frames_evicted = 0
+        self.last_saved = None
+        # Optional on_saved(success, message) called when a save finishes
+        self.on_saved = None
+        self._frames = deque()
+        self._bytes = 0
+        # An evicted raw frame reused for the next one, unless a save may still hold it
+        self._spare = None
+        self._saving = 0
+        self._last_added = None
+        self._lock = threading.Lock()
+    
+    def is_enabled(self):
+        """Check if the buffer keeps any footage"""
+        return self.seconds > 0 and self.memory_bytes > 0
+    
+    def add(self, frame, timestamp=None):
+        """
+        Buffer a BGR frame, skipping frames that arrive faster than the buffer's fps
+        
+        Returns:
+            bool: True if the frame was kept
+        """
+        if not self.is_enabled():
+            return False
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        if self._last_added is not None and timestamp - self._last_added < 0.9 / self.fps:
+            return False
+        self._last_added = timestamp
+        
+        if self.jpeg_quality > 0:
+            ok, data = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+            if not ok:
+                return False
+        else:
+            data = self._spare
+            self._spare = None
+            if data is None or data.shape != frame.shape or data.dtype != frame.dtype:
+                data = np.empty_like(frame)
+            np.copyto(data, frame)
+        
+        with self._lock:
+            self._frames.append((timestamp, data))
+            self._bytes += data.nbytes
+            while self._frames and (self._bytes > self.memory_bytes
+                                    or timestamp - self._frames[0][0] > self.seconds):
+                _, evicted = self._frames.popleft()
+                self._bytes -= evicted.nbytes
+                self.frames_evicted += 1
+                if self.jpeg_quality <= 0 and not self._saving:
+                    self._spare = evicted
+        self.frames_added += 1
+        return True
+    
+    def buffered_seconds(self):
+        """Seconds of footage currently held"""
+        with self._lock:
+            if len(self._frames) < 2:
+                return 0.0
+            return self._frames[-1][0] - self._frames[0][0]
+    
+    def save(self, seconds=None, prefix="preroll"):
+        """
+        Write the last seconds of buffered footage to a video file
+        
+        Returns at once; the file is encoded on a background thread.
+        
+        Args:
+            seconds (float): How much to save (defaults to everything buffered)
+            prefix (str): File name prefix
+        
+        Returns:
+            tuple: (success, message)
+        """
+        with self._lock:
+            if not self._frames:
+                return False, "Nothing buffered to save"
+            cutoff = self._frames[-1][0] - (self.seconds if seconds is None else seconds)
+            clip = [item for item in self._frames if item[0] >= cutoff]
+            self._saving += 1
+        
+        # Segments are not split: a pre-roll clip is already bounded in size
+        recorder = VideoRecorder(self.directory, self.fps, segment_seconds=0, segment_mb=0)
+        success, msg = recorder.start(prefix)
+        if not success:
+            self._finish_save(success, msg)
+            return success, msg
+        threading.Thread(
+            target=self._write_clip, args=(recorder, clip), name="preroll-save", daemon=True
+        ).start()
+        duration = clip[-1][0] - clip[0][0]
+        return True, f"Saving the last {duration:.0f} seconds to {self.directory}"
+    
+    def _write_clip(self, recorder, clip):
+        """Decode buffered frames into the recorder, keeping their original timing"""
+        try:
+            for timestamp, data in clip:
+                frame = cv2.imdecode(data, cv2.IMREAD_COLOR) if self.jpeg_quality > 0 else data
+                if frame is not None:
+                    recorder.write(frame, timestamp, block=True)
+            success, msg = recorder.stop()
+        except Exception as e:
+            recorder.stop()
+            success, msg = False, f"Saving footage failed: {str(e)}"
+        self._finish_save(success, msg)
+    
+    def _finish_save(self, success, msg):
+        """Record a save's outcome and let raw frames be recycled again"""
+        with self._lock:
+            self._saving -= 1
+        self.last_saved = (success, msg)
+        if self.on_saved is not None:
+            self.on_saved(success, msg)
+    
+    def clear(self):
+        """Drop all buffered frames"""
+        with self._lock:
+            self._frames.clear()
+            self._bytes = 0
+            self._last_added = None
+    
+    def stats(self):
+        """Get buffer fill, memory use and counters"""
+        with self._lock:
+            frames = len(self._frames)
+            used = self._bytes
+        return {
+            'enabled': self.is_enabled(),
+            'frames': frames,
+            'seconds': round(self.buffered_seconds(), 1),
+            'memory_mb': round(used / 1e6, 1),
+            'memory_cap_mb': round(self.memory_bytes / 1e6, 1),
+            'format': 'jpeg' if self.jpeg_quality > 0 else 'raw',
+            'frames_added': self.frames_added,
+            'frames_evicted': self.frames_evicted,
+            'last_saved': self.last_saved,
+        }
@@ -0,0 +1,89 @@
+"""Frame Source Module"""
+import glob
+import os
+
+import cv2
+import numpy as np
+
+# Used when a source does not report its frame rate
+DEFAULT_FPS = 30.0
+_IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp")
+
+
+class ImageSequenceCapture:
+    """VideoCapture-like reader over a directory or glob of image files, in name order"""
+    
+    def __init__(self, pattern, fps=DEFAULT_FPS):
+        if os.path.isdir(pattern):
+            paths = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+            paths = [path for path in paths if path.lower().endswith(_IMAGE_EXTENSIONS)]
+        else:
+            paths = glob.glob(pattern)
+        self.paths = sorted(paths)
+        self.fps = fps
+        self.position = 0
+    
+    def isOpened(self):
+        """True while there are images left to read"""
+        return self.position < len(self.paths)
+    
+    def read(self, image=None):
+        """Read the next image, into `image` if it has the right shape"""
+        while self.position < len(self.paths):
+            frame = cv2.imread(self.paths[self.position], cv2.IMREAD_COLOR)
+            self.position += 1
+            if frame is None:
+                continue
+            if image is not None and image.shape == frame.shape:
+                np.copyto(image, frame)
+                return True, image
+            return True, frame
+        return False, None
+    
+    def get(self, prop):
+        """Support the few properties callers ask for"""
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(len(self.paths))
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.position)
+        return 0.0
+    
+    def set(self, prop, value):
+        """Image sequences cannot be reconfigured"""
+        return False
+    
+    def release(self):
+        """Nothing to release; kept for VideoCapture compatibility"""
+        self.position = len(self.paths)
+
+
+def is_device(source):
+    """Check whether a source names a live camera rather than a file"""
+    return isinstance(source, int) or (isinstance(source, str) and source.isdigit())
+
+
+def open_source(source):
+    """
+    Open a camera index, video file or image sequence
+    
+    Args:
+        source: Camera index (int or digit string); a video file; a directory
+            or glob of images; or a printf-style sequence like frames/%04d.png
+    
+    Returns:
+        A cv2.VideoCapture or ImageSequenceCapture
+    """
+    if is_device(source):
+        return cv2.VideoCapture(int(source))
+    source = os.fspath(source)
+    if os.path.isdir(source) or any(char in source for char in "*?["):
+        return ImageSequenceCapture(source)
+    return cv2.VideoCapture(source)
+
+
+def source_fps(cap):
+    """Frame rate a source reports, or DEFAULT_FPS if it does not know"""
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    return fps if fps and fps > 0 else DEFAULT_FPS
@@ -0,0 +1,288 @@
+"""Background Video Recording Module"""
+import glob
+import os
+import queue
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from jarvis.api.metrics import LatencyTracker
+from jarvis.config.settings import (
+    VIDEO_DIR, VIDEO_CODEC, VIDEO_FPS, VIDEO_SEGMENT_SECONDS, VIDEO_SEGMENT_MB,
+    VIDEO_QUEUE_SIZE, VIDEO_HW_ACCELERATION
+)
+
+# Container for each codec; anything else is written as .avi
+_EXTENSIONS = {"mp4v": ".mp4", "avc1": ".mp4", "h264": ".mp4", "hev1": ".mp4", "hvc1": ".mp4"}
+
+# Most copies of one frame written to fill a gap; longer gaps are cut from the video
+_MAX_REPEATS = 3
+
+# Prefixes handed out in this process; segment files are only created on the first frame
+_claimed_prefixes = set()
+_claimed_lock = threading.Lock()
+
+
+def _has_segments(directory, prefix):
+    """Check whether any file in the directory already starts with this prefix"""
+    return bool(glob.glob(os.path.join(glob.escape(directory), glob.escape(prefix) + "_*")))
+
+
+def _unique_prefix(directory, prefix):
+    """File name prefix stamped to the millisecond and not used by any other recording"""
+    now = time.time()
+    stem = f"{prefix}_{time.strftime('%Y%m%d_%H%M%S', time.localtime(now))}_{int(now * 1000) % 1000:03d}"
+    with _claimed_lock:
+        candidate, attempt = stem, 1
+        while candidate in _claimed_prefixes or _has_segments(directory, candidate):
+            attempt += 1
+            candidate = f"{stem}-{attempt}"
+        _claimed_prefixes.add(candidate)
+    return candidate
+
+
+class VideoRecorder:
+    """
+    Encodes camera frames to video files on a background thread
+    
+    write() copies the frame into one of a fixed pool of buffers and queues
+    it, so the caller never waits for the encoder. When every buffer is still
+    waiting to be encoded the frame is dropped and counted instead. Output is
+    constant frame rate: frames are repeated or skipped by their timestamps,
+    and a stall longer than a few frames is cut rather than filled with
+    copies. Recordings are split into segments by duration or file size.
+    """
+    
+    def __init__(self, directory=VIDEO_DIR, fps=VIDEO_FPS, codec=VIDEO_CODEC,
+                 segment_seconds=VIDEO_SEGMENT_SECONDS, segment_mb=VIDEO_SEGMENT_MB,
+                 queue_size=VIDEO_QUEUE_SIZE, hardware=VIDEO_HW_ACCELERATION):
+        self.directory = directory
+        self.fps = fps
+        self.codec = codec
+        self.segment_frames = int(segment_seconds * fps) if segment_seconds > 0 else 0
+        self.segment_bytes = int(segment_mb * 1e6) if segment_mb > 0 else 0
+        self.pool_size = max(1, queue_size) + 1
+        self.hardware = hardware
+        self.hardware_accelerated = False
+        self.segments = []
+        self.frames_received = 0
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.frames_cut = 0
+        self.last_error = None
+        self.encode_latency = LatencyTracker(window=300)
+        self._queue = None
+        self._free = None
+        self._allocated = 0
+        self._prefix = None
+        self._stop_event = None
+        self._thread = None
+    
+    def start(self, prefix="video"):
+        """
+        Start a new recording
+        
+        Returns:
+            tuple: (success, message)
+        """
+        if self.is_recording():
+            return True, "Already recording"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+        except OSError as e:
+            return False, f"Cannot record to {self.directory}: {str(e)}"
+        
+        self._prefix = _unique_prefix(self.directory, prefix)
+        self._queue = queue.Queue(maxsize=self.pool_size)
+        self._free = queue.Queue()
+        self._allocated = 0
+        self.segments = []
+        self.frames_received = 0
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.frames_cut = 0
+        self.last_error = None
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._encode_loop, args=(self._queue, self._stop_event), name="video-encoder", daemon=True
+        )
+        self._thread.start()
+        return True, f"Recording video to {self.directory}"
+    
+    def stop(self):
+        """
+        Finish encoding queued frames and close the recording
+        
+        Blocks until the encoder has released the writer: a file closed
+        before then would miss its trailer and not play. At most the
+        buffer pool is still queued, so this is bounded.
+        
+        Returns:
+            tuple: (success, message)
+        """
+        if self._stop_event is None:
+            return False, "Not recording"
+        self._stop_event.set()
+        self._thread.join()
+        self._stop_event = None
+        self._thread = None
+        if self.last_error:
+            return False, f"Recording failed: {self.last_error}"
+        if not self.segments:
+            return False, "Recording stopped; no frames were captured"
+        msg = f"Video saved as {self.segments[0]}"
+        if len(self.segments) > 1:
+            msg += f" and {len(self.segments) - 1} more segment(s)"
+        if self.frames_dropped:
+            msg += f" ({self.frames_dropped} frames dropped)"
+        return True, msg
+    
+    def is_recording(self):
+        """Check if frames are being accepted"""
+        return self._stop_event is not None and not self._stop_event.is_set()
+    
+    def write(self, frame, timestamp=None, block=False):
+        """
+        Queue a copy of a BGR frame for encoding
+        
+        Args:
+            frame (ndarray): Frame to record; the caller may reuse it right away
+            timestamp (float): Capture time in seconds (defaults to now)
+            block (bool): Wait for the encoder instead of dropping the frame,
+                for writing out already captured footage
+        
+        Returns:
+            bool: False if the frame was dropped or nothing is recording
+        """
+        if not self.is_recording():
+            return False
+        self.frames_received += 1
+        buffer = self._take_buffer(frame, block)
+        if buffer is None:
+            self.frames_dropped += 1
+            return False
+        np.copyto(buffer, frame)
+        self._queue.put_nowait((buffer, time.monotonic() if timestamp is None else timestamp))
+        return True
+    
+    def _take_buffer(self, frame, block=False):
+        """Get a free buffer shaped like frame, or None if all are waiting to be encoded"""
+        try:
+            buffer = self._free.get_nowait()
+        except queue.Empty:
+            if self._allocated < self.pool_size:
+                self._allocated += 1
+                return np.empty_like(frame)
+            if not block:
+                return None
+            # Give up if the encoder stops, e.g. on a write error
+            while True:
+                try:
+                    buffer = self._free.get(timeout=0.1)
+                    break
+                except queue.Empty:
+                    if not self.is_recording():
+                        return None
+        if buffer.shape != frame.shape or buffer.dtype != frame.dtype:
+            buffer = np.empty_like(frame)
+        return buffer
+    
+    def _encode_loop(self, frames, stop_event):
+        """Encode queued frames until stopped and the queue is drained"""
+        writer = None
+        shape = None
+        started_at = 0.0
+        written = 0
+        try:
+            while True:
+                try:
+                    buffer, timestamp = frames.get(timeout=0.1)
+                except queue.Empty:
+                    if stop_event.is_set():
+                        break
+                    continue
+                
+                try:
+                    if writer is None or buffer.shape != shape:
+                        if writer is not None:
+                            writer.release()
+                        writer = self._open_writer(buffer.shape)
+                        shape, started_at, written = buffer.shape, timestamp, 0
+                    elif self._segment_full(written):
+                        # The next segment picks up exactly where this one ends
+                        writer.release()
+                        writer = self._open_writer(shape)
+                        started_at, written = started_at + written / self.fps, 0
+                    
+                    # Repeat or skip frames so playback speed matches capture time
+                    due = round((timestamp - started_at) * self.fps) + 1
+                    repeats = due - written
+                    if repeats > _MAX_REPEATS:
+                        # A stall: skip the missing time instead of freezing on this frame
+                        self.frames_cut += repeats - _MAX_REPEATS
+                        started_at += (repeats - _MAX_REPEATS) / self.fps
+                        repeats = _MAX_REPEATS
+                    started = time.perf_counter()
+                    for _ in range(repeats):
+                        writer.write(buffer)
+                    if repeats > 0:
+                        written += repeats
+                        self.frames_written += repeats
+                        self.encode_latency.record(time.perf_counter() - started)
+                finally:
+                    self._free.put(buffer)
+        except Exception as e:
+            self.last_error = str(e)
+            stop_event.set()
+        finally:
+            if writer is not None:
+                writer.release()
+    
+    def _segment_full(self, written):
+        """Check whether the current segment has reached its duration or size limit"""
+        if self.segment_frames and written >= self.segment_frames:
+            return True
+        # The file only grows as the encoder flushes, so checking once a second is enough
+        if self.segment_bytes and written and written % max(1, int(self.fps)) == 0:
+            return os.path.getsize(self.segments[-1]) >= self.segment_bytes
+        return False
+    
+    def _open_writer(self, shape):
+        """Open the next segment file, asking for hardware encoding when enabled"""
+        extension = _EXTENSIONS.get(self.codec.lower(), ".avi")
+        path = os.path.join(self.directory, f"{self._prefix}_{len(self.segments) + 1:03d}{extension}")
+        height, width = shape[:2]
+        fourcc = cv2.VideoWriter_fourcc(*self.codec)
+        
+        writer = None
+        if self.hardware and hasattr(cv2, "VIDEOWRITER_PROP_HW_ACCELERATION"):
+            writer = cv2.VideoWriter(
+                path, cv2.CAP_ANY, fourcc, self.fps, (width, height),
+                [cv2.VIDEOWRITER_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+            )
+            self.hardware_accelerated = (
+                writer.isOpened() and writer.get(cv2.VIDEOWRITER_PROP_HW_ACCELERATION) > 0
+            )
+        if writer is None or not writer.isOpened():
+            writer = cv2.VideoWriter(path, fourcc, self.fps, (width, height))
+        if not writer.isOpened():
+            raise RuntimeError(f"Could not open a {self.codec} video writer for {path}")
+        self.segments.append(path)
+        return writer
+    
+    def stats(self):
+        """Get recording counters, segments and encoder latency"""
+        return {
+            'recording': self.is_recording(),
+            'segments': list(self.segments),
+            'frames_received': self.frames_received,
+            'frames_written': self.frames_written,
+            'frames_dropped': self.frames_dropped,
+            'frames_cut': self.frames_cut,
+            'queued': self._queue.qsize() if self._queue is not None else 0,
+            'hardware_accelerated': self.hardware_accelerated,
+            'encode_latency': self.encode_latency.snapshot(),
+            'last_error': self.last_error,
+        }
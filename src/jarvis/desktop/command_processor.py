@@ -2,16 +2,23 @@
 import pyautogui
 import keyboard
 import time
-import cv2
+from jarvis.desktop.camera.preroll import parse_duration
+from jarvis.desktop.image_writer import ImageWriter
 from jarvis.utils.helpers import open_application
+from jarvis.config.settings import PREROLL_GESTURE, SCREENSHOT_FORMAT, PICTURE_FORMAT, BURST_COUNT
 
 
 class CommandProcessor:
     """Processes voice and gesture commands"""
     
-    def __init__(self, camera_controller=None, voice_controller=None):
+    def __init__(self, camera_controller=None, voice_controller=None, video_recorder=None,
+                 preroll_buffer=None, image_writer=None):
         self.camera_controller = camera_controller
         self.voice_controller = voice_controller
+        self.video_recorder = video_recorder
+        self.preroll_buffer = preroll_buffer
+        # Screenshots and pictures are encoded and saved in the background
+        self.image_writer = image_writer or ImageWriter()
     
     def process_voice_command(self, command):
         """Process a voice command"""
@@ -37,9 +44,25 @@ class CommandProcessor:
         elif "unmute volume" in command_lower:
             self.unmute_volume()
             return True, "Volume unmuted"
-        elif "take picture" in command_lower or "take screenshot" in command_lower:
-            self.take_screenshot()
-            return True, "Screenshot taken"
+        elif "burst" in command_lower and ("picture" in command_lower or "photo" in command_lower):
+            return self.take_picture_burst()
+        elif "burst" in command_lower and "screenshot" in command_lower:
+            results = self.take_screenshot_burst()
+            return True, f"Taking {len(results)} screenshots"
+        elif "take picture" in command_lower or "take a picture" in command_lower:
+            return self.take_picture()
+        elif "take screenshot" in command_lower or "take a screenshot" in command_lower:
+            result = self.take_screenshot()
+            return True, f"Screenshot taken, saving as {result.filename}"
+        elif "stop video" in command_lower or "stop recording" in command_lower:
+            if self.video_recorder:
+                return self.video_recorder.stop()
+        elif "record video" in command_lower or "start recording" in command_lower:
+            if self.video_recorder:
+                return self.record_video()
+        elif "save last" in command_lower or "save the last" in command_lower or "save clip" in command_lower:
+            if self.preroll_buffer:
+                return self.save_preroll(command_lower)
         elif "scroll up" in command_lower:
             self.scroll_up()
             return True, "Scrolled up"
@@ -61,7 +84,9 @@ class CommandProcessor:
     
     def process_gesture(self, gesture):
         """Process a gesture command"""
-        if gesture == "thumbs down":
+        if gesture == PREROLL_GESTURE and self.preroll_buffer and self.preroll_buffer.is_enabled():
+            return self.save_preroll()
+        elif gesture == "thumbs down":
             self.volume_down()
             return True, "Volume decreased"
         elif gesture == "open palm":
@@ -70,6 +95,18 @@ class CommandProcessor:
         elif gesture == "pointing up":
             # Handle pointing gesture
             return True, "Pointing detected"
+        elif gesture == "swipe left":
+            keyboard.press_and_release('previous track')
+            return True, "Previous track"
+        elif gesture == "swipe right":
+            keyboard.press_and_release('next track')
+            return True, "Next track"
+        elif gesture == "swipe up":
+            self.scroll_up()
+            return True, "Scrolled up"
+        elif gesture == "swipe down":
+            self.scroll_down()
+            return True, "Scrolled down"
         else:
             return False, f"Unknown gesture: {gesture}"
     
@@ -93,24 +130,77 @@ class CommandProcessor:
         for _ in range(5):
             pyautogui.press("volumemute")
     
-    def take_screenshot(self):
-        """Take a screenshot"""
-        filename = f"screenshot_{int(time.time())}.png"
+    def take_screenshot(self, keep=False, on_done=None):
+        """
+        Take a screenshot; encoding and saving happen in the background
+        
+        Args:
+            keep (bool): Keep the encoded image in memory, e.g. to send to Gemini
+            on_done (callable): Optional on_done(result) called once it is saved
+        
+        Returns:
+            CaptureResult: Pending handle to the saved image
+        """
         screenshot = pyautogui.screenshot()
-        screenshot.save(filename)
-        return filename
+        return self.image_writer.submit(screenshot, "screenshot", SCREENSHOT_FORMAT, keep=keep, on_done=on_done)
+    
+    def take_screenshot_burst(self, count=BURST_COUNT):
+        """Take several screenshots at the configured interval; returns their CaptureResults"""
+        return self.image_writer.burst(pyautogui.screenshot, "screenshot", count, fmt=SCREENSHOT_FORMAT)
     
     def take_picture(self):
-        """Take a picture from camera"""
-        if self.camera_controller and self.camera_controller.is_active():
-            frame, error = self.camera_controller.read_frame()
-            if frame is not None:
-                filename = f"picture_{int(time.time())}.jpg"
-                cv2.imwrite(filename, frame)
-                return True, f"Picture saved as {filename}"
-            else:
-                return False, error or "Failed to capture frame"
-        return False, "Camera not active"
+        """
+        Take a picture from camera; encoding and saving happen in the background
+        
+        Returns:
+            tuple: (success, message)
+        """
+        if not (self.camera_controller and self.camera_controller.is_active()):
+            return False, "Camera not active"
+        result = self.capture_picture()
+        if result is None:
+            return False, self.camera_controller.last_error or "Failed to capture frame"
+        return True, f"Picture taken, saving as {result.filename}"
+    
+    def capture_picture(self, keep=False, on_done=None):
+        """
+        Grab a camera frame and hand it to the image writer
+        
+        Args:
+            keep (bool): Keep the encoded image in memory, e.g. to send to Gemini
+            on_done (callable): Optional on_done(result) called once it is saved
+        
+        Returns:
+            CaptureResult: Pending handle, or None if the camera has no frame
+        """
+        if not (self.camera_controller and self.camera_controller.is_active()):
+            return None
+        # read_frame() returns a copy, so it can be handed to the writer as is
+        frame, _ = self.camera_controller.read_frame()
+        if frame is None:
+            return None
+        return self.image_writer.submit(frame, "picture", PICTURE_FORMAT, keep=keep, on_done=on_done)
+    
+    def take_picture_burst(self, count=BURST_COUNT):
+        """Take several camera pictures at the configured interval"""
+        if not (self.camera_controller and self.camera_controller.is_active()):
+            return False, "Camera not active"
+        results = self.image_writer.burst(
+            lambda: self.camera_controller.read_frame()[0], "picture", count, fmt=PICTURE_FORMAT
+        )
+        return True, f"Taking {len(results)} pictures"
+    
+    def record_video(self):
+        """Start recording the camera feed"""
+        if not (self.camera_controller and self.camera_controller.is_active()):
+            return False, "Camera not active"
+        return self.video_recorder.start()
+    
+    def save_preroll(self, command=""):
+        """Save the buffered camera feed, e.g. "save last 30 seconds" or "save clip" for all of it"""
+        if not self.preroll_buffer.is_enabled():
+            return False, "Pre-roll buffer is disabled"
+        return self.preroll_buffer.save(parse_duration(command))
     
     def scroll_up(self):
         """Scroll up"""
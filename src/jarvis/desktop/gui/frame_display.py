@@ -0,0 +1,134 @@
+"""Camera Frame Display Module"""
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+
+
+class FrameDisplay:
+    """
+    Shows BGR camera frames in a Tk label without allocating per frame
+    
+    Each frame is converted straight into a preallocated RGBA buffer, mirrored
+    in place, copied into a persistent single-block RGBA image and pasted into
+    one persistent RGBA PhotoImage. PhotoImage.paste() only hands an image to
+    Tk as-is when it is one memory block of the photo's own mode; anything
+    else costs a new block and a conversion on every frame. Buffers are only
+    rebuilt when the frame size changes.
+    """
+    
+    def __init__(self, label, mirror=True):
+        self.label = label
+        self.mirror = mirror
+        self.photo = None
+        self._rgba = None
+        self._image = None
+    
+    def convert(self, frame):
+        """
+        Convert a BGR frame into the shared display buffer
+        
+        Args:
+            frame (ndarray): (H, W, 3) BGR frame
+        
+        Returns:
+            PIL.Image: Opaque RGBA image, reused for every frame of this size
+        """
+        height, width = frame.shape[:2]
+        if self._rgba is None or self._rgba.shape[:2] != (height, width):
+            self._rgba = np.empty((height, width, 4), dtype=np.uint8)
+            # Image.new() may split pixels over several blocks; paste() needs one
+            block = Image.core.new_block("RGBA", (width, height))
+            self._image = Image.new("RGBA", (1, 1))._new(block)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGBA, dst=self._rgba)
+        if self.mirror:
+            cv2.flip(self._rgba, 1, dst=self._rgba)
+        self._image.frombytes(self._rgba)
+        return self._image
+    
+    def show(self, frame):
+        """Display a BGR frame, reusing the label's PhotoImage when the size is unchanged"""
+        image = self.convert(frame)
+        if self.photo is None or (self.photo.width(), self.photo.height()) != image.size:
+            self.photo = ImageTk.PhotoImage(image.mode, image.size)
+            self.label.config(image=self.photo)
+            self.label.image = self.photo
+        self.photo.paste(image)
+    
+    def clear(self, text=""):
+        """Remove the image and show a text placeholder instead"""
+        self.photo = None
+        self.label.config(image='', text=text)
+        self.label.image = None
+
+
+def _legacy_convert(frame):
+    """The previous display path: allocate a new array or image at every step"""
+    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    rgb = cv2.flip(rgb, 1)
+    return Image.fromarray(rgb)
+
+
+def _measure(fn, frames):
+    """Mean ms per call and bytes allocated by a single call"""
+    for _ in range(10):
+        fn()
+    started = time.perf_counter()
+    for _ in range(frames):
+        fn()
+    per_frame = (time.perf_counter() - started) / frames
+    
+    pil_before = Image.core.get_stats()['new_count']
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    pil_images = Image.core.get_stats()['new_count'] - pil_before
+    return {'ms_per_frame': round(per_frame * 1000, 3), 'bytes_allocated': peak, 'pil_images': pil_images}
+
+
+def benchmark(width=640, height=480, frames=300):
+    """
+    Compare the old and new display paths per frame
+    
+    Conversion is always measured; pasting into Tk only when a display is available.
+    
+    Returns:
+        dict: ms per frame, bytes allocated (numpy, via tracemalloc) and PIL
+            images created for each path
+    """
+    frame = np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+    display = FrameDisplay(label=None)
+    results = {
+        'resolution': f"{width}x{height}",
+        'legacy_convert': _measure(lambda: _legacy_convert(frame), frames),
+        'convert': _measure(lambda: display.convert(frame), frames),
+    }
+    
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception:
+        return results
+    try:
+        root.withdraw()
+        label = tk.Label(root)
+        display.label = label
+        
+        def legacy_show():
+            photo = ImageTk.PhotoImage(image=_legacy_convert(frame))
+            label.config(image=photo)
+            label.image = photo
+        
+        results['legacy_show'] = _measure(legacy_show, frames)
+        results['show'] = _measure(lambda: display.show(frame), frames)
+    finally:
+        root.destroy()
+    return results
+
+
+if __name__ == "__main__":
+    for name, value in benchmark().items():
+        print(f"{name}: {value}")
@@ -0,0 +1,216 @@
+"""Background Image Encoding Module"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from jarvis.api.metrics import LatencyTracker
+from jarvis.config.settings import (
+    IMAGE_DIR, IMAGE_QUALITY, PNG_COMPRESSION, IMAGE_WORKERS, BURST_COUNT, BURST_INTERVAL
+)
+
+_MIME_TYPES = {"jpg": "image/jpeg", "jpeg": "image/jpeg", "png": "image/png", "webp": "image/webp"}
+
+
+def encode_params(fmt, quality=IMAGE_QUALITY, png_compression=PNG_COMPRESSION):
+    """OpenCV imencode flags for a format: quality for JPEG/WebP, compression level for PNG"""
+    if fmt in ("jpg", "jpeg"):
+        return [cv2.IMWRITE_JPEG_QUALITY, quality]
+    if fmt == "webp":
+        return [cv2.IMWRITE_WEBP_QUALITY, max(1, quality)]
+    if fmt == "png":
+        return [cv2.IMWRITE_PNG_COMPRESSION, png_compression]
+    return []
+
+
+def _timestamp():
+    """Time-based file name stem, unique to the millisecond"""
+    now = time.time()
+    return f"{time.strftime('%Y%m%d_%H%M%S', time.localtime(now))}_{int(now * 1000) % 1000:03d}"
+
+
+class CaptureResult:
+    """
+    Handle to an image being encoded in the background
+    
+    wait() blocks until the file is written. The encoded bytes are kept in
+    `data` when the capture asked for them, e.g. to send to Gemini.
+    """
+    
+    def __init__(self, path, fmt):
+        self.path = path
+        self.format = fmt
+        self.mime_type = _MIME_TYPES.get(fmt, "application/octet-stream")
+        self.data = None
+        self.error = None
+        self._done = threading.Event()
+    
+    @property
+    def filename(self):
+        """Base name of the output file"""
+        return os.path.basename(self.path) if self.path else None
+    
+    def done(self):
+        """Check if encoding has finished, successfully or not"""
+        return self._done.is_set()
+    
+    def wait(self, timeout=None):
+        """
+        Wait for encoding to finish
+        
+        Returns:
+            bool: True if the image was encoded (and saved, if requested)
+        """
+        self._done.wait(timeout)
+        return self.done() and self.error is None
+    
+    def as_part(self, timeout=None):
+        """The encoded image as a Gemini content part, or None if it is unavailable"""
+        if not self.wait(timeout) or self.data is None:
+            return None
+        return {'mime_type': self.mime_type, 'data': self.data}
+    
+    def _finish(self, data=None, error=None):
+        """Publish the outcome and wake waiters"""
+        self.data = data
+        self.error = error
+        self._done.set()
+
+
+class ImageWriter:
+    """
+    Encodes and saves screenshots and camera pictures on a worker pool
+    
+    Callers only grab the image; colour conversion, encoding and the disk
+    write happen on IMAGE_WORKERS background threads, so voice and GUI
+    threads return straight away.
+    """
+    
+    def __init__(self, directory=IMAGE_DIR, workers=IMAGE_WORKERS):
+        self.directory = directory
+        self.saved = 0
+        self.failed = 0
+        self.encode_latency = LatencyTracker(window=100)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="image-writer")
+        self._lock = threading.Lock()
+    
+    def submit(self, image, prefix, fmt="png", quality=IMAGE_QUALITY, save=True, keep=False,
+               on_done=None, name=None):
+        """
+        Queue an image for encoding
+        
+        Args:
+            image: BGR ndarray or PIL image (e.g. from pyautogui); the writer
+                owns it from now on, so pass a copy of shared buffers
+            prefix (str): File name prefix, e.g. "screenshot"
+            fmt (str): "png", "jpg" or "webp"
+            quality (int): JPEG/WebP quality 0-100
+            save (bool): Write the file; with False the image is only kept in memory
+            keep (bool): Keep the encoded bytes on the result
+            on_done (callable): Optional on_done(result) called from the worker
+            name (str): File name stem (a timestamp by default)
+        
+        Returns:
+            CaptureResult: Pending handle
+        """
+        return self._schedule(CaptureResult(self._path(prefix, fmt, name), fmt), image, quality,
+                              save, keep, on_done)
+    
+    def burst(self, grab, prefix, count=BURST_COUNT, interval=BURST_INTERVAL, fmt="png",
+              quality=IMAGE_QUALITY, save=True, keep=False, on_done=None):
+        """
+        Take `count` images `interval` seconds apart on a background thread
+        
+        Args:
+            grab (callable): Returns the next image, or None if none is available;
+                the same ownership rules as submit() apply
+        
+        Returns:
+            list: One pending CaptureResult per shot, in order
+        """
+        stem = _timestamp()
+        results = [
+            CaptureResult(self._path(prefix, fmt, f"{stem}_{index + 1:02d}"), fmt) for index in range(count)
+        ]
+        
+        def take_shots():
+            started = time.monotonic()
+            for index, result in enumerate(results):
+                delay = started + index * interval - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                try:
+                    image = grab()
+                except Exception as e:
+                    image, error = None, str(e)
+                else:
+                    error = "No image available"
+                if image is None:
+                    self._failed(result, error, on_done)
+                else:
+                    self._schedule(result, image, quality, save, keep, on_done)
+        
+        threading.Thread(target=take_shots, name="image-burst", daemon=True).start()
+        return results
+    
+    def _path(self, prefix, fmt, name):
+        """Output path for a new image"""
+        return os.path.join(self.directory, f"{prefix}_{name or _timestamp()}.{fmt}")
+    
+    def _schedule(self, result, image, quality, save, keep, on_done):
+        """Hand an image to the pool, failing the result if the pool is shut down"""
+        try:
+            self._executor.submit(self._encode, result, image, quality, save, keep, on_done)
+        except RuntimeError as e:
+            self._failed(result, str(e), on_done)
+        return result
+    
+    def _encode(self, result, image, quality, save, keep, on_done):
+        """Convert, encode and write one image on a worker thread"""
+        started = time.perf_counter()
+        try:
+            if not isinstance(image, np.ndarray):
+                # PIL images are RGB; OpenCV encodes BGR
+                rgb = image if image.mode == "RGB" else image.convert("RGB")
+                image = cv2.cvtColor(np.asarray(rgb), cv2.COLOR_RGB2BGR)
+            ok, encoded = cv2.imencode(f".{result.format}", image, encode_params(result.format, quality))
+            if not ok:
+                raise ValueError(f"Could not encode {result.format} image")
+            if save:
+                os.makedirs(self.directory, exist_ok=True)
+                with open(result.path, "wb") as f:
+                    f.write(encoded.data)
+            else:
+                result.path = None
+        except Exception as e:
+            self._failed(result, str(e), on_done)
+            return
+        self.encode_latency.record(time.perf_counter() - started)
+        with self._lock:
+            self.saved += 1
+        result._finish(data=encoded.tobytes() if keep or not save else None)
+        if on_done is not None:
+            on_done(result)
+    
+    def _failed(self, result, error, on_done):
+        """Fail a result and report it"""
+        with self._lock:
+            self.failed += 1
+        result._finish(error=error)
+        if on_done is not None:
+            on_done(result)
+    
+    def shutdown(self, wait=True):
+        """Stop accepting images; with wait, finish the ones already queued"""
+        self._executor.shutdown(wait=wait)
+    
+    def stats(self):
+        """Get counters and encode latency"""
+        return {
+            'saved': self.saved,
+            'failed': self.failed,
+            'encode_latency': self.encode_latency.snapshot(),
+        }
@@ -0,0 +1,315 @@
+"""Trainable Gesture Classifier Module"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from jarvis.desktop.motion.landmarks import NUM_LANDMARKS, WRIST
+from jarvis.config.settings import GESTURE_MODEL_PATH, GESTURE_SAMPLES_PATH
+
+# Landmark used with the wrist to normalize hand size (middle finger knuckle)
+_SCALE_LANDMARK = 9
+# Bumped whenever landmark_features() changes, so stale models are refused
+FEATURE_VERSION = 1
+UNKNOWN = "Unknown"
+
+
+def landmark_features(points):
+    """
+    Turn landmarks into position- and size-invariant feature vectors
+    
+    Args:
+        points (ndarray): (21, 3) or (N, 21, 3) landmarks
+    
+    Returns:
+        ndarray: (N, 63) float32 features, wrist at the origin and palm length 1
+    """
+    points = np.asarray(points, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3)
+    centered = points - points[:, WRIST:WRIST + 1]
+    scale = np.linalg.norm(centered[:, _SCALE_LANDMARK, :2], axis=-1)
+    centered /= np.maximum(scale, 1e-6)[:, None, None]
+    return centered.reshape(len(points), NUM_LANDMARKS * 3)
+
+
+class GestureClassifier:
+    """
+    Nearest-centroid or k-nearest-neighbour classifier over landmark features
+    
+    All reference vectors live in one float32 matrix with precomputed squared
+    norms, so classifying a hand is a single matrix-vector product.
+    """
+    
+    def __init__(self, labels, centroids, samples=None, sample_labels=None,
+                 neighbors=0, max_distance=np.inf):
+        self.labels = tuple(labels)
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self.samples = samples
+        self.sample_labels = sample_labels
+        self.neighbors = neighbors if samples is not None else 0
+        self.max_distance = float(max_distance)
+        self._index = self.samples if self.neighbors else self.centroids
+        self._index_labels = self.sample_labels if self.neighbors else np.arange(len(self.labels))
+        self._index_norms = np.einsum('ij,ij->i', self._index, self._index)
+    
+    @classmethod
+    def train(cls, points, labels, neighbors=0, max_distance=None):
+        """
+        Fit a classifier to labeled landmark samples
+        
+        Args:
+            points (ndarray): (N, 21, 3) landmarks
+            labels (sequence): Gesture name for each sample
+            neighbors (int): k for k-NN voting; 0 uses the nearest class centroid
+            max_distance (float): Reject matches farther than this as "Unknown";
+                by default 1.5x the 95th percentile of training distances
+        
+        Returns:
+            GestureClassifier: The trained classifier
+        """
+        features = landmark_features(points)
+        names, sample_labels = np.unique(np.asarray(labels), return_inverse=True)
+        centroids = np.stack([features[sample_labels == i].mean(axis=0) for i in range(len(names))])
+        if max_distance is None:
+            spread = np.linalg.norm(features - centroids[sample_labels], axis=1)
+            max_distance = 1.5 * float(np.percentile(spread, 95))
+        return cls(
+            [str(name) for name in names], centroids,
+            samples=features if neighbors else None,
+            sample_labels=sample_labels.astype(np.int32) if neighbors else None,
+            neighbors=neighbors, max_distance=max_distance
+        )
+    
+    def predict(self, points):
+        """
+        Classify one or many hands
+        
+        Args:
+            points (ndarray): (21, 3) or (N, 21, 3) landmarks
+        
+        Returns:
+            tuple: (list of gesture names, (N,) confidences in [0, 1])
+        """
+        points = np.asarray(points, dtype=np.float32)
+        if points.ndim == 2:
+            return self._predict_one(points)
+        features = landmark_features(points)
+        # Squared Euclidean distances to every reference vector at once
+        distances = (
+            np.einsum('ij,ij->i', features, features)[:, None]
+            - 2.0 * features @ self._index.T
+            + self._index_norms
+        )
+        np.maximum(distances, 0.0, out=distances)
+        
+        if self.neighbors:
+            k = min(self.neighbors, distances.shape[1])
+            nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+            votes = self._index_labels[nearest]
+            counts = np.zeros((len(votes), len(self.labels)), dtype=np.int32)
+            np.add.at(counts, (np.arange(len(votes))[:, None], votes), 1)
+            best = counts.argmax(axis=1)
+            confidence = counts.max(axis=1) / k
+            best_distance = np.sqrt(np.take_along_axis(distances, nearest, axis=1).min(axis=1))
+        else:
+            order = np.argsort(distances, axis=1)[:, :2]
+            best = order[:, 0]
+            first = np.sqrt(np.take_along_axis(distances, order[:, :1], axis=1)[:, 0])
+            if order.shape[1] > 1:
+                second = np.sqrt(np.take_along_axis(distances, order[:, 1:2], axis=1)[:, 0])
+                # Margin between the best and runner-up class
+                confidence = 1.0 - first / np.maximum(second, 1e-6)
+            else:
+                confidence = np.ones(len(best))
+            best_distance = first
+        
+        names = [
+            self.labels[label] if distance <= self.max_distance else UNKNOWN
+            for label, distance in zip(best, best_distance)
+        ]
+        confidence = np.where(best_distance <= self.max_distance, confidence, 0.0)
+        return names, confidence
+    
+    def _predict_one(self, points):
+        """
+        predict() for a single (21, 3) hand, the per-frame case
+        
+        Same result as the batched path, but with 1-D arrays and scalar
+        arithmetic: at this size numpy's per-call overhead, not the maths,
+        is what costs time.
+        """
+        centered = points - points[WRIST]
+        scale = max(float(np.hypot(centered[_SCALE_LANDMARK, 0], centered[_SCALE_LANDMARK, 1])), 1e-6)
+        features = centered.ravel()
+        features /= scale
+        distances = self._index_norms - 2.0 * (self._index @ features)
+        distances += float(features @ features)
+        np.maximum(distances, 0.0, out=distances)
+        
+        if self.neighbors:
+            k = min(self.neighbors, len(distances))
+            nearest = np.argpartition(distances, k - 1)[:k]
+            counts = np.bincount(self._index_labels[nearest], minlength=len(self.labels))
+            best = int(counts.argmax())
+            confidence = counts[best] / k
+            best_distance = float(distances[nearest].min()) ** 0.5
+        else:
+            best = int(distances.argmin())
+            best_distance = float(distances[best]) ** 0.5
+            if len(distances) > 1:
+                distances[best] = np.inf
+                second = float(distances.min()) ** 0.5
+                confidence = 1.0 - best_distance / max(second, 1e-6)
+            else:
+                confidence = 1.0
+        
+        if best_distance > self.max_distance:
+            return [UNKNOWN], np.zeros(1)
+        return [self.labels[best]], np.array([confidence])
+    
+    def save(self, path):
+        """Write the model as an uncompressed .npz, which loads without any parsing"""
+        arrays = {
+            'version': np.array(FEATURE_VERSION),
+            'labels': np.array(self.labels),
+            'centroids': self.centroids,
+            'neighbors': np.array(self.neighbors),
+            'max_distance': np.array(self.max_distance),
+        }
+        if self.neighbors:
+            arrays['samples'] = self.samples
+            arrays['sample_labels'] = self.sample_labels
+        np.savez(path, **arrays)
+    
+    @classmethod
+    def load(cls, path):
+        """Load a model written by save()"""
+        with np.load(path, allow_pickle=False) as data:
+            if int(data['version']) != FEATURE_VERSION:
+                raise ValueError(f"Model {path} uses an old feature format; please retrain it")
+            neighbors = int(data['neighbors'])
+            return cls(
+                [str(label) for label in data['labels']],
+                data['centroids'],
+                samples=data['samples'] if neighbors else None,
+                sample_labels=data['sample_labels'] if neighbors else None,
+                neighbors=neighbors,
+                max_distance=float(data['max_distance'])
+            )
+
+
+def load_classifier(path=GESTURE_MODEL_PATH):
+    """Load the gesture model if one has been trained, else return None"""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        return GestureClassifier.load(path)
+    except Exception as e:
+        print(f"Warning: Could not load gesture model {path}: {str(e)}")
+        return None
+
+
+class GestureRecorder:
+    """Collects labeled landmark samples for training"""
+    
+    def __init__(self):
+        self.points = []
+        self.labels = []
+    
+    def add(self, label, points):
+        """Record one hand's (21, 3) landmarks under a gesture name"""
+        self.points.append(np.asarray(points, dtype=np.float32))
+        self.labels.append(label)
+    
+    def save(self, path=GESTURE_SAMPLES_PATH):
+        """Append the recorded samples to a samples file"""
+        points, labels = load_samples(path)
+        if self.points:
+            points = np.concatenate([points, np.stack(self.points)])
+            labels = np.concatenate([labels, np.array(self.labels)])
+        np.savez(path, points=points, labels=labels)
+        self.points, self.labels = [], []
+        return len(labels)
+
+
+def load_samples(path=GESTURE_SAMPLES_PATH):
+    """Load recorded samples as ((N, 21, 3) landmarks, (N,) labels)"""
+    if not os.path.exists(path):
+        return np.empty((0, NUM_LANDMARKS, 3), dtype=np.float32), np.array([], dtype=str)
+    with np.load(path, allow_pickle=False) as data:
+        return data['points'], data['labels']
+
+
+def record(label, seconds=5.0, path=GESTURE_SAMPLES_PATH):
+    """Record samples of one gesture from the camera for a number of seconds"""
+    from jarvis.desktop.camera.camera_controller import CameraController
+    from jarvis.desktop.motion.gesture_recognizer import GestureRecognizer
+    from jarvis.desktop.motion.landmarks import landmarks_to_array
+    import cv2
+    
+    camera = CameraController()
+    recognizer = GestureRecognizer()
+    if not recognizer.is_available():
+        print("Error: Recording requires MediaPipe. Please install it.")
+        return
+    success, msg = camera.start_camera()
+    if not success:
+        print(f"Error: {msg}")
+        return
+    
+    recorder = GestureRecorder()
+    print(f"Recording '{label}' for {seconds:.0f}s - hold the gesture in front of the camera...")
+    seq = 0
+    deadline = time.monotonic() + seconds
+    try:
+        while time.monotonic() < deadline:
+            frame, seq, _ = camera.wait_for_frame(seq, timeout=0.5)
+            if frame is None:
+                continue
+            hands = recognizer.detect_hands(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            if hands:
+                recorder.add(label, landmarks_to_array(hands[0]))
+    finally:
+        camera.release()
+    captured = len(recorder.points)
+    total = recorder.save(path)
+    print(f"Captured {captured} samples of '{label}' ({total} in {path})")
+
+
+def train(samples_path=GESTURE_SAMPLES_PATH, model_path=GESTURE_MODEL_PATH, neighbors=0):
+    """Train a model from a samples file and report accuracy and speed"""
+    points, labels = load_samples(samples_path)
+    if len(points) == 0:
+        print(f"Error: No samples in {samples_path}. Record some first.")
+        return
+    classifier = GestureClassifier.train(points, labels, neighbors=neighbors)
+    classifier.save(model_path)
+    
+    names, _ = classifier.predict(points)
+    accuracy = np.mean(np.array(names) == labels)
+    started = time.perf_counter()
+    for hand in points[:200]:
+        classifier.predict(hand)
+    per_hand = (time.perf_counter() - started) / min(len(points), 200)
+    print(f"Saved {model_path}: {len(classifier.labels)} gestures from {len(points)} samples")
+    print(f"Training accuracy {accuracy:.1%}, {per_hand * 1000:.3f} ms per hand")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record samples and train the gesture classifier")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    record_parser = subparsers.add_parser("record", help="Record samples of one gesture")
+    record_parser.add_argument("label", help="Gesture name, e.g. \"open palm\"")
+    record_parser.add_argument("--seconds", type=float, default=5.0)
+    record_parser.add_argument("--samples", default=GESTURE_SAMPLES_PATH)
+    train_parser = subparsers.add_parser("train", help="Train a model from recorded samples")
+    train_parser.add_argument("--samples", default=GESTURE_SAMPLES_PATH)
+    train_parser.add_argument("--model", default=GESTURE_MODEL_PATH)
+    train_parser.add_argument("--neighbors", type=int, default=0,
+                              help="k for k-NN voting (0 = nearest centroid)")
+    args = parser.parse_args()
+    
+    if args.command == "record":
+        record(args.label, args.seconds, args.samples)
+    else:
+        train(args.samples, args.model, args.neighbors)
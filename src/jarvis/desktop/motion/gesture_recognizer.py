@@ -1,6 +1,10 @@
 """Motion/Gesture Recognition Module"""
-import numpy as np
 import cv2
+from jarvis.desktop.motion.classifier import load_classifier
+from jarvis.desktop.motion.landmarks import (
+    GESTURE_LABELS, classify_landmarks, landmarks_to_array
+)
+from jarvis.config.settings import GESTURE_MODEL_PATH
 try:
     import mediapipe as mp
     MEDIAPIPE_AVAILABLE = True
@@ -11,8 +15,11 @@ except ImportError:
 class GestureRecognizer:
     """Handles hand gesture recognition using MediaPipe"""
     
-    def __init__(self):
-        if MEDIAPIPE_AVAILABLE:
+    def __init__(self, model_path=GESTURE_MODEL_PATH, with_detector=True):
+        # A trained classifier replaces the built-in rules when its model exists
+        self.classifier = load_classifier(model_path)
+        # Callers that run hand detection elsewhere (e.g. a VisionEngine) skip the model
+        if MEDIAPIPE_AVAILABLE and with_detector:
             self.hands = mp.solutions.hands.Hands(
                 static_image_mode=False,
                 max_num_hands=2,
@@ -23,52 +30,55 @@ class GestureRecognizer:
         else:
             self.hands = None
             self.mp_hands = None
+        # The tracking graph follows hands from frame to frame on its own, running
+        # palm detection only when it loses them, so it gets whole frames, never crops
+        self.tracks_hands = self.hands is not None
     
     def is_available(self):
         """Check if MediaPipe is available"""
         return MEDIAPIPE_AVAILABLE
     
+    def detect_hands(self, rgb_frame):
+        """Detect hand landmarks in an RGB frame"""
+        if not MEDIAPIPE_AVAILABLE or self.hands is None:
+            return []
+        
+        results = self.hands.process(rgb_frame)
+        return results.multi_hand_landmarks or []
+    
     def recognize_gesture(self, hand_landmarks):
         """Recognize gesture from hand landmarks"""
-        if not MEDIAPIPE_AVAILABLE or hand_landmarks is None or self.mp_hands is None:
+        if hand_landmarks is None:
             return "None"
         
-        landmarks = hand_landmarks.landmark
-        thumb_tip = landmarks[self.mp_hands.HandLandmark.THUMB_TIP]
-        index_finger_tip = landmarks[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
-        middle_finger_tip = landmarks[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP]
-        ring_finger_tip = landmarks[self.mp_hands.HandLandmark.RING_FINGER_TIP]
-        pinky_tip = landmarks[self.mp_hands.HandLandmark.PINKY_TIP]
-        
-        thumb_index_dist = np.sqrt(
-            (thumb_tip.x - index_finger_tip.x)**2 + 
-            (thumb_tip.y - index_finger_tip.y)**2
-        )
-        
-        thumb_tip_y = thumb_tip.y
-        index_tip_y = index_finger_tip.y
-        middle_tip_y = middle_finger_tip.y
-        ring_tip_y = ring_finger_tip.y
-        pinky_tip_y = pinky_tip.y
-        
-        # Check for thumbs down
-        if (thumb_tip_y > index_tip_y and 
-            thumb_tip_y > middle_tip_y and
-            thumb_tip_y > ring_tip_y and 
-            thumb_tip_y > pinky_tip_y):
-            return "thumbs down"
+        gesture, _ = self.classify_points(landmarks_to_array(hand_landmarks))
+        return gesture
+    
+    def classify_points(self, points):
+        """
+        Classify one hand from its (21, 3) landmark array
         
-        # Check for pointing
-        if thumb_index_dist < 0.05:
-            return "pointing up"
+        Returns:
+            tuple: (gesture name, confidence in [0, 1])
+        """
+        if self.classifier is not None:
+            names, confidence = self.classifier.predict(points)
+            return names[0], float(confidence[0])
+        return GESTURE_LABELS[classify_landmarks(points)], 1.0
+    
+    def recognize_gestures(self, points):
+        """
+        Recognize gestures for many hands at once
         
-        # Check for open palm
-        all_extended = (index_tip_y < middle_tip_y < ring_tip_y < pinky_tip_y and 
-                       thumb_tip.x < index_finger_tip.x)
-        if all_extended:
-            return "open palm"
+        Args:
+            points (ndarray): (N, 21, 3) landmarks, e.g. from hands_to_array
         
-        return "Unknown"
+        Returns:
+            list: One gesture name per hand
+        """
+        if self.classifier is not None:
+            return self.classifier.predict(points)[0]
+        return [GESTURE_LABELS[label] for label in classify_landmarks(points)]
     
     def process_frame(self, frame):
         """Process a frame for hand detection"""
@@ -0,0 +1,251 @@
+"""Landmark Recording Module"""
+import argparse
+import json
+import os
+import time
+from collections import Counter
+
+import numpy as np
+
+from jarvis.desktop.motion.landmarks import NUM_LANDMARKS, hands_to_array
+from jarvis.config.settings import GESTURE_MODEL_PATH
+
+# Bumped whenever the on-disk layout changes
+FORMAT_VERSION = 1
+NUM_POSE_LANDMARKS = 33
+_META_FILE = "meta.json"
+
+
+def pose_to_array(pose_landmarks):
+    """Convert a MediaPipe pose NormalizedLandmarkList to a (33, 4) x/y/z/visibility array"""
+    coords = (
+        value for lm in pose_landmarks.landmark for value in (lm.x, lm.y, lm.z, lm.visibility)
+    )
+    return np.fromiter(coords, dtype=np.float32, count=NUM_POSE_LANDMARKS * 4).reshape(NUM_POSE_LANDMARKS, 4)
+
+
+def _columns(max_hands, pose, dtype):
+    """Column name -> (file name, dtype, per-frame shape)"""
+    columns = {
+        'timestamps': ("timestamps.bin", "float64", ()),
+        'hand_count': ("hand_count.bin", "uint8", ()),
+        'hands': ("hands.bin", dtype, (max_hands, NUM_LANDMARKS, 3)),
+    }
+    if pose:
+        columns['pose'] = ("pose.bin", dtype, (NUM_POSE_LANDMARKS, 4))
+    return columns
+
+
+class LandmarkWriter:
+    """
+    Appends per-frame landmarks to a directory of raw column files
+    
+    Each column (timestamps, hand count, hands, optional pose) is a flat
+    binary file of fixed-size rows described by meta.json, so it can be read
+    back with np.memmap without parsing. Missing hands and poses are NaN.
+    Rows are buffered and written a chunk at a time.
+    """
+    
+    def __init__(self, path, max_hands=2, pose=False, dtype="float16", chunk_size=256):
+        self.path = path
+        self.max_hands = max_hands
+        self.frames = 0
+        self._columns = _columns(max_hands, pose, np.dtype(dtype).name)
+        self._chunk_size = chunk_size
+        self._buffers = {
+            name: np.empty((chunk_size,) + shape, dtype=column_dtype)
+            for name, (_, column_dtype, shape) in self._columns.items()
+        }
+        self._pending = 0
+        
+        os.makedirs(path, exist_ok=True)
+        meta = {
+            'version': FORMAT_VERSION,
+            'created': time.time(),
+            'max_hands': max_hands,
+            'columns': {
+                name: {'file': file, 'dtype': column_dtype, 'shape': list(shape)}
+                for name, (file, column_dtype, shape) in self._columns.items()
+            },
+        }
+        with open(os.path.join(path, _META_FILE), "w") as f:
+            json.dump(meta, f, indent=2)
+        self._files = {
+            name: open(os.path.join(path, file), "wb")
+            for name, (file, _, _) in self._columns.items()
+        }
+    
+    def append(self, timestamp, hands=None, pose=None):
+        """
+        Add one frame
+        
+        Args:
+            timestamp (float): Frame time in seconds
+            hands: NormalizedLandmarkLists or an (N, 21, 3) array; extra hands are dropped
+            pose: Pose NormalizedLandmarkList or a (33, 4) array
+        """
+        if hands is not None and len(hands) and not isinstance(hands, np.ndarray):
+            hands = hands_to_array(hands)
+        count = 0 if hands is None else min(len(hands), self.max_hands)
+        
+        row = self._pending
+        self._buffers['timestamps'][row] = timestamp
+        self._buffers['hand_count'][row] = count
+        self._buffers['hands'][row] = np.nan
+        if count:
+            self._buffers['hands'][row, :count] = hands[:count]
+        if 'pose' in self._buffers:
+            if pose is None:
+                self._buffers['pose'][row] = np.nan
+            else:
+                self._buffers['pose'][row] = pose if isinstance(pose, np.ndarray) else pose_to_array(pose)
+        
+        self._pending += 1
+        self.frames += 1
+        if self._pending == self._chunk_size:
+            self.flush()
+    
+    def flush(self):
+        """Write buffered rows to disk"""
+        if not self._pending:
+            return
+        for name, f in self._files.items():
+            f.write(self._buffers[name][:self._pending].tobytes())
+            f.flush()
+        self._pending = 0
+    
+    def close(self):
+        """Flush and close the column files"""
+        if self._files:
+            self.flush()
+            for f in self._files.values():
+                f.close()
+            self._files = {}
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+class LandmarkRecording:
+    """
+    Memory-mapped, read-only view of a recording written by LandmarkWriter
+    
+    Columns are numpy arrays backed by the files, so opening is instant and
+    only the rows actually touched are read from disk.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, _META_FILE)) as f:
+            self.meta = json.load(f)
+        if self.meta.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Recording {path} uses an unsupported format version")
+        self.max_hands = self.meta['max_hands']
+        
+        columns = self.meta['columns']
+        # A recording cut short by a crash may have a partial last row in some columns
+        self.frames = min(
+            os.path.getsize(os.path.join(path, spec['file']))
+            // (np.dtype(spec['dtype']).itemsize * int(np.prod(spec['shape'], dtype=np.int64)))
+            for spec in columns.values()
+        )
+        self.columns = {name: self._map(spec) for name, spec in columns.items()}
+        self.timestamps = self.columns['timestamps']
+        self.hand_count = self.columns['hand_count']
+        self.hands = self.columns['hands']
+        self.pose = self.columns.get('pose')
+    
+    def _map(self, spec):
+        """Memory-map one column file"""
+        shape = (self.frames,) + tuple(spec['shape'])
+        if self.frames == 0:
+            return np.empty(shape, dtype=spec['dtype'])
+        return np.memmap(os.path.join(self.path, spec['file']), dtype=spec['dtype'], mode="r", shape=shape)
+    
+    def __len__(self):
+        return self.frames
+    
+    def first_hands(self, start=0, stop=None):
+        """
+        Get the first hand of every frame that has one
+        
+        Returns:
+            tuple: ((M,) frame indices, (M, 21, 3) float32 landmarks)
+        """
+        stop = self.frames if stop is None else min(stop, self.frames)
+        indices = start + np.flatnonzero(self.hand_count[start:stop] > 0)
+        return indices, np.asarray(self.hands[indices, 0], dtype=np.float32)
+    
+    def duration(self):
+        """Seconds between the first and last frame"""
+        return float(self.timestamps[-1] - self.timestamps[0]) if self.frames > 1 else 0.0
+
+
+def classify_recording(recording, gesture_recognizer=None, chunk_size=65536):
+    """
+    Classify the first hand of every recorded frame without re-running inference
+    
+    Args:
+        recording (LandmarkRecording): Recording to replay
+        gesture_recognizer: Anything with recognize_gestures((N, 21, 3)), e.g. a
+            GestureRecognizer with a new model or tuned rules
+        chunk_size (int): Frames classified per vectorized batch
+    
+    Returns:
+        ndarray: One gesture name per frame, "None" where no hand was seen
+    """
+    if gesture_recognizer is None:
+        from jarvis.desktop.motion.gesture_recognizer import GestureRecognizer
+        gesture_recognizer = GestureRecognizer(with_detector=False)
+    
+    labels = np.full(len(recording), "None", dtype=object)
+    for start in range(0, len(recording), chunk_size):
+        indices, points = recording.first_hands(start, start + chunk_size)
+        if len(indices):
+            labels[indices] = gesture_recognizer.recognize_gestures(points)
+    return labels
+
+
+def _info(path):
+    """Print a summary of a recording"""
+    recording = LandmarkRecording(path)
+    with_hands = int(np.count_nonzero(recording.hand_count))
+    size = sum(os.path.getsize(os.path.join(path, spec['file'])) for spec in recording.meta['columns'].values())
+    print(f"{path}: {len(recording)} frames over {recording.duration():.1f}s, "
+          f"{with_hands} with hands, pose {'yes' if recording.pose is not None else 'no'}, "
+          f"{size / 1e6:.1f} MB ({recording.hands.dtype})")
+
+
+def _classify(path, model_path):
+    """Replay a recording into the gesture recognizer and report counts and speed"""
+    from jarvis.desktop.motion.gesture_recognizer import GestureRecognizer
+    
+    recording = LandmarkRecording(path)
+    recognizer = GestureRecognizer(model_path=model_path, with_detector=False)
+    started = time.perf_counter()
+    labels = classify_recording(recording, recognizer)
+    elapsed = time.perf_counter() - started
+    rate = len(labels) / elapsed if elapsed > 0 else float("inf")
+    print(f"Classified {len(labels)} frames in {elapsed:.2f}s ({rate:,.0f} frames/s)")
+    for gesture, count in Counter(labels).most_common():
+        print(f"  {gesture}: {count}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect and replay recorded landmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    info_parser = subparsers.add_parser("info", help="Summarize a recording")
+    info_parser.add_argument("path")
+    classify_parser = subparsers.add_parser("classify", help="Classify every frame of a recording")
+    classify_parser.add_argument("path")
+    classify_parser.add_argument("--model", default=GESTURE_MODEL_PATH,
+                                 help="Gesture model to use (the built-in rules if it does not exist)")
+    args = parser.parse_args()
+    
+    if args.command == "info":
+        _info(args.path)
+    else:
+        _classify(args.path, args.model)
@@ -0,0 +1,135 @@
+"""Hand Landmark Array Module"""
+import itertools
+import time
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+WRIST = 0
+
+# MediaPipe hand landmark indices per finger: thumb, index, middle, ring, pinky
+FINGER_MCPS = np.array([2, 5, 9, 13, 17])
+FINGER_PIPS = np.array([3, 6, 10, 14, 18])
+FINGER_TIPS = np.array([4, 8, 12, 16, 20])
+THUMB, INDEX, MIDDLE, RING, PINKY = range(5)
+_PALM = np.array([WRIST, 5, 9, 13, 17])
+
+# Index 0 is the fallback label when no rule matches
+GESTURE_LABELS = ("Unknown", "thumbs down", "pointing up", "open palm")
+
+# A finger counts as extended when its tip is this much farther from the wrist
+# than its knuckle, and it bends less than EXTENDED_MAX_BEND at the middle joint
+EXTENDED_MIN_RATIO = 1.3
+EXTENDED_MAX_BEND = np.radians(50)
+
+
+def landmarks_to_array(hand_landmarks):
+    """Convert a MediaPipe NormalizedLandmarkList to a (21, 3) float32 array"""
+    coords = itertools.chain.from_iterable((lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark)
+    return np.fromiter(coords, dtype=np.float32, count=NUM_LANDMARKS * 3).reshape(NUM_LANDMARKS, 3)
+
+
+def hands_to_array(hands):
+    """Stack several NormalizedLandmarkLists into an (N, 21, 3) float32 array"""
+    if not hands:
+        return np.empty((0, NUM_LANDMARKS, 3), dtype=np.float32)
+    return np.stack([landmarks_to_array(hand) for hand in hands])
+
+
+def palm_center(points):
+    """Mean (x, y) of the wrist and the four finger knuckles; (2,) or (N, 2)"""
+    return points[..., _PALM, :2].mean(axis=-2)
+
+
+def finger_extension(points):
+    """
+    Tip-to-wrist over knuckle-to-wrist distance for each finger
+    
+    Args:
+        points (ndarray): (21, 3) or (N, 21, 3) landmarks
+    
+    Returns:
+        ndarray: (5,) or (N, 5); about 1 for a curled finger, 1.8+ when straight
+    """
+    wrist = points[..., WRIST:WRIST + 1, :]
+    tips = np.linalg.norm(points[..., FINGER_TIPS, :] - wrist, axis=-1)
+    knuckles = np.linalg.norm(points[..., FINGER_MCPS, :] - wrist, axis=-1)
+    return tips / np.maximum(knuckles, 1e-6)
+
+
+def finger_bend(points):
+    """
+    Bend angle at each finger's middle joint in radians (0 when straight)
+    
+    Args:
+        points (ndarray): (21, 3) or (N, 21, 3) landmarks
+    
+    Returns:
+        ndarray: (5,) or (N, 5) angles
+    """
+    joints = points[..., FINGER_PIPS, :]
+    toward_knuckle = points[..., FINGER_MCPS, :] - joints
+    toward_tip = points[..., FINGER_TIPS, :] - joints
+    cos = np.sum(toward_knuckle * toward_tip, axis=-1) / np.maximum(
+        np.linalg.norm(toward_knuckle, axis=-1) * np.linalg.norm(toward_tip, axis=-1), 1e-12
+    )
+    return np.pi - np.arccos(np.clip(cos, -1.0, 1.0))
+
+
+def extended_fingers(points):
+    """Boolean (5,) or (N, 5) mask of straightened fingers"""
+    return (finger_extension(points) > EXTENDED_MIN_RATIO) & (finger_bend(points) < EXTENDED_MAX_BEND)
+
+
+def classify_landmarks(points):
+    """
+    Classify one or many hands from their landmarks in a single vectorized pass
+    
+    Args:
+        points (ndarray): (21, 3) or (N, 21, 3) landmarks
+    
+    Returns:
+        ndarray: Indices into GESTURE_LABELS, shape () or (N,)
+    """
+    points = np.asarray(points, dtype=np.float32)
+    extended = extended_fingers(points)
+    others_curled = ~np.any(extended[..., INDEX:], axis=-1)
+    # Image y grows downwards
+    tip_y = points[..., FINGER_TIPS, 1]
+    knuckle_y = points[..., FINGER_MCPS, 1]
+    
+    thumbs_down = extended[..., THUMB] & others_curled & (tip_y[..., THUMB] > knuckle_y[..., THUMB])
+    pointing_up = (
+        extended[..., INDEX]
+        & ~np.any(extended[..., MIDDLE:], axis=-1)
+        & (tip_y[..., INDEX] < knuckle_y[..., INDEX])
+    )
+    open_palm = np.all(extended, axis=-1)
+    return np.select([thumbs_down, pointing_up, open_palm], [1, 2, 3], default=0)
+
+
+def benchmark(hands=10000, repeat=20):
+    """Measure classification cost per hand, batched and one at a time"""
+    rng = np.random.default_rng(0)
+    points = rng.random((hands, NUM_LANDMARKS, 3), dtype=np.float32)
+    
+    started = time.perf_counter()
+    for _ in range(repeat):
+        classify_landmarks(points)
+    batched = (time.perf_counter() - started) / (repeat * hands)
+    
+    singles = points[:1000]
+    started = time.perf_counter()
+    for hand in singles:
+        classify_landmarks(hand)
+    single = (time.perf_counter() - started) / len(singles)
+    
+    return {
+        'hands': hands,
+        'batched_us_per_hand': round(batched * 1e6, 3),
+        'single_us_per_hand': round(single * 1e6, 1),
+    }
+
+
+if __name__ == "__main__":
+    print(benchmark())
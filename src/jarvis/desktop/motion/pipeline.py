@@ -0,0 +1,313 @@
+"""Gesture Processing Pipeline Module"""
+import queue
+import threading
+import time
+from collections import deque
+
+import cv2
+
+from jarvis.api.metrics import LatencyTracker
+from jarvis.desktop.motion.landmarks import landmarks_to_array, palm_center
+from jarvis.desktop.motion.roi import FULL_FRAME, HandRoiTracker
+from jarvis.desktop.motion.temporal import GestureSmoother, SwipeDetector
+from jarvis.config.settings import PIPELINE_QUEUE_SIZE
+
+# Landmarks older than this are not drawn, so the overlay never lags visibly
+_OVERLAY_MAX_AGE = 0.5
+
+# Seconds to wait for stage threads of a previous run before restarting
+_RESTART_TIMEOUT = 5.0
+
+
+class DropQueue:
+    """Bounded queue that drops its oldest item instead of blocking the producer"""
+    
+    def __init__(self, maxsize=1):
+        self.maxsize = max(1, maxsize)
+        self.dropped = 0
+        self._items = deque()
+        self._cond = threading.Condition()
+    
+    def put(self, item):
+        """Add an item, discarding the oldest one if the queue is full"""
+        with self._cond:
+            if len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+    
+    def get(self, timeout=None):
+        """Take the oldest item, or None if nothing arrived within `timeout`"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._items, timeout)
+            return self._items.popleft() if self._items else None
+    
+    def clear(self):
+        """Discard all queued items"""
+        with self._cond:
+            self._items.clear()
+    
+    def __len__(self):
+        """Number of queued items"""
+        return len(self._items)
+
+
+class FrameResult:
+    """What the pipeline learned about one camera frame"""
+    
+    def __init__(self, seq, timestamp, frame):
+        self.seq = seq
+        # Frame time for gesture timing; latency is measured from captured_at
+        self.timestamp = timestamp
+        self.captured_at = timestamp
+        self.frame = frame
+        self.source = None
+        self.region = FULL_FRAME
+        self.hand_landmarks = []
+        self.gesture = None
+        self.fired = []
+
+
+class PipelineStage:
+    """Worker thread that pulls items, transforms them and hands them to the next stage"""
+    
+    def __init__(self, name, fn, get, put=None):
+        self.name = name
+        self.fn = fn
+        self.get = get
+        self.put = put
+        self.processed = 0
+        self.errors = 0
+        self.last_error = None
+        self.latency = LatencyTracker(window=300)
+        self._thread = None
+    
+    def start(self, stop_event):
+        """Run the stage until stop_event is set"""
+        self._thread = threading.Thread(
+            target=self._run, args=(stop_event,), name=f"pipeline-{self.name}", daemon=True
+        )
+        self._thread.start()
+    
+    def join(self, timeout=None):
+        """
+        Wait for the stage thread to finish
+        
+        Returns:
+            bool: True if no stage thread is left running
+        """
+        if self._thread is None:
+            return True
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            # Keep the reference so a restart can wait for this thread
+            return False
+        self._thread = None
+        return True
+    
+    def _run(self, stop_event):
+        """Process items until stopped; a failing item is counted and skipped"""
+        while not stop_event.is_set():
+            item = self.get(0.1)
+            if item is None:
+                continue
+            item = self.process(item)
+            if item is not None and self.put is not None:
+                self.put(item)
+    
+    def process(self, item):
+        """Transform one item, counting a failure and returning None instead of raising"""
+        started = time.perf_counter()
+        try:
+            item = self.fn(item)
+        except Exception as e:
+            self.errors += 1
+            self.last_error = str(e)
+            return None
+        self.latency.record(time.perf_counter() - started)
+        self.processed += 1
+        return item
+    
+    def stats(self):
+        """Get throughput and latency for this stage"""
+        return {
+            'processed': self.processed,
+            'errors': self.errors,
+            'latency': self.latency.snapshot(),
+        }
+
+
+class GesturePipeline:
+    """
+    Runs hand tracking off the GUI thread: preprocess -> inference -> classify
+    
+    Each stage has its own thread and a small drop-oldest queue in front of
+    it, so a slow stage only ever sees the newest frame and never stalls the
+    camera or the display. The GUI renders the latest landmarks and takes
+    fired gestures from the `gestures` queue.
+    """
+    
+    def __init__(self, camera_controller, gesture_recognizer, queue_size=PIPELINE_QUEUE_SIZE):
+        self.camera_controller = camera_controller
+        self.gesture_recognizer = gesture_recognizer
+        self.gestures = queue.Queue()
+        self.end_to_end = LatencyTracker(window=60)
+        self.smoother = GestureSmoother()
+        self.swipe_detector = SwipeDetector()
+        self.roi_tracker = HandRoiTracker()
+        # Run inference on every Nth camera frame (see PerformanceGovernor)
+        self.inference_stride = 1
+        # Optional LandmarkWriter that receives every processed frame's hands
+        self.recorder = None
+        self._seq = 0
+        self._latest = None
+        self._stop_event = None
+        
+        self._inference_queue = DropQueue(queue_size)
+        self._classify_queue = DropQueue(queue_size)
+        self.stages = [
+            PipelineStage("preprocess", self._preprocess, self._next_frame, self._inference_queue.put),
+            PipelineStage("inference", self._infer, self._inference_queue.get, self._classify_queue.put),
+            PipelineStage("classify", self._classify, self._classify_queue.get),
+        ]
+    
+    def start(self):
+        """
+        Start all stage threads
+        
+        Returns:
+            bool: False if threads from the previous run are still finishing
+        """
+        if self.is_running():
+            return True
+        deadline = time.monotonic() + _RESTART_TIMEOUT
+        for stage in self.stages:
+            # Two threads per stage would share the MediaPipe graph and the smoother
+            if not stage.join(max(0.0, deadline - time.monotonic())):
+                return False
+        self._inference_queue.clear()
+        self._classify_queue.clear()
+        self._latest = None
+        self.smoother.reset()
+        self.swipe_detector.reset()
+        self.roi_tracker.reset()
+        self._stop_event = threading.Event()
+        for stage in self.stages:
+            stage.start(self._stop_event)
+        return True
+    
+    def stop(self, timeout=1.0):
+        """
+        Stop all stage threads, upstream first so later stages see no new work
+        
+        Returns:
+            bool: True if every stage thread has exited; stragglers are waited
+                for again by the next start()
+        """
+        if self._stop_event is None:
+            return True
+        self._stop_event.set()
+        deadline = time.monotonic() + timeout
+        stopped = [stage.join(max(0.0, deadline - time.monotonic())) for stage in self.stages]
+        self._stop_event = None
+        self._latest = None
+        return all(stopped)
+    
+    def is_running(self):
+        """Check if the pipeline threads are running"""
+        return self._stop_event is not None
+    
+    def process(self, frame, timestamp, seq=0):
+        """
+        Run every stage on one frame on the calling thread, without dropping anything
+        
+        Used for offline replay, where each frame must be processed exactly once.
+        
+        Args:
+            frame (ndarray): BGR frame
+            timestamp (float): Frame time in seconds, e.g. its position in a video
+            seq (int): Frame number
+        
+        Returns:
+            FrameResult: Landmarks, gesture and fired events, or None if a stage failed
+        """
+        result = FrameResult(seq, timestamp, frame)
+        result.captured_at = time.monotonic()
+        for stage in self.stages:
+            result = stage.process(result)
+            if result is None:
+                return None
+        return result
+    
+    def _next_frame(self, timeout):
+        """Wait for a camera frame newer than the last one processed"""
+        after = self._seq + self.inference_stride - 1 if self._seq else 0
+        frame, seq, timestamp = self.camera_controller.wait_for_frame(after, timeout)
+        if frame is None:
+            return None
+        self._seq = seq
+        return FrameResult(seq, timestamp, frame)
+    
+    def _preprocess(self, result):
+        """Crop around the tracked hand, downscale and convert to the RGB MediaPipe expects"""
+        result.source = result.frame
+        # A tracking detector crops around the hand itself, and its carried-over
+        # landmarks are only valid while every input has the same framing
+        full = self.gesture_recognizer.tracks_hands
+        image, result.region = self.roi_tracker.crop(result.frame, full=full)
+        result.frame = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        return result
+    
+    def _infer(self, result):
+        """Detect hand landmarks, falling back to the whole frame if the hand left the crop"""
+        hands = self.gesture_recognizer.detect_hands(result.frame)
+        if not hands and result.region != FULL_FRAME:
+            self.roi_tracker.track(hands, result.region)
+            image, result.region = self.roi_tracker.crop(result.source, full=True)
+            hands = self.gesture_recognizer.detect_hands(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+        result.hand_landmarks = self.roi_tracker.track(hands, result.region)
+        result.frame = None
+        result.source = None
+        return result
+    
+    def _classify(self, result):
+        """Classify the first hand and queue gestures that should fire"""
+        confidence = 1.0
+        if result.hand_landmarks:
+            points = landmarks_to_array(result.hand_landmarks[0])
+            result.gesture, confidence = self.gesture_recognizer.classify_points(points)
+            swipe = self.swipe_detector.update(palm_center(points), result.timestamp)
+        else:
+            swipe = self.swipe_detector.update(None, result.timestamp)
+        
+        # Poses seen mid-swipe are motion blur, not static gestures
+        static = None if self.swipe_detector.moving else result.gesture
+        gesture = self.smoother.update(static, confidence, result.timestamp)
+        result.fired = [fired for fired in (swipe, gesture) if fired]
+        for fired in result.fired:
+            self.gestures.put(fired)
+        self._latest = result
+        if self.recorder is not None:
+            self.recorder.append(result.timestamp, result.hand_landmarks)
+        self.end_to_end.record(time.monotonic() - result.captured_at)
+        return result
+    
+    def latest_landmarks(self, max_age=_OVERLAY_MAX_AGE):
+        """Get the most recent hand landmarks, or [] if they are stale"""
+        result = self._latest
+        if result is None or time.monotonic() - result.timestamp > max_age:
+            return []
+        return result.hand_landmarks
+    
+    def get_stats(self):
+        """Get per-stage, queue and end-to-end statistics"""
+        return {
+            'stages': {stage.name: stage.stats() for stage in self.stages},
+            'dropped': {
+                'inference': self._inference_queue.dropped,
+                'classify': self._classify_queue.dropped,
+            },
+            'end_to_end': self.end_to_end.snapshot(),
+            'roi': self.roi_tracker.stats(),
+        }
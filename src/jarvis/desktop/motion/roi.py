@@ -0,0 +1,136 @@
+"""Hand Region-of-Interest Tracking Module"""
+import threading
+
+import cv2
+import numpy as np
+
+from jarvis.config.settings import (
+    HAND_DETECT_WIDTH, HAND_ROI_SIZE, HAND_ROI_MARGIN, HAND_FULL_DETECT_INTERVAL
+)
+
+FULL_FRAME = (0.0, 0.0, 1.0, 1.0)
+
+
+def _downscale(image, max_side):
+    """Shrink an image so its longer side is at most max_side pixels"""
+    height, width = image.shape[:2]
+    scale = max_side / max(height, width)
+    if scale >= 1.0:
+        return np.ascontiguousarray(image)
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+
+class HandRoiTracker:
+    """
+    Crops frames around the last tracked hands so detection runs on fewer pixels
+    
+    While hands are tracked, only a downscaled crop around their bounding box
+    is sent to the detector. The whole (downscaled) frame is used when tracking
+    is lost and every `full_interval` frames, so new hands are still found.
+    Detectors that track hands across frames themselves are always given the
+    whole frame (crop(full=True)), since they already work on such a crop.
+    
+    crop() and track() run on different pipeline threads, so the tracked
+    box and counters are only touched under a lock.
+    """
+    
+    def __init__(self, detect_width=HAND_DETECT_WIDTH, roi_size=HAND_ROI_SIZE,
+                 margin=HAND_ROI_MARGIN, full_interval=HAND_FULL_DETECT_INTERVAL):
+        self.detect_width = detect_width
+        self.roi_size = roi_size
+        self.margin = margin
+        self.full_interval = full_interval
+        self.bbox = None
+        self.full_detections = 0
+        self.roi_detections = 0
+        self.roi_misses = 0
+        self._since_full = 0
+        self._lock = threading.Lock()
+    
+    def crop(self, frame, full=False):
+        """
+        Cut the region the detector should look at
+        
+        Args:
+            frame (ndarray): Full camera frame
+            full (bool): Force a whole-frame detection
+        
+        Returns:
+            tuple: (image for the detector, (x0, y0, x1, y1) normalized region)
+        """
+        height, width = frame.shape[:2]
+        with self._lock:
+            box = None if full else self._crop_box(width, height)
+            if box is None:
+                self._since_full = 0
+                self.full_detections += 1
+            else:
+                self._since_full += 1
+                self.roi_detections += 1
+        
+        if box is None:
+            return _downscale(frame, self.detect_width), FULL_FRAME
+        x0, y0, x1, y1 = box
+        region = (x0 / width, y0 / height, x1 / width, y1 / height)
+        return _downscale(frame[y0:y1, x0:x1], self.roi_size), region
+    
+    def _crop_box(self, width, height):
+        """Pixel box around the tracked hands, or None when a whole-frame pass is due"""
+        bbox = self.bbox
+        if bbox is None or self.full_interval <= 0 or self._since_full >= self.full_interval:
+            return None
+        # Square crop in pixels around the box, grown by the margin on every side
+        cx, cy = (bbox[0] + bbox[2]) / 2 * width, (bbox[1] + bbox[3]) / 2 * height
+        half = max((bbox[2] - bbox[0]) * width, (bbox[3] - bbox[1]) * height) * (0.5 + self.margin)
+        x0, x1 = int(max(0, cx - half)), int(min(width, cx + half))
+        y0, y1 = int(max(0, cy - half)), int(min(height, cy + half))
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            return None
+        return x0, y0, x1, y1
+    
+    def track(self, hands, region):
+        """
+        Map detected landmarks back to full-frame coordinates and remember where they are
+        
+        Args:
+            hands (list): NormalizedLandmarkLists relative to the region, updated in place
+            region (tuple): The region returned by crop()
+        
+        Returns:
+            list: The same hands, now normalized to the whole frame
+        """
+        if region != FULL_FRAME:
+            x0, y0, x1, y1 = region
+            scale_x, scale_y = x1 - x0, y1 - y0
+            for hand in hands:
+                for landmark in hand.landmark:
+                    landmark.x = x0 + landmark.x * scale_x
+                    landmark.y = y0 + landmark.y * scale_y
+                    landmark.z *= scale_x
+        
+        bbox = None
+        if hands:
+            xs = [landmark.x for hand in hands for landmark in hand.landmark]
+            ys = [landmark.y for hand in hands for landmark in hand.landmark]
+            bbox = (min(xs), min(ys), max(xs), max(ys))
+        with self._lock:
+            if region != FULL_FRAME and not hands:
+                self.roi_misses += 1
+            self.bbox = bbox
+        return hands
+    
+    def reset(self):
+        """Forget the tracked region"""
+        with self._lock:
+            self.bbox = None
+            self._since_full = 0
+    
+    def stats(self):
+        """Get detection counters"""
+        with self._lock:
+            return {
+                'full_detections': self.full_detections,
+                'roi_detections': self.roi_detections,
+                'roi_misses': self.roi_misses,
+            }
@@ -0,0 +1,151 @@
+"""Temporal Gesture Filtering Module"""
+import time
+from collections import deque
+
+import numpy as np
+
+from jarvis.config.settings import (
+    GESTURE_WINDOW_SECONDS, GESTURE_ENTER_SHARE, GESTURE_RELEASE_SHARE,
+    GESTURE_COOLDOWN_SECONDS, SWIPE_WINDOW_SECONDS, SWIPE_MIN_DISTANCE
+)
+
+# Predictions that never trigger an action
+_INACTIVE = (None, "None", "Unknown")
+
+
+class GestureSmoother:
+    """
+    Turns noisy per-frame predictions into debounced gesture events
+    
+    Predictions are confidence-weighted votes over the last `window` seconds,
+    so timing does not depend on frame rate. A gesture becomes the stable
+    state once it holds `enter` of the window and stays until its share falls
+    below `release` (hysteresis); an event fires on entering a new state.
+    """
+    
+    def __init__(self, window=GESTURE_WINDOW_SECONDS, enter=GESTURE_ENTER_SHARE,
+                 release=GESTURE_RELEASE_SHARE, cooldown=GESTURE_COOLDOWN_SECONDS, min_samples=3):
+        self.window = window
+        self.enter = enter
+        self.release = release
+        self.cooldown = cooldown
+        self.min_samples = min_samples
+        self.state = None
+        self._history = deque()
+        self._last_fired = float("-inf")
+    
+    def update(self, gesture, confidence=1.0, timestamp=None):
+        """
+        Add one frame's prediction
+        
+        Args:
+            gesture (str): Predicted gesture, or None when no hand is visible
+            confidence (float): Classifier confidence in [0, 1]
+            timestamp (float): Frame time in seconds (defaults to now)
+        
+        Returns:
+            str: The gesture to act on, or None
+        """
+        now = time.monotonic() if timestamp is None else timestamp
+        self._history.append((now, gesture, confidence))
+        while self._history[0][0] < now - self.window:
+            self._history.popleft()
+        
+        votes = {}
+        for _, label, weight in self._history:
+            votes[label] = votes.get(label, 0.0) + weight
+        frames = len(self._history)
+        
+        if votes.get(self.state, 0.0) / frames < self.release:
+            self.state = None
+        # Decide only once half a window of evidence has built up
+        if frames < self.min_samples or now - self._history[0][0] < self.window / 2:
+            return None
+        best = max(votes, key=votes.get)
+        if best == self.state or votes[best] / frames < self.enter:
+            return None
+        
+        if best in _INACTIVE:
+            self.state = best
+            return None
+        # Only a gesture that fires becomes the state; one that wins during the
+        # cooldown is re-checked on later frames and fires once it expires
+        if now - self._last_fired < self.cooldown:
+            return None
+        self.state = best
+        self._last_fired = now
+        return best
+    
+    def reset(self):
+        """Forget all history"""
+        self._history.clear()
+        self.state = None
+
+
+class SwipeDetector:
+    """
+    Detects swipes from the palm's trajectory in a fixed-size circular buffer
+    
+    Directions are reported as the user sees them in the mirrored preview.
+    """
+    
+    def __init__(self, window=SWIPE_WINDOW_SECONDS, min_distance=SWIPE_MIN_DISTANCE,
+                 cooldown=GESTURE_COOLDOWN_SECONDS, capacity=64):
+        self.window = window
+        self.min_distance = min_distance
+        self.cooldown = cooldown
+        self._last_fired = float("-inf")
+        self.moving = False
+        self._times = np.zeros(capacity)
+        self._points = np.zeros((capacity, 2), dtype=np.float32)
+        self._head = 0
+        self._count = 0
+    
+    def update(self, point, timestamp=None):
+        """
+        Add the palm position for one frame
+        
+        Args:
+            point (ndarray): Normalized (x, y) palm center, or None if no hand
+            timestamp (float): Frame time in seconds (defaults to now)
+        
+        Returns:
+            str: "swipe left/right/up/down" when a swipe completes, else None
+        """
+        if point is None:
+            self.reset()
+            return None
+        now = time.monotonic() if timestamp is None else timestamp
+        capacity = len(self._times)
+        self._times[self._head] = now
+        self._points[self._head] = point[:2]
+        self._head = (self._head + 1) % capacity
+        self._count = min(self._count + 1, capacity)
+        
+        # Oldest-to-newest samples inside the time window
+        order = (self._head - self._count + np.arange(self._count)) % capacity
+        order = order[self._times[order] >= now - self.window]
+        if len(order) < 3:
+            self.moving = False
+            return None
+        dx, dy = self._points[order[-1]] - self._points[order[0]]
+        distance = max(abs(dx), abs(dy))
+        self.moving = distance >= self.min_distance / 2
+        if distance < self.min_distance or now - self._last_fired < self.cooldown:
+            return None
+        
+        if abs(dx) >= 2 * abs(dy):
+            # The preview is mirrored, so motion towards lower x looks like a move right
+            swipe = "swipe right" if dx < 0 else "swipe left"
+        elif abs(dy) >= 2 * abs(dx):
+            swipe = "swipe up" if dy < 0 else "swipe down"
+        else:
+            return None
+        self.reset()
+        self._last_fired = now
+        return swipe
+    
+    def reset(self):
+        """Forget the trajectory"""
+        self._count = 0
+        self.moving = False
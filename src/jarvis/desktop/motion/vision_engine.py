@@ -0,0 +1,187 @@
+"""Multi-Model Vision Engine Module"""
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from jarvis.api.metrics import LatencyTracker
+from jarvis.config.settings import (
+    MEDIAPIPE_MIN_DETECTION_CONFIDENCE, MEDIAPIPE_MIN_TRACKING_CONFIDENCE,
+    HANDS_MODEL_COMPLEXITY, POSE_MODEL_COMPLEXITY, SEGMENTATION_MODEL
+)
+
+try:
+    import mediapipe as mp
+    MEDIAPIPE_AVAILABLE = True
+except ImportError:
+    MEDIAPIPE_AVAILABLE = False
+
+FEATURES = ("hands", "pose", "segmentation")
+# Highest model_complexity each MediaPipe solution accepts
+_MAX_COMPLEXITY = {"hands": 1, "pose": 2, "segmentation": 1}
+# Brightness kept for pixels the segmentation mask marks as background
+_BACKGROUND_DIM = 0.3
+
+
+class VisionResult:
+    """Everything the enabled models found in one frame"""
+    
+    def __init__(self):
+        self.hand_landmarks = []
+        self.pose_landmarks = None
+        self.segmentation_mask = None
+
+
+class VisionEngine:
+    """
+    Runs MediaPipe hands, pose and selfie segmentation on camera frames
+    
+    Each model is built once, the first time its feature is enabled, and kept
+    for the life of the engine. Every frame is converted to RGB once into a
+    reused buffer that all enabled models share. Complexity trades speed for
+    accuracy: hands 0-1, pose 0-2, segmentation 0 (general) or 1 (landscape).
+    """
+    
+    def __init__(self, hands=True, pose=False, segmentation=False,
+                 hands_complexity=HANDS_MODEL_COMPLEXITY, pose_complexity=POSE_MODEL_COMPLEXITY,
+                 segmentation_model=SEGMENTATION_MODEL, max_num_hands=2):
+        self.enabled = {"hands": hands, "pose": pose, "segmentation": segmentation}
+        self.complexity = {}
+        self.max_num_hands = max_num_hands
+        self.latency = {feature: LatencyTracker(window=60) for feature in FEATURES}
+        self._models = {}
+        self._rgb = None
+        self._lock = threading.Lock()
+        self.set_complexity(hands=hands_complexity, pose=pose_complexity,
+                            segmentation=segmentation_model)
+    
+    def is_available(self):
+        """Check if MediaPipe is available"""
+        return MEDIAPIPE_AVAILABLE
+    
+    def enable(self, feature, enabled=True):
+        """Turn one feature on or off; its model is kept either way"""
+        if feature not in FEATURES:
+            raise ValueError(f"Unknown vision feature: {feature}")
+        self.enabled[feature] = enabled
+    
+    def set_complexity(self, **levels):
+        """
+        Choose model complexity per feature, e.g. set_complexity(hands=0, pose=1)
+        
+        A model whose complexity changes is rebuilt the next time it runs.
+        """
+        with self._lock:
+            for feature, level in levels.items():
+                if feature not in FEATURES:
+                    raise ValueError(f"Unknown vision feature: {feature}")
+                level = min(max(int(level), 0), _MAX_COMPLEXITY[feature])
+                if self.complexity.get(feature) != level:
+                    self.complexity[feature] = level
+                    self._close_model(feature)
+    
+    def _model(self, feature):
+        """Get the model for a feature, building it on first use"""
+        model = self._models.get(feature)
+        if model is not None:
+            return model
+        
+        if feature == "hands":
+            model = mp.solutions.hands.Hands(
+                static_image_mode=False,
+                max_num_hands=self.max_num_hands,
+                model_complexity=self.complexity["hands"],
+                min_detection_confidence=MEDIAPIPE_MIN_DETECTION_CONFIDENCE,
+                min_tracking_confidence=MEDIAPIPE_MIN_TRACKING_CONFIDENCE
+            )
+        elif feature == "pose":
+            model = mp.solutions.pose.Pose(
+                static_image_mode=False,
+                model_complexity=self.complexity["pose"],
+                min_detection_confidence=MEDIAPIPE_MIN_DETECTION_CONFIDENCE,
+                min_tracking_confidence=MEDIAPIPE_MIN_TRACKING_CONFIDENCE
+            )
+        else:
+            model = mp.solutions.selfie_segmentation.SelfieSegmentation(
+                model_selection=self.complexity["segmentation"]
+            )
+        self._models[feature] = model
+        return model
+    
+    def _close_model(self, feature):
+        """Release a model so it is rebuilt on next use"""
+        model = self._models.pop(feature, None)
+        if model is not None:
+            model.close()
+    
+    def process(self, frame):
+        """
+        Run every enabled model on one frame
+        
+        Args:
+            frame (ndarray): BGR camera frame
+        
+        Returns:
+            VisionResult: Landmarks and mask for the enabled features
+        """
+        result = VisionResult()
+        if not MEDIAPIPE_AVAILABLE or not any(self.enabled.values()):
+            return result
+        
+        with self._lock:
+            if self._rgb is None or self._rgb.shape != frame.shape:
+                self._rgb = np.empty_like(frame)
+            # One conversion per frame, shared by all models
+            self._rgb.flags.writeable = True
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+            # Read-only input lets MediaPipe use the buffer without copying it
+            self._rgb.flags.writeable = False
+            
+            for feature in FEATURES:
+                if not self.enabled[feature]:
+                    continue
+                started = time.perf_counter()
+                output = self._model(feature).process(self._rgb)
+                self.latency[feature].record(time.perf_counter() - started)
+                
+                if feature == "hands":
+                    result.hand_landmarks = output.multi_hand_landmarks or []
+                elif feature == "pose":
+                    result.pose_landmarks = output.pose_landmarks
+                else:
+                    result.segmentation_mask = output.segmentation_mask
+        return result
+    
+    def draw(self, frame, result):
+        """Draw a VisionResult onto the BGR frame it came from, in place"""
+        if result.segmentation_mask is not None:
+            background = result.segmentation_mask < 0.5
+            frame[background] = (frame[background] * _BACKGROUND_DIM).astype(frame.dtype)
+        if not MEDIAPIPE_AVAILABLE:
+            return frame
+        
+        drawing_utils = mp.solutions.drawing_utils
+        if result.pose_landmarks is not None:
+            drawing_utils.draw_landmarks(frame, result.pose_landmarks, mp.solutions.pose.POSE_CONNECTIONS)
+        for hand_landmarks in result.hand_landmarks:
+            drawing_utils.draw_landmarks(frame, hand_landmarks, mp.solutions.hands.HAND_CONNECTIONS)
+        return frame
+    
+    def close(self):
+        """Release all models"""
+        with self._lock:
+            for feature in FEATURES:
+                self._close_model(feature)
+    
+    def stats(self):
+        """Get enabled features, their complexity and per-model latency"""
+        return {
+            feature: {
+                'enabled': self.enabled[feature],
+                'complexity': self.complexity[feature],
+                'loaded': feature in self._models,
+                'latency': self.latency[feature].snapshot(),
+            }
+            for feature in FEATURES
+        }
@@ -0,0 +1,166 @@
+"""Offline Gesture Replay Module"""
+import argparse
+import csv
+import json
+import sys
+import time
+from collections import Counter
+
+from jarvis.api.metrics import LatencyTracker
+from jarvis.desktop.camera.sources import open_source, source_fps
+from jarvis.desktop.motion.gesture_recognizer import GestureRecognizer
+from jarvis.desktop.motion.landmark_store import LandmarkWriter
+from jarvis.desktop.motion.pipeline import GesturePipeline
+
+LOG_FIELDS = ("frame", "time", "hands", "gesture", "fired")
+
+
+def replay(source, fps=None, max_frames=None, stride=1, gesture_recognizer=None, landmarks_path=None):
+    """
+    Run every frame of a recording through the gesture pipeline as fast as possible
+    
+    Frames are processed in order on the calling thread, none are dropped, and
+    gesture timing uses the frame's position in the recording, so the same
+    clip always produces the same gestures.
+    
+    Args:
+        source: Video file, image directory, glob or printf-style sequence
+        fps (float): Frame rate to assume, overriding what the source reports
+        max_frames (int): Stop after this many frames
+        stride (int): Process every Nth frame, as the governor would under load
+        gesture_recognizer (GestureRecognizer): Recognizer to use (a new one by default)
+        landmarks_path (str): Also record the detected landmarks here (see landmark_store)
+    
+    Returns:
+        tuple: (report dict, list of per-frame log rows)
+    """
+    cap = open_source(source)
+    if not cap.isOpened():
+        raise ValueError(f"Could not open {source}")
+    fps = fps or source_fps(cap)
+    pipeline = GesturePipeline(None, gesture_recognizer or GestureRecognizer())
+    # Percentiles over the whole run, not just the live window
+    for stage in pipeline.stages:
+        stage.latency = LatencyTracker(window=None)
+    pipeline.end_to_end = LatencyTracker(window=None)
+    decode = LatencyTracker(window=None)
+    if landmarks_path:
+        pipeline.recorder = LandmarkWriter(landmarks_path)
+    
+    rows = []
+    fired = Counter()
+    frame_buffer = None
+    index = 0
+    started = time.perf_counter()
+    try:
+        while max_frames is None or index < max_frames:
+            read_started = time.perf_counter()
+            ret, frame = cap.read(frame_buffer)
+            if not ret:
+                break
+            decode.record(time.perf_counter() - read_started)
+            frame_buffer = frame
+            index += 1
+            if (index - 1) % stride:
+                continue
+            
+            timestamp = (index - 1) / fps
+            result = pipeline.process(frame, timestamp, seq=index)
+            if result is None:
+                rows.append((index, round(timestamp, 3), 0, "error", ""))
+                continue
+            fired.update(result.fired)
+            rows.append((
+                index, round(timestamp, 3), len(result.hand_landmarks),
+                result.gesture or "", "|".join(result.fired)
+            ))
+    finally:
+        cap.release()
+        if pipeline.recorder is not None:
+            pipeline.recorder.close()
+    elapsed = time.perf_counter() - started
+    
+    processed = len(rows)
+    report = {
+        'source': str(source),
+        'frames': index,
+        'processed': processed,
+        'video_seconds': round(index / fps, 2),
+        'wall_seconds': round(elapsed, 3),
+        'fps': round(processed / elapsed, 1) if elapsed > 0 else None,
+        'stages': {'decode': decode.snapshot(), **{
+            stage.name: stage.latency.snapshot() for stage in pipeline.stages
+        }},
+        'end_to_end': pipeline.end_to_end.snapshot(),
+        'errors': {stage.name: stage.errors for stage in pipeline.stages if stage.errors},
+        'roi': pipeline.roi_tracker.stats(),
+        'gestures': dict(fired),
+        'sequence': [gesture for row in rows if row[4] for gesture in row[4].split("|")],
+    }
+    return report, rows
+
+
+def write_log(rows, path):
+    """Write the per-frame gesture log as CSV"""
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(LOG_FIELDS)
+        writer.writerows(rows)
+
+
+def print_report(report):
+    """Print a replay report as a short table"""
+    print(f"{report['source']}: {report['processed']}/{report['frames']} frames "
+          f"({report['video_seconds']}s of video) in {report['wall_seconds']}s = {report['fps']} FPS")
+    print(f"{'stage':<12}{'avg ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, latency in [*report['stages'].items(), ('end_to_end', report['end_to_end'])]:
+        values = [latency[key] for key in ('avg_ms', 'p50_ms', 'p95_ms', 'p99_ms')]
+        print(f"{name:<12}" + "".join(f"{'-' if value is None else value:>10}" for value in values))
+    if report['errors']:
+        print(f"Errors: {report['errors']}")
+    print(f"Gestures: {', '.join(report['sequence']) or 'none'}")
+
+
+def main(argv=None):
+    """Command-line entry point; returns the process exit code"""
+    parser = argparse.ArgumentParser(
+        description="Replay a recorded clip through the gesture pipeline and report speed and gestures"
+    )
+    parser.add_argument("source", help="Video file, image directory, glob or frames/%%04d.png pattern")
+    parser.add_argument("--fps", type=float, help="Frame rate to assume (default: from the source, else 30)")
+    parser.add_argument("--max-frames", type=int)
+    parser.add_argument("--stride", type=int, default=1, help="Process every Nth frame")
+    parser.add_argument("--log", help="Write the per-frame gesture log to this CSV file")
+    parser.add_argument("--report", help="Write the report to this JSON file")
+    parser.add_argument("--landmarks", help="Record the detected landmarks to this directory")
+    parser.add_argument("--expect", help="Comma-separated gestures the clip must fire, in order; "
+                                         "the exit code is 1 if they differ")
+    args = parser.parse_args(argv)
+    
+    recognizer = GestureRecognizer()
+    if not recognizer.is_available():
+        print("Error: Replay requires MediaPipe. Please install it.")
+        return 1
+    try:
+        report, rows = replay(args.source, args.fps, args.max_frames, max(1, args.stride), recognizer,
+                              args.landmarks)
+    except ValueError as e:
+        print(f"Error: {str(e)}")
+        return 1
+    
+    print_report(report)
+    if args.log:
+        write_log(rows, args.log)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.expect is not None:
+        expected = [gesture.strip() for gesture in args.expect.split(",") if gesture.strip()]
+        if report['sequence'] != expected:
+            print(f"Expected gestures: {', '.join(expected) or 'none'}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
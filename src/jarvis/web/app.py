@@ -3,9 +3,10 @@ from pathlib import Path
 
 from flask import Flask, render_template
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 
 from jarvis.api.routes import register_routes
-from jarvis.config.settings import FLASK_HOST, FLASK_PORT, FLASK_DEBUG
+from jarvis.config.settings import WEB_TRUSTED_PROXIES
 
 _BASE_DIR = Path(__file__).resolve().parent
 _TEMPLATES_DIR = _BASE_DIR / "templates"
@@ -21,6 +22,11 @@ def create_app() -> Flask:
     )
     CORS(app)
 
+    # Behind a reverse proxy, take the client address from X-Forwarded-For so
+    # quota is shared per client rather than per proxy
+    if WEB_TRUSTED_PROXIES > 0:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=WEB_TRUSTED_PROXIES)
+
     # Register API routes
     register_routes(app)
 
@@ -35,4 +41,5 @@ def create_app() -> Flask:
 app = create_app()
 
 if __name__ == "__main__":
-    app.run(debug=FLASK_DEBUG, host=FLASK_HOST, port=FLASK_PORT)
+    from jarvis.web.serve import serve
+    serve()
@@ -0,0 +1,182 @@
+"""Production Web Server Entry Point"""
+import signal
+import sys
+import threading
+import time
+
+from jarvis.config.settings import (
+    FLASK_HOST, FLASK_PORT, FLASK_DEBUG, WEB_SERVER, WEB_WORKERS, WEB_THREADS,
+    WEB_KEEPALIVE, WEB_TIMEOUT, WEB_GRACEFUL_TIMEOUT
+)
+
+try:
+    from gunicorn.app.base import BaseApplication
+    GUNICORN_AVAILABLE = True
+except ImportError:
+    BaseApplication = object
+    GUNICORN_AVAILABLE = False
+
+try:
+    import waitress
+    from waitress import wasyncore
+    from waitress.server import BaseWSGIServer
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+
+
+def _post_fork(server, worker):
+    """Give each forked worker its own Gemini client state and share of the quota"""
+    from jarvis.api import gemini_client
+    gemini_client.reset_after_fork(WEB_WORKERS)
+
+
+class GunicornApplication(BaseApplication):
+    """Embedded gunicorn server running the Jarvis app factory"""
+    
+    def __init__(self, options=None):
+        self.options = options or {}
+        super().__init__()
+    
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+    
+    def load(self):
+        from jarvis.web.app import create_app
+        return create_app()
+
+
+def serve_gunicorn(host=FLASK_HOST, port=FLASK_PORT):
+    """
+    Serve with gunicorn: pre-forked worker processes, each with a thread pool
+    
+    The app (and with it the Gemini client) is loaded once in the master and
+    inherited by workers, which then rebuild their connections after fork.
+    SIGTERM stops accepting connections and drains in-flight requests for up
+    to WEB_GRACEFUL_TIMEOUT seconds.
+    
+    WEB_TIMEOUT is gunicorn's worker heartbeat timeout, not a request deadline:
+    a gthread worker keeps heartbeating while its request threads are busy, so
+    it is only restarted when the whole process stops responding.
+    """
+    options = {
+        'bind': f"{host}:{port}",
+        'workers': WEB_WORKERS,
+        'threads': WEB_THREADS,
+        'worker_class': 'gthread',
+        'keepalive': WEB_KEEPALIVE,
+        'timeout': WEB_TIMEOUT,
+        'graceful_timeout': WEB_GRACEFUL_TIMEOUT,
+        'preload_app': True,
+        'post_fork': _post_fork,
+    }
+    GunicornApplication(options).run()
+
+
+def run_waitress(server, stopping, grace=WEB_GRACEFUL_TIMEOUT):
+    """
+    Run a waitress server until `stopping` is set, then drain it
+    
+    Draining closes the listening sockets but keeps the loop running, so
+    requests already accepted can finish and flush their responses for up to
+    `grace` seconds before the server is closed and its thread pool stopped.
+    
+    Args:
+        server: Server returned by waitress.create_server
+        stopping (threading.Event): Set to begin shutdown
+        grace (float): Longest wait for in-flight requests, in seconds
+    """
+    socket_map = getattr(server, '_map', None) or server.map
+    timeout = server.adj.asyncore_loop_timeout
+    use_poll = server.adj.asyncore_use_poll
+    
+    while not stopping.is_set() and socket_map:
+        wasyncore.loop(timeout=timeout, use_poll=use_poll, map=socket_map, count=1)
+    
+    # Close only the listeners: server.close() would also close the trigger
+    # that finishing request threads use to wake the loop
+    for listener in [d for d in socket_map.values() if isinstance(d, BaseWSGIServer)]:
+        wasyncore.dispatcher.close(listener)
+    
+    dispatcher = server.task_dispatcher
+    deadline = time.monotonic() + grace
+    while time.monotonic() < deadline and (
+            dispatcher.active_count or dispatcher.queue or _pending_responses(socket_map)):
+        wasyncore.loop(timeout=0.1, use_poll=use_poll, map=socket_map, count=1)
+    
+    # Whatever is still running after the grace period is abandoned
+    dispatcher.shutdown(timeout=max(deadline - time.monotonic(), 0))
+    server.close()
+    wasyncore.close_all(socket_map)
+
+
+def _pending_responses(socket_map):
+    """Whether any connection still has a request queued or output unsent"""
+    return any(
+        getattr(channel, 'requests', None) or getattr(channel, 'total_outbufs_len', 0)
+        for channel in list(socket_map.values())
+    )
+
+
+def serve_waitress(host=FLASK_HOST, port=FLASK_PORT):
+    """
+    Serve with waitress: a single process with a thread pool (works on Windows)
+    
+    SIGTERM/SIGINT close the listening socket and let in-flight requests finish,
+    for up to WEB_GRACEFUL_TIMEOUT seconds, before the process exits.
+    
+    WEB_TIMEOUT is waitress's channel_timeout: connections with no socket
+    activity for that long are closed. It does not bound how long the app
+    takes to answer a request.
+    """
+    from jarvis.web.app import create_app
+    server = waitress.create_server(
+        create_app(),
+        host=host,
+        port=port,
+        threads=WEB_THREADS,
+        channel_timeout=WEB_TIMEOUT,
+    )
+    stopping = threading.Event()
+    
+    def drain(signum, frame):
+        print("Shutting down: draining in-flight requests...")
+        stopping.set()
+    
+    signal.signal(signal.SIGTERM, drain)
+    signal.signal(signal.SIGINT, drain)
+    
+    print(f"Serving on http://{host}:{port} with {WEB_THREADS} threads")
+    run_waitress(server, stopping)
+
+
+def serve(server=WEB_SERVER, host=FLASK_HOST, port=FLASK_PORT):
+    """
+    Run the web app with the configured server
+    
+    Args:
+        server (str): "auto", "gunicorn", "waitress" or "flask" (development only)
+        host (str): Interface to bind
+        port (int): Port to bind
+    """
+    server = server.lower()
+    if FLASK_DEBUG or server == "flask":
+        from jarvis.web.app import create_app
+        create_app().run(debug=FLASK_DEBUG, host=host, port=port, threaded=True)
+        return
+    
+    if server == "auto":
+        server = "gunicorn" if GUNICORN_AVAILABLE and sys.platform != "win32" else "waitress"
+    
+    if server == "gunicorn" and GUNICORN_AVAILABLE:
+        serve_gunicorn(host, port)
+    elif server == "waitress" and WAITRESS_AVAILABLE:
+        serve_waitress(host, port)
+    else:
+        print(f"Error: {server} is not installed. Please install it with: pip install {server}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    serve()
@@ -3,7 +3,8 @@ const state = {
     messages: [],
     isTyping: false,
     theme: localStorage.getItem('theme') || 'dark',
-    apiKey: localStorage.getItem('apiKey') || ''
+    apiKey: localStorage.getItem('apiKey') || '',
+    sessionId: localStorage.getItem('sessionId') || createSessionId()
 };
 
 // DOM Elements
@@ -131,21 +132,23 @@ async function sendMessage() {
     setTyping(true);
 
     try {
-        const response = await fetch('/api/chat', {
+        const response = await fetch('/api/chat/stream', {
             method: 'POST',
             headers: {
-                'Content-Type': 'application/json'
+                'Content-Type': 'application/json',
+                'Accept': 'text/event-stream'
             },
-            body: JSON.stringify({ message })
+            body: JSON.stringify({ message, session_id: state.sessionId })
         });
 
-        const data = await response.json();
-
-        if (data.success) {
-            addMessage('assistant', data.response, data.timestamp);
-        } else {
+        const contentType = response.headers.get('Content-Type') || '';
+        if (!response.ok || !contentType.includes('text/event-stream') || !response.body) {
+            const data = await response.json();
             addMessage('assistant', `Error: ${data.error}`, new Date().toISOString());
+            return;
         }
+
+        await readTokenStream(response);
     } catch (error) {
         addMessage('assistant', `Error: ${error.message}`, new Date().toISOString());
     } finally {
@@ -153,8 +156,77 @@ async function sendMessage() {
     }
 }
 
+// Render a Server-Sent Events token stream into a single assistant message
+async function readTokenStream(response) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let content = '';
+    let contentElement = null;
+    let timestamp = null;
+
+    const handleEvent = (frame) => {
+        let event = 'message';
+        let data = '';
+        frame.split('\n').forEach(line => {
+            if (line.startsWith('event:')) {
+                event = line.slice(6).trim();
+            } else if (line.startsWith('data:')) {
+                data += line.slice(5).trim();
+            }
+        });
+        if (!data) return;
+
+        const payload = JSON.parse(data);
+        if (event === 'error') {
+            throw new Error(payload.error);
+        }
+        if (event === 'done') {
+            timestamp = payload.timestamp;
+            return;
+        }
+
+        content += payload.token;
+        if (!contentElement) {
+            // First token: create the message bubble
+            contentElement = renderMessage('assistant', content);
+        } else {
+            contentElement.textContent = content;
+            scrollToBottom();
+        }
+    };
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+
+        buffer += decoder.decode(value, { stream: true });
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const frame = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            handleEvent(frame);
+        }
+    }
+
+    if (!contentElement) {
+        renderMessage('assistant', content);
+    }
+    state.messages.push({ role: 'assistant', content, timestamp: timestamp || new Date().toISOString() });
+    saveChatHistory();
+}
+
 // Add Message to UI
 function addMessage(role, content, timestamp = null) {
+    renderMessage(role, content, timestamp);
+
+    // Save to state
+    state.messages.push({ role, content, timestamp: timestamp || new Date().toISOString() });
+    saveChatHistory();
+}
+
+// Render a message bubble and return its content element
+function renderMessage(role, content, timestamp = null) {
     const messageDiv = document.createElement('div');
     messageDiv.className = `message ${role}`;
 
@@ -181,9 +253,7 @@ function addMessage(role, content, timestamp = null) {
     elements.messagesContainer.appendChild(messageDiv);
     scrollToBottom();
 
-    // Save to state
-    state.messages.push({ role, content, timestamp: timestamp || new Date().toISOString() });
-    saveChatHistory();
+    return messageContent;
 }
 
 // Format Time
@@ -215,9 +285,26 @@ function clearChat() {
         elements.messagesContainer.innerHTML = '';
         elements.welcomeScreen.style.display = 'flex';
         localStorage.removeItem('chatHistory');
+        resetSession();
     }
 }
 
+// Conversation Session
+function createSessionId() {
+    const id = (window.crypto && crypto.randomUUID)
+        ? crypto.randomUUID()
+        : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+    localStorage.setItem('sessionId', id);
+    return id;
+}
+
+function resetSession() {
+    // Drop the server-side history so the next message starts fresh
+    fetch(`/api/sessions/${encodeURIComponent(state.sessionId)}`, { method: 'DELETE' })
+        .catch(error => console.error('Failed to end session:', error));
+    state.sessionId = createSessionId();
+}
+
 // Export Chat
 function exportChat() {
     if (state.messages.length === 0) {
@@ -0,0 +1,129 @@
+"""Tests for batch prompt processing"""
+import asyncio
+import io
+
+from jarvis.api import batch as batch_module
+from jarvis.api.batch import format_result, parse_jsonl, record_prompt, run_batch
+from jarvis.api.rate_limiter import QueueTimeoutError
+from jarvis.api.resilience import CircuitOpenError
+
+
+class Unavailable(Exception):
+    """Looks like google.api_core's 503 error to is_retryable()"""
+    code = 503
+
+
+def test_parse_jsonl_reports_bad_lines():
+    lines = io.BytesIO(b'{"message": "hi"}\n\nnot json\n[1, 2]\n{"title": "T", "body": "B"}\n')
+    records = list(parse_jsonl(lines))
+    assert records[0] == {'message': "hi"}
+    assert records[1]['_error'].startswith("Invalid JSON")
+    assert records[2] == {'_error': "Each line must be a JSON object"}
+    assert record_prompt(records[3]) == "T\n\nB"
+
+
+def test_results_keep_input_order():
+    async def process(prompt):
+        # Later records finish first
+        await asyncio.sleep(0.002 * (10 - int(prompt)))
+        return f"answer {prompt}"
+    
+    records = [{'prompt': str(i), 'request_id': f"r{i}"} for i in range(10)]
+    results = list(run_batch(records, process, concurrency=4))
+    assert [r['index'] for r in results] == list(range(10))
+    assert [r['request_id'] for r in results] == [f"r{i}" for i in range(10)]
+    assert results[3]['response'] == "answer 3"
+    assert all(r['success'] and r['attempts'] == 1 for r in results)
+
+
+def test_concurrency_is_bounded():
+    running = []
+    peak = []
+    
+    async def process(prompt):
+        running.append(prompt)
+        peak.append(len(running))
+        await asyncio.sleep(0.005)
+        running.remove(prompt)
+        return prompt
+    
+    list(run_batch(({'prompt': str(i)} for i in range(20)), process, concurrency=3))
+    assert max(peak) == 3
+
+
+def test_invalid_and_empty_records_become_error_results():
+    async def process(prompt):
+        return "ok"
+    
+    records = [{'_error': "Invalid JSON: x"}, {'message': ""}, {'message': "fine"}]
+    results = list(run_batch(records, process))
+    assert results[0] == {'index': 0, 'success': False, 'error': "Invalid JSON: x", 'attempts': 0}
+    assert results[1]['error'] == "Message cannot be empty"
+    assert results[2]['success'] is True
+
+
+def test_transient_errors_are_retried():
+    calls = []
+    
+    async def process(prompt):
+        calls.append(prompt)
+        if len(calls) < 3:
+            raise Unavailable("try again")
+        return "recovered"
+    
+    [result] = run_batch([{'prompt': "p"}], process, retries=2, backoff=0.001)
+    assert result['success'] is True
+    assert result['attempts'] == 3
+
+
+def test_terminal_errors_are_not_retried():
+    for error in (ValueError("blocked by safety filters"), CircuitOpenError("open"),
+                  QueueTimeoutError("quota"), RuntimeError("API key not configured")):
+        calls = []
+        
+        async def process(prompt):
+            calls.append(prompt)
+            raise error
+        
+        [result] = run_batch([{'prompt': "p"}], process, retries=3, backoff=0.001)
+        assert calls == ["p"]
+        assert result['success'] is False
+        assert result['attempts'] == 1
+        assert result['error'] == str(error)
+        assert result['error_type'] == type(error).__name__
+
+
+def test_retries_give_up_with_capped_backoff(monkeypatch):
+    delays = []
+    real_sleep = asyncio.sleep
+    
+    async def record_sleep(delay):
+        delays.append(delay)
+        await real_sleep(0)
+    
+    monkeypatch.setattr(batch_module.asyncio, "sleep", record_sleep)
+    
+    async def process(prompt):
+        raise Unavailable("down")
+    
+    [result] = run_batch([{'prompt': "p"}], process, retries=4, backoff=1.0, max_backoff=3.0)
+    assert result['attempts'] == 5
+    assert result['error_type'] == "Unavailable"
+    assert delays == [1.0, 2.0, 3.0, 3.0]
+
+
+def test_huge_retry_counts_do_not_overflow_backoff(monkeypatch):
+    async def no_sleep(delay):
+        assert delay <= 5.0
+    
+    monkeypatch.setattr(batch_module.asyncio, "sleep", no_sleep)
+    
+    async def process(prompt):
+        raise Unavailable("down")
+    
+    [result] = run_batch([{'prompt': "p"}], process, retries=2000, backoff=1.0, max_backoff=5.0)
+    assert result['attempts'] == 2001
+
+
+def test_format_result_is_one_json_line():
+    assert format_result({'index': 0, 'response': "héllo"}) == '{"index": 0, "response": "héllo"}\n'
@@ -0,0 +1,150 @@
+"""Tests for the response cache"""
+import pytest
+
+from jarvis.api import cache as cache_module
+from jarvis.api.cache import MemoryCache, SQLiteCache, create_cache, make_cache_key
+
+
+class FakeClock:
+    """Stands in for time.time() so TTLs can be tested without sleeping"""
+    
+    def __init__(self, now=1000.0):
+        self.now = now
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cache_module.time, "time", fake)
+    return fake
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_cache(request, tmp_path):
+    def factory(max_entries=3, ttl=60):
+        if request.param == "memory":
+            return MemoryCache(max_entries, ttl)
+        return SQLiteCache(str(tmp_path / "cache.sqlite3"), max_entries, ttl)
+    return factory
+
+
+def test_cache_key_ignores_case_and_whitespace():
+    assert make_cache_key("What is  Python?", "m") == make_cache_key("what is python?", "m")
+    assert make_cache_key("What is Python?", "m") != make_cache_key("What is Python?", "other")
+    assert make_cache_key("hi", "m", {"temperature": 0}) != make_cache_key("hi", "m", {"temperature": 1})
+
+
+def test_get_returns_stored_value_and_counts_hits(make_cache, clock):
+    cache = make_cache()
+    assert cache.get("a") is None
+    cache.set("a", "answer")
+    assert cache.get("a") == "answer"
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['hit_rate'] == 0.5
+
+
+def test_least_recently_used_entry_is_evicted(make_cache, clock):
+    cache = make_cache(max_entries=3)
+    for key in "abc":
+        cache.set(key, key.upper())
+        clock.now += 1
+    # Touching "a" makes "b" the least recently used
+    assert cache.get("a") == "A"
+    clock.now += 1
+    cache.set("d", "D")
+    
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in "acd"] == ["A", "C", "D"]
+    assert cache.stats()['entries'] == 3
+    assert cache.stats()['evictions'] == 1
+
+
+def test_entries_expire_after_ttl(make_cache, clock):
+    cache = make_cache(ttl=60)
+    cache.set("a", "answer")
+    clock.now += 59
+    assert cache.get("a") == "answer"
+    clock.now += 2
+    assert cache.get("a") is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_overwrite_refreshes_ttl(make_cache, clock):
+    cache = make_cache(ttl=60)
+    cache.set("a", "old")
+    clock.now += 50
+    cache.set("a", "new")
+    clock.now += 50
+    assert cache.get("a") == "new"
+
+
+def test_clear_removes_everything(make_cache, clock):
+    cache = make_cache()
+    cache.set("a", "A")
+    cache.set("b", "B")
+    cache.clear()
+    assert cache.get("a") is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_sqlite_cache_is_shared_between_connections(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite3")
+    SQLiteCache(path).set("a", "answer")
+    assert SQLiteCache(path).get("a") == "answer"
+
+
+def test_sqlite_sweeps_expired_rows_periodically_not_on_every_set(tmp_path, clock):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), max_entries=100, ttl=40, sweep_interval=60)
+    statements = []
+    cache._conn.set_trace_callback(statements.append)
+    cache.set("a", "A")
+    clock.now += 30
+    cache.set("b", "B")
+    assert not any("expires_at <" in sql for sql in statements)
+    assert not any("COUNT(*)" in sql for sql in statements)
+    # "a" expired long ago; the sweep after sweep_interval removes it
+    clock.now += 31
+    cache.set("c", "C")
+    assert sum("expires_at <" in sql for sql in statements) == 1
+    assert cache.stats()['entries'] == 2
+
+
+def test_sqlite_expiry_sweep_uses_an_index(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"))
+    plan = cache._conn.execute(
+        "EXPLAIN QUERY PLAN DELETE FROM responses WHERE expires_at < ?", (0,)
+    ).fetchall()
+    assert any("responses_expires" in str(row) for row in plan)
+
+
+def test_sqlite_row_count_is_tracked_incrementally(tmp_path, clock):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), max_entries=3, ttl=60)
+    for key in "abcab":
+        cache.set(key, key)
+        clock.now += 1
+    assert cache.stats()['entries'] == 3
+    cache.set("d", "d")
+    assert cache.stats()['entries'] == 3
+    assert cache._count_rows() == 3
+    # A second process opening the file sees the rows already there
+    assert SQLiteCache(cache.path).stats()['entries'] == 3
+
+
+def test_create_cache_backends(tmp_path):
+    assert isinstance(create_cache("memory"), MemoryCache)
+    assert isinstance(create_cache("sqlite", path=str(tmp_path / "c.sqlite3")), SQLiteCache)
+    assert create_cache("none") is None
+    assert create_cache(None) is None
+    with pytest.raises(ValueError):
+        create_cache("redis")
+
+
+def test_cache_key_includes_history_only_when_present():
+    history = [{'role': 'user', 'parts': ["hi"]}, {'role': 'model', 'parts': ["hello"]}]
+    assert make_cache_key("next", "m", history=[]) == make_cache_key("next", "m")
+    assert make_cache_key("next", "m", history=history) != make_cache_key("next", "m")
@@ -0,0 +1,111 @@
+"""Tests for camera start/stop"""
+import threading
+import time
+
+import numpy as np
+
+from jarvis.desktop.camera import camera_controller
+from jarvis.desktop.camera.camera_controller import CameraController
+
+
+class StallingCapture:
+    """Capture whose reads block until released, like a camera that stopped delivering"""
+    
+    def __init__(self, log):
+        self.log = log
+        self.unblock = threading.Event()
+        self.released = False
+    
+    def isOpened(self):
+        return True
+    
+    def set(self, prop, value):
+        return True
+    
+    def read(self, out=None):
+        self.log.append(("read", self))
+        self.unblock.wait()
+        return True, np.zeros((4, 4, 3), dtype=np.uint8)
+    
+    def release(self):
+        self.released = True
+        self.log.append(("release", self))
+
+
+def _controller(monkeypatch):
+    log = []
+    captures = []
+    
+    def open_source(source):
+        captures.append(StallingCapture(log))
+        return captures[-1]
+    
+    monkeypatch.setattr(camera_controller, "open_source", open_source)
+    monkeypatch.setattr(camera_controller, "_REOPEN_TIMEOUT", 0.05)
+    return CameraController(camera_index=0), captures, log
+
+
+def test_reopen_refused_while_old_capture_thread_is_reading(monkeypatch):
+    camera, captures, _ = _controller(monkeypatch)
+    assert camera.start_camera()[0]
+    camera.stop_camera()
+    
+    success, _ = camera.start_camera()
+    assert not success
+    assert len(captures) == 1
+    
+    captures[0].unblock.set()
+    assert camera.start_camera()[0]
+    assert len(captures) == 2
+    captures[1].unblock.set()
+    camera.stop_camera()
+
+
+def test_old_device_is_released_before_the_new_one_is_read(monkeypatch):
+    camera, captures, log = _controller(monkeypatch)
+    camera.start_camera()
+    threading.Timer(0.01, lambda: captures[0].unblock.set()).start()
+    camera.stop_camera()
+    monkeypatch.setattr(camera_controller, "_REOPEN_TIMEOUT", 2.0)
+    assert camera.start_camera()[0]
+    captures[1].unblock.set()
+    camera.stop_camera()
+    
+    assert captures[0].released
+    first_new_read = log.index(("read", captures[1]))
+    assert log.index(("release", captures[0])) < first_new_read
+
+
+class RecordingCapture(StallingCapture):
+    """Capture that records size changes and hands out frames as fast as it is read"""
+    
+    def __init__(self, log):
+        super().__init__(log)
+        self.sizes = []
+        self.unblock.set()
+    
+    def set(self, prop, value):
+        if prop == camera_controller.cv2.CAP_PROP_FRAME_WIDTH:
+            self.sizes.append(value)
+        return True
+
+
+def test_resolution_changes_during_capture_are_not_lost(monkeypatch):
+    captures = []
+    
+    def open_source(source):
+        captures.append(RecordingCapture([]))
+        return captures[-1]
+    
+    monkeypatch.setattr(camera_controller, "open_source", open_source)
+    camera = CameraController(camera_index=0)
+    assert camera.start_camera()[0]
+    for width in range(100, 600):
+        camera.set_resolution(width, width)
+    deadline = time.monotonic() + 2
+    while camera._requested_size is not None and time.monotonic() < deadline:
+        time.sleep(0.001)
+    camera.stop_camera()
+    
+    assert captures[0].sizes[-1] == 599
+    assert camera.resolution == (599, 599)
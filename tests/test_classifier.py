@@ -0,0 +1,72 @@
+"""Tests for the landmark gesture classifier"""
+import numpy as np
+import pytest
+
+from jarvis.desktop.motion.classifier import UNKNOWN, GestureClassifier
+
+
+@pytest.fixture
+def samples():
+    rng = np.random.default_rng(0)
+    points = rng.normal(size=(200, 21, 3)).astype(np.float32)
+    labels = np.array([f"gesture{i % 4}" for i in range(len(points))])
+    return points, labels
+
+
+@pytest.mark.parametrize("neighbors", [0, 3])
+@pytest.mark.parametrize("max_distance", [None, 0.5])
+def test_single_hand_matches_batch(samples, neighbors, max_distance):
+    points, labels = samples
+    classifier = GestureClassifier.train(points, labels, neighbors=neighbors, max_distance=max_distance)
+    names, confidence = classifier.predict(points)
+    for index, hand in enumerate(points):
+        name, hand_confidence = classifier.predict(hand)
+        assert name == [names[index]]
+        assert hand_confidence[0] == pytest.approx(confidence[index], abs=1e-4)
+
+
+@pytest.mark.parametrize("neighbors", [0, 3, 500])
+def test_predict_one_matches_the_batched_path(samples, neighbors):
+    points, labels = samples
+    classifier = GestureClassifier.train(points, labels, neighbors=neighbors)
+    # Includes hands far from every sample, which the batched path calls unknown
+    hands = np.concatenate([points[:50], points[:5] * 40 + 3])
+    names, confidence = classifier.predict(hands)
+    for index, hand in enumerate(hands):
+        name, hand_confidence = classifier._predict_one(hand)
+        assert name == [names[index]]
+        assert hand_confidence.shape == (1,)
+        assert hand_confidence[0] == pytest.approx(confidence[index], abs=1e-4)
+
+
+def test_predict_one_with_a_single_gesture(samples):
+    points, _ = samples
+    classifier = GestureClassifier.train(points[:10], np.array(["only"] * 10))
+    names, confidence = classifier.predict(points[:3])
+    for index, hand in enumerate(points[:3]):
+        name, hand_confidence = classifier._predict_one(hand)
+        assert name == [names[index]]
+        assert hand_confidence[0] == pytest.approx(confidence[index])
+
+
+def test_single_hand_does_not_modify_input(samples):
+    points, labels = samples
+    classifier = GestureClassifier.train(points, labels)
+    hand = points[0].copy()
+    classifier.predict(hand)
+    assert np.array_equal(hand, points[0])
+
+
+def test_far_hand_is_unknown(samples):
+    points, labels = samples
+    classifier = GestureClassifier.train(points, labels, max_distance=1e-3)
+    names, confidence = classifier.predict(points[0] * 50 + 7)
+    assert names == [UNKNOWN]
+    assert confidence[0] == 0.0
+
+
+def test_position_and_size_do_not_matter(samples):
+    points, labels = samples
+    classifier = GestureClassifier.train(points, labels)
+    moved = points[5] * 3.0 + np.array([0.2, -0.4, 0.1], dtype=np.float32)
+    assert classifier.predict(moved)[0] == classifier.predict(points[5])[0]
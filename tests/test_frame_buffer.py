@@ -0,0 +1,112 @@
+"""Tests for the latest-frame ring buffer"""
+import threading
+import time
+
+import numpy as np
+
+from jarvis.desktop.camera.frame_buffer import FrameRingBuffer
+
+
+def _write(buffer, value, shape=(4, 6, 3)):
+    buffer.write_slot(shape)[...] = value
+    buffer.publish()
+
+
+def test_empty_buffer_has_no_frame():
+    buffer = FrameRingBuffer(3)
+    frame, seq, timestamp = buffer.latest()
+    assert frame is None and seq == 0 and timestamp is None
+
+
+def test_latest_returns_newest_frame_once():
+    buffer = FrameRingBuffer(3)
+    for value in range(5):
+        _write(buffer, value)
+    frame, seq, _ = buffer.latest()
+    assert seq == 5
+    assert (frame == 4).all()
+    assert buffer.latest(after=seq)[0] is None
+
+
+def test_frames_replaced_before_being_read_count_as_dropped():
+    buffer = FrameRingBuffer(3)
+    _write(buffer, 1)
+    _write(buffer, 2)
+    _write(buffer, 3)
+    assert buffer.dropped == 2
+    buffer.latest()
+    _write(buffer, 4)
+    assert buffer.dropped == 2
+
+
+def test_copies_do_not_change_when_the_slot_is_reused():
+    buffer = FrameRingBuffer(2)
+    _write(buffer, 1)
+    frame, _, _ = buffer.latest()
+    for value in range(2, 6):
+        _write(buffer, value)
+    assert (frame == 1).all()
+
+
+def test_copies_into_a_preallocated_array():
+    buffer = FrameRingBuffer(3)
+    _write(buffer, 7)
+    out = np.zeros((4, 6, 3), dtype=np.uint8)
+    frame, _, _ = buffer.latest(out=out)
+    assert frame is out
+    assert (out == 7).all()
+    # A mismatched array is not written into
+    wrong = np.zeros((2, 2, 3), dtype=np.uint8)
+    frame, _, _ = buffer.latest(out=wrong)
+    assert frame is not wrong and frame.shape == (4, 6, 3)
+
+
+def test_resolution_change_reallocates_slots():
+    buffer = FrameRingBuffer(3)
+    _write(buffer, 1)
+    _write(buffer, 2, shape=(8, 10, 3))
+    frame, seq, _ = buffer.latest()
+    assert frame.shape == (8, 10, 3) and (frame == 2).all()
+    assert seq == 2
+
+
+def test_wait_times_out_without_a_new_frame():
+    buffer = FrameRingBuffer(3)
+    _write(buffer, 1)
+    _, seq, _ = buffer.latest()
+    started = time.monotonic()
+    frame, same_seq, _ = buffer.wait(after=seq, timeout=0.05)
+    assert frame is None and same_seq == seq
+    assert time.monotonic() - started >= 0.04
+
+
+def test_wait_wakes_on_publish():
+    buffer = FrameRingBuffer(3)
+    writer = threading.Timer(0.02, _write, args=(buffer, 9))
+    writer.start()
+    frame, seq, _ = buffer.wait(after=0, timeout=2)
+    writer.join()
+    assert seq == 1 and (frame == 9).all()
+
+
+def test_readers_never_see_a_torn_frame():
+    buffer = FrameRingBuffer(3)
+    stop = threading.Event()
+    
+    def writer():
+        value = 0
+        while not stop.is_set():
+            value = (value + 1) % 256
+            _write(buffer, value, shape=(64, 64, 3))
+    
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        seq = 0
+        for _ in range(500):
+            frame, seq, _ = buffer.wait(after=seq, timeout=1)
+            if frame is not None:
+                assert (frame == frame.flat[0]).all()
+    finally:
+        stop.set()
+        thread.join()
@@ -0,0 +1,91 @@
+"""Tests for the allocation-free camera frame display"""
+import numpy as np
+from PIL import Image
+
+from jarvis.desktop.gui import frame_display
+from jarvis.desktop.gui.frame_display import FrameDisplay
+
+
+class FakeLabel:
+    def __init__(self):
+        self.image = None
+    
+    def config(self, **options):
+        pass
+
+
+class FakePhotoImage:
+    """Stands in for ImageTk.PhotoImage, which needs a Tk display"""
+    
+    created = []
+    
+    def __init__(self, mode, size):
+        self.mode = mode
+        self.size = size
+        self.pasted = []
+        FakePhotoImage.created.append(self)
+    
+    def width(self):
+        return self.size[0]
+    
+    def height(self):
+        return self.size[1]
+    
+    def paste(self, image):
+        self.pasted.append(image)
+
+
+def _frame(width=8, height=6, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+def test_convert_reuses_one_rgba_buffer():
+    display = FrameDisplay(label=None)
+    first = display.convert(_frame(seed=1))
+    buffer = display._rgba
+    created = Image.core.get_stats()['new_count']
+    second = display.convert(_frame(seed=2))
+    assert second is first
+    assert display._rgba is buffer
+    assert Image.core.get_stats()['new_count'] == created
+    # What PhotoImage.paste() needs to skip its per-frame block and conversion
+    assert first.mode == "RGBA" and first.im.isblock()
+
+
+def test_convert_mirrors_and_keeps_pixels_opaque():
+    frame = _frame()
+    image = FrameDisplay(label=None).convert(frame)
+    pixels = np.asarray(image)
+    assert np.array_equal(pixels[..., :3], frame[:, ::-1, ::-1])
+    assert (pixels[..., 3] == 255).all()
+    
+    image = FrameDisplay(label=None, mirror=False).convert(frame)
+    assert np.array_equal(np.asarray(image)[..., :3], frame[..., ::-1])
+
+
+def test_buffers_are_rebuilt_only_when_the_size_changes():
+    display = FrameDisplay(label=None)
+    display.convert(_frame(8, 6))
+    buffer = display._rgba
+    display.convert(_frame(10, 6))
+    assert display._rgba is not buffer
+    assert display._rgba.shape == (6, 10, 4)
+
+
+def test_show_pastes_into_one_photo_image_of_the_same_mode(monkeypatch):
+    FakePhotoImage.created = []
+    monkeypatch.setattr(frame_display.ImageTk, "PhotoImage", FakePhotoImage)
+    display = FrameDisplay(FakeLabel())
+    for seed in range(3):
+        display.show(_frame(seed=seed))
+    
+    assert len(FakePhotoImage.created) == 1
+    photo = FakePhotoImage.created[0]
+    # Same mode as the pasted image, so Pillow does not convert each frame
+    assert photo.mode == "RGBA"
+    assert len(photo.pasted) == 3
+    assert all(image is photo.pasted[0] for image in photo.pasted)
+    assert photo.pasted[0].mode == photo.mode
+    
+    display.show(_frame(10, 6))
+    assert len(FakePhotoImage.created) == 2
@@ -0,0 +1,194 @@
+"""Tests for the Gemini client's caching and session handling, against a fake model"""
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from jarvis.api import gemini_client
+from jarvis.api.cache import MemoryCache
+from jarvis.api.rate_limiter import FairScheduler
+from jarvis.api.semantic_cache import SemanticCache
+from jarvis.api.sessions import SessionStore
+from jarvis.api.singleflight import SingleFlight
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeStream:
+    def __init__(self, parts):
+        self.parts = parts
+    
+    async def __aiter__(self):
+        for part in self.parts:
+            await asyncio.sleep(0)
+            yield FakeResponse(part)
+
+
+class FakeChat:
+    def __init__(self, model, history):
+        self.model = model
+        self.history = history
+    
+    async def send_message_async(self, prompt, stream=False):
+        return await self.model.reply(prompt, self.history, stream)
+
+
+class FakeModel:
+    """Answers "<prompt> after <n> turns" and counts upstream calls"""
+    
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+    
+    async def reply(self, prompt, history, stream):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        text = f"{prompt} after {len(history) // 2} turns"
+        return FakeStream(text.split(" ")) if stream else FakeResponse(text)
+    
+    async def generate_content_async(self, prompt, stream=False):
+        return await self.reply(prompt, [], stream)
+    
+    def start_chat(self, history):
+        return FakeChat(self, history)
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    fake = FakeModel()
+    monkeypatch.setattr(gemini_client, "model", fake)
+    monkeypatch.setattr(gemini_client, "GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(gemini_client, "response_cache", MemoryCache())
+    monkeypatch.setattr(gemini_client, "semantic_cache", None)
+    monkeypatch.setattr(gemini_client, "inflight", SingleFlight())
+    monkeypatch.setattr(gemini_client, "sessions", SessionStore())
+    monkeypatch.setattr(gemini_client, "scheduler", FairScheduler(0, 0))
+    return fake
+
+
+def test_first_chat_turn_shares_the_stateless_cache(fake_model):
+    assert gemini_client.process_prompt("what is python") == "what is python after 0 turns"
+    assert gemini_client.process_chat("What is Python", "s1") == "what is python after 0 turns"
+    assert list(gemini_client.stream_chat("WHAT IS PYTHON", "s2")) == ["what is python after 0 turns"]
+    assert fake_model.calls == 1
+    assert gemini_client.sessions.get("s1").turns == [("What is Python", "what is python after 0 turns")]
+
+
+def test_later_turns_are_cached_per_history(fake_model):
+    gemini_client.process_chat("hi", "a")
+    gemini_client.process_chat("hi", "b")
+    assert gemini_client.process_chat("and then", "a") == "and then after 1 turns"
+    # Same history and prompt: answered from the cache
+    assert gemini_client.process_chat("and then", "b") == "and then after 1 turns"
+    assert fake_model.calls == 2
+    # Different history: a new upstream call
+    gemini_client.process_chat("and then", "c")
+    assert fake_model.calls == 3
+
+
+def test_streamed_chat_turns_are_recorded_and_cached(fake_model):
+    assert "".join(gemini_client.stream_chat("tell me more", "s")) == "tellmemoreafter0turns"
+    session = gemini_client.sessions.get("s")
+    assert session.turns == [("tell me more", "tellmemoreafter0turns")]
+    assert gemini_client.process_prompt("tell me more") == "tellmemoreafter0turns"
+    assert fake_model.calls == 1
+
+
+def test_concurrent_first_turns_are_coalesced(fake_model):
+    fake_model.delay = 0.05
+    
+    async def main():
+        return await asyncio.gather(*(
+            gemini_client.process_chat_async("same question", f"session-{i}") for i in range(5)
+        ))
+    
+    results = gemini_client.run_async(main())
+    assert results == ["same question after 0 turns"] * 5
+    assert fake_model.calls == 1
+
+
+def test_failed_turn_is_not_recorded(fake_model, monkeypatch):
+    async def fail(prompt, stream=False):
+        raise ValueError("blocked")
+    
+    monkeypatch.setattr(fake_model, "generate_content_async", fail)
+    assert gemini_client.process_chat("hi", "s").startswith("An error occurred: blocked")
+    assert gemini_client.sessions.get("s").turns == []
+
+
+class RecordingCaller:
+    """Upstream caller that records each call's retry budget"""
+    
+    def __init__(self):
+        self.budgets = []
+    
+    async def call_async(self, fn, *args, max_attempts=None):
+        self.budgets.append(max_attempts)
+        await asyncio.sleep(0.05)
+        return FakeResponse("answer")
+
+
+def test_requests_only_join_leaders_with_the_same_retry_budget(fake_model, monkeypatch):
+    caller = RecordingCaller()
+    monkeypatch.setattr(gemini_client, "upstream", caller)
+    
+    async def main():
+        return await asyncio.gather(
+            gemini_client.generate_async("same question", "batch", max_attempts=1),
+            gemini_client.generate_async("same question", "batch", max_attempts=1),
+            gemini_client.generate_async("same question", "web"),
+            gemini_client.generate_async("same question", "web", max_attempts=gemini_client.GEMINI_RETRY_ATTEMPTS),
+        )
+    
+    assert gemini_client.run_async(main()) == ["answer"] * 4
+    assert sorted(caller.budgets, key=str) == [1, None]
+
+
+class ThreadRecordingCache(MemoryCache):
+    """Memory cache that reports blocking and records the threads it is used from"""
+    
+    blocking = True
+    
+    def __init__(self):
+        super().__init__()
+        self.threads = []
+    
+    def get(self, key):
+        self.threads.append(threading.current_thread())
+        return super().get(key)
+    
+    def set(self, key, value):
+        self.threads.append(threading.current_thread())
+        super().set(key, value)
+
+
+def test_blocking_cache_is_used_off_the_event_loop(fake_model, monkeypatch):
+    cache = ThreadRecordingCache()
+    monkeypatch.setattr(gemini_client, "response_cache", cache)
+    gemini_client.process_prompt("question")
+    assert "".join(gemini_client.stream_prompt("another")) == "anotherafter0turns"
+    loop_thread = gemini_client.run_async(_current_thread())
+    assert len(cache.threads) == 4
+    assert loop_thread not in cache.threads
+
+
+async def _current_thread():
+    return threading.current_thread()
+
+
+def test_semantic_lookups_run_off_the_event_loop(fake_model, monkeypatch):
+    threads = []
+    
+    def embed(text):
+        threads.append(threading.current_thread())
+        return np.array([1.0, 0.0], dtype=np.float32)
+    
+    monkeypatch.setattr(gemini_client, "semantic_cache", SemanticCache(embed, dim=2))
+    gemini_client.process_prompt("first question")
+    loop_thread = gemini_client.run_async(_current_thread())
+    assert len(threads) == 2
+    assert loop_thread not in threads
@@ -0,0 +1,149 @@
+"""Tests for the background image writer and burst captures"""
+import os
+import threading
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from jarvis.desktop.image_writer import CaptureResult, ImageWriter
+
+
+def frame(value=0):
+    return np.full((8, 8, 3), value, dtype=np.uint8)
+
+
+@pytest.fixture
+def writer(tmp_path):
+    writer = ImageWriter(directory=str(tmp_path), workers=2)
+    yield writer
+    writer.shutdown()
+
+
+def test_submit_writes_file(writer, tmp_path):
+    result = writer.submit(frame(100), "picture", "png", name="one")
+    assert result.wait(5)
+    assert result.filename == "picture_one.png"
+    assert os.path.exists(result.path)
+    assert result.data is None
+    decoded = cv2.imread(result.path)
+    assert decoded.shape == (8, 8, 3)
+    assert writer.stats()['saved'] == 1
+    assert writer.stats()['failed'] == 0
+
+
+def test_submit_keep_holds_encoded_bytes(writer):
+    result = writer.submit(frame(), "picture", "jpg", keep=True)
+    assert result.wait(5)
+    assert os.path.exists(result.path)
+    assert result.data.startswith(b"\xff\xd8")
+    assert result.as_part() == {'mime_type': "image/jpeg", 'data': result.data}
+
+
+def test_submit_without_save_keeps_data_only(writer, tmp_path):
+    result = writer.submit(frame(), "screenshot", "png", save=False)
+    assert result.wait(5)
+    assert result.path is None
+    assert result.filename is None
+    assert result.data.startswith(b"\x89PNG")
+    assert os.listdir(tmp_path) == []
+
+
+def test_submit_converts_pil_rgb_to_bgr(writer):
+    image = Image.new("RGBA", (4, 4), (255, 0, 0, 255))
+    result = writer.submit(image, "screenshot", "png", name="red")
+    assert result.wait(5)
+    # Red in RGB must land in the last (red) channel of OpenCV's BGR
+    assert cv2.imread(result.path)[0, 0].tolist() == [0, 0, 255]
+
+
+def test_encode_failure_reports_error(writer):
+    calls = []
+    result = writer.submit(frame(), "picture", "nope", on_done=calls.append)
+    assert not result.wait(5)
+    assert result.done()
+    assert result.error
+    assert result.as_part() is None
+    assert calls == [result]
+    assert writer.stats()['failed'] == 1
+    assert writer.stats()['saved'] == 0
+
+
+def test_write_failure_reports_error(tmp_path):
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    writer = ImageWriter(directory=str(blocker / "images"), workers=1)
+    try:
+        result = writer.submit(frame(), "picture", "png")
+        assert not result.wait(5)
+        assert result.error
+        assert writer.stats()['failed'] == 1
+    finally:
+        writer.shutdown()
+
+
+def test_on_done_runs_after_success(writer):
+    finished = threading.Event()
+    seen = []
+    
+    def on_done(result):
+        seen.append(result.wait(0))
+        finished.set()
+    
+    result = writer.submit(frame(), "picture", "png", on_done=on_done)
+    assert finished.wait(5)
+    assert seen == [True]
+    assert result.done()
+
+
+def test_submit_after_shutdown_fails(writer):
+    writer.shutdown()
+    result = writer.submit(frame(), "picture", "png")
+    assert result.done()
+    assert not result.wait(0)
+    assert result.error
+    assert writer.stats()['failed'] == 1
+
+
+def test_mime_type_defaults_for_unknown_format():
+    assert CaptureResult("x.png", "png").mime_type == "image/png"
+    assert CaptureResult("x.bin", "bin").mime_type == "application/octet-stream"
+
+
+def test_burst_results_in_order(writer):
+    values = iter([10, 20, 30])
+    results = writer.burst(lambda: frame(next(values)), "picture", count=3, interval=0.01)
+    assert len(results) == 3
+    assert all(result.wait(5) for result in results)
+    stems = [os.path.splitext(result.filename)[0] for result in results]
+    assert [stem[-3:] for stem in stems] == ["_01", "_02", "_03"]
+    assert len({stem[:-3] for stem in stems}) == 1
+    assert [int(cv2.imread(result.path)[0, 0, 0]) for result in results] == [10, 20, 30]
+
+
+def test_burst_missing_frame_fails_only_that_shot(writer):
+    images = iter([frame(), None, frame()])
+    results = writer.burst(lambda: next(images), "picture", count=3, interval=0)
+    assert [result.wait(5) for result in results] == [True, False, True]
+    assert results[1].error == "No image available"
+    assert not os.path.exists(results[1].path)
+    assert writer.stats()['saved'] == 2
+    assert writer.stats()['failed'] == 1
+
+
+def test_burst_grab_exception_fails_only_that_shot(writer):
+    calls = []
+    
+    def grab():
+        calls.append(None)
+        if len(calls) == 2:
+            raise OSError("camera gone")
+        return frame()
+    
+    results = writer.burst(grab, "picture", count=3, interval=0, keep=True)
+    assert [result.wait(5) for result in results] == [True, False, True]
+    assert results[1].error == "camera gone"
+    assert results[1].as_part() is None
+    assert results[2].as_part()['mime_type'] == "image/png"
+    assert writer.stats()['failed'] == 1
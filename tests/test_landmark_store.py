@@ -0,0 +1,129 @@
+"""Tests for recording landmarks to column files and replaying them"""
+import json
+import os
+
+import numpy as np
+import pytest
+
+from jarvis.desktop.motion.landmark_store import (
+    LandmarkRecording, LandmarkWriter, classify_recording
+)
+
+
+def _hands(count, seed=0):
+    return np.random.default_rng(seed).random((count, 21, 3), dtype=np.float32)
+
+
+class CountingRecognizer:
+    """Labels each hand by its wrist x coordinate and records batch sizes"""
+    
+    def __init__(self):
+        self.batches = []
+    
+    def recognize_gestures(self, points):
+        self.batches.append(len(points))
+        return [f"x{point[0, 0]:.2f}" for point in points]
+
+
+def test_round_trip_pads_missing_hands_with_nan(tmp_path):
+    path = str(tmp_path / "rec")
+    two = _hands(2, seed=1)
+    three = _hands(3, seed=2)
+    with LandmarkWriter(path, max_hands=2, pose=True, dtype="float32") as writer:
+        writer.append(0.0, None)
+        writer.append(0.1, two[:1], pose=np.ones((33, 4), dtype=np.float32))
+        writer.append(0.2, two)
+        writer.append(0.3, three)
+    
+    recording = LandmarkRecording(path)
+    assert len(recording) == 4
+    assert isinstance(recording.hands, np.memmap)
+    assert recording.timestamps.tolist() == [0.0, 0.1, 0.2, 0.3]
+    # Extra hands beyond max_hands are dropped
+    assert recording.hand_count.tolist() == [0, 1, 2, 2]
+    assert np.isnan(recording.hands[0]).all()
+    assert np.array_equal(recording.hands[1, 0], two[0])
+    assert np.isnan(recording.hands[1, 1]).all()
+    assert np.array_equal(recording.hands[2], two)
+    assert np.array_equal(recording.hands[3], three[:2])
+    assert np.isnan(recording.pose[0]).all() and (recording.pose[1] == 1).all()
+    assert recording.duration() == pytest.approx(0.3)
+
+
+def test_rows_reach_disk_a_chunk_at_a_time(tmp_path):
+    path = str(tmp_path / "rec")
+    writer = LandmarkWriter(path, chunk_size=4)
+    for index in range(3):
+        writer.append(index / 30, _hands(1, seed=index))
+    assert len(LandmarkRecording(path)) == 0
+    
+    writer.append(3 / 30, _hands(1, seed=3))
+    assert len(LandmarkRecording(path)) == 4
+    writer.append(4 / 30, None)
+    assert len(LandmarkRecording(path)) == 4
+    
+    writer.close()
+    recording = LandmarkRecording(path)
+    assert len(recording) == 5
+    assert writer.frames == 5
+    assert recording.hand_count.tolist() == [1, 1, 1, 1, 0]
+
+
+def test_truncated_last_row_is_ignored(tmp_path):
+    path = str(tmp_path / "rec")
+    with LandmarkWriter(path) as writer:
+        for index in range(3):
+            writer.append(index / 30, _hands(1, seed=index))
+    # A crash mid-write leaves part of the last hands row on disk
+    hands_file = os.path.join(path, "hands.bin")
+    with open(hands_file, "r+b") as f:
+        f.truncate(os.path.getsize(hands_file) - 10)
+    
+    recording = LandmarkRecording(path)
+    assert len(recording) == 2
+    assert recording.timestamps.shape == (2,)
+    indices, points = recording.first_hands()
+    assert indices.tolist() == [0, 1]
+    assert points.dtype == np.float32
+
+
+def test_empty_recording(tmp_path):
+    path = str(tmp_path / "rec")
+    LandmarkWriter(path).close()
+    
+    recording = LandmarkRecording(path)
+    assert len(recording) == 0
+    assert recording.hands.shape == (0, 2, 21, 3)
+    assert recording.duration() == 0.0
+    recognizer = CountingRecognizer()
+    assert len(classify_recording(recording, recognizer)) == 0
+    assert recognizer.batches == []
+
+
+def test_unknown_format_version_is_rejected(tmp_path):
+    path = str(tmp_path / "rec")
+    LandmarkWriter(path).close()
+    meta_file = os.path.join(path, "meta.json")
+    with open(meta_file) as f:
+        meta = json.load(f)
+    meta['version'] += 1
+    with open(meta_file, "w") as f:
+        json.dump(meta, f)
+    
+    with pytest.raises(ValueError, match="format version"):
+        LandmarkRecording(path)
+
+
+def test_classify_recording_batches_frames_with_hands(tmp_path):
+    path = str(tmp_path / "rec")
+    hands = _hands(5, seed=4)
+    with LandmarkWriter(path, dtype="float32") as writer:
+        for index in range(5):
+            writer.append(index / 30, hands[index:index + 1] if index != 2 else None)
+    
+    recognizer = CountingRecognizer()
+    labels = classify_recording(LandmarkRecording(path), recognizer, chunk_size=3)
+    assert labels[2] == "None"
+    assert labels[4] == f"x{hands[4, 0, 0]:.2f}"
+    # Frames 0-2 hold two hands, frames 3-4 hold two more
+    assert recognizer.batches == [2, 2]
@@ -0,0 +1,108 @@
+"""Tests for the threaded gesture pipeline"""
+import threading
+import time
+
+import numpy as np
+
+from jarvis.desktop.motion import pipeline as pipeline_module
+from jarvis.desktop.motion.pipeline import DropQueue, GesturePipeline
+
+
+class FakeCamera:
+    """Delivers a new blank frame every few milliseconds"""
+    
+    def __init__(self, interval=0.002):
+        self.interval = interval
+        self.seq = 0
+    
+    def wait_for_frame(self, after=0, timeout=0.1, out=None):
+        time.sleep(self.interval)
+        self.seq += 1
+        return np.zeros((48, 64, 3), dtype=np.uint8), self.seq, time.monotonic()
+
+
+class GatedRecognizer:
+    """Finds no hands, but only once the gate is open"""
+    
+    tracks_hands = True
+    
+    def __init__(self):
+        self.gate = threading.Event()
+        self.gate.set()
+        self.calls = 0
+    
+    def detect_hands(self, rgb_frame):
+        self.calls += 1
+        self.gate.wait()
+        return []
+
+
+def _wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+
+def test_drop_queue_keeps_the_newest_items():
+    queue = DropQueue(maxsize=2)
+    for item in range(5):
+        queue.put(item)
+    assert queue.dropped == 3
+    assert [queue.get(0), queue.get(0)] == [3, 4]
+    assert queue.get(0.01) is None
+
+
+def test_slow_inference_only_sees_the_newest_frames():
+    recognizer = GatedRecognizer()
+    pipeline = GesturePipeline(FakeCamera(), recognizer, queue_size=1)
+    inferred = []
+    infer = pipeline.stages[1].fn
+    pipeline.stages[1].fn = lambda result: inferred.append(result.seq) or infer(result)
+    
+    recognizer.gate.clear()
+    assert pipeline.start()
+    assert _wait_until(lambda: pipeline.get_stats()['dropped']['inference'] >= 5)
+    recognizer.gate.set()
+    assert _wait_until(lambda: len(inferred) >= 3)
+    assert pipeline.stop()
+    
+    # The frame stuck in inference was followed by the newest queued one, not the next in line
+    assert inferred == sorted(inferred)
+    assert inferred[1] - inferred[0] > 5
+
+
+def test_stop_joins_every_stage_in_order():
+    pipeline = GesturePipeline(FakeCamera(), GatedRecognizer())
+    order = []
+    for stage in pipeline.stages:
+        join = stage.join
+        stage.join = lambda timeout=None, stage=stage, join=join: order.append(stage.name) or join(timeout)
+    
+    assert pipeline.start()
+    assert _wait_until(lambda: pipeline.stages[-1].processed > 0)
+    order.clear()
+    assert pipeline.stop()
+    assert order == ["preprocess", "inference", "classify"]
+    assert not pipeline.is_running()
+    assert all(stage._thread is None for stage in pipeline.stages)
+
+
+def test_restart_waits_for_a_stage_that_outlived_stop(monkeypatch):
+    monkeypatch.setattr(pipeline_module, "_RESTART_TIMEOUT", 0.05)
+    recognizer = GatedRecognizer()
+    pipeline = GesturePipeline(FakeCamera(), recognizer)
+    recognizer.gate.clear()
+    assert pipeline.start()
+    assert _wait_until(lambda: recognizer.calls > 0)
+    
+    assert not pipeline.stop(timeout=0.05)
+    inference = pipeline.stages[1]
+    assert inference._thread is not None and inference._thread.is_alive()
+    # A second inference thread would share the recognizer with the stuck one
+    assert not pipeline.start()
+    assert not pipeline.is_running()
+    
+    recognizer.gate.set()
+    assert pipeline.start()
+    assert pipeline.stop()
@@ -0,0 +1,101 @@
+"""Tests for the pre-roll buffer"""
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from jarvis.desktop.camera.preroll import PrerollBuffer, parse_duration
+
+
+def _frame(value, size=10):
+    return np.full((size, size, 3), value, dtype=np.uint8)
+
+
+def _fill(buffer, count, fps=30.0, start=0.0):
+    for index in range(count):
+        buffer.add(_frame(index % 256), start + index / fps)
+
+
+@pytest.mark.parametrize("command, seconds", [
+    ("save last 30 seconds", 30),
+    ("Save the last 2 minutes", 120),
+    ("save the last 1 minute of video", 60),
+    ("save clip", None),
+    ("save last few seconds", None),
+])
+def test_parse_duration(command, seconds):
+    assert parse_duration(command) == seconds
+
+
+def test_raw_frames_stay_under_the_byte_cap():
+    # Room for three 300-byte frames
+    buffer = PrerollBuffer(seconds=60, memory_mb=0.001, jpeg_quality=0, fps=30)
+    _fill(buffer, 20)
+    stats = buffer.stats()
+    assert stats['frames'] == 3
+    assert buffer._bytes == 900
+    assert stats['frames_evicted'] == 17
+    # The newest frames are the ones kept
+    assert [int(data[0, 0, 0]) for _, data in buffer._frames] == [17, 18, 19]
+
+
+def test_jpeg_frames_stay_under_the_byte_cap():
+    buffer = PrerollBuffer(seconds=60, memory_mb=0.02, jpeg_quality=80, fps=30)
+    rng = np.random.default_rng(0)
+    for index in range(50):
+        buffer.add(rng.integers(0, 256, (64, 64, 3), dtype=np.uint8), index / 30)
+    assert 0 < buffer._bytes <= buffer.memory_bytes
+    assert buffer._bytes == sum(data.nbytes for _, data in buffer._frames)
+    assert buffer.stats()['frames_evicted'] > 0
+
+
+def test_frames_older_than_the_window_are_evicted():
+    buffer = PrerollBuffer(seconds=1.0, memory_mb=64, jpeg_quality=0, fps=10)
+    _fill(buffer, 50, fps=10)
+    assert buffer.buffered_seconds() <= 1.0
+    assert buffer.stats()['frames'] in (10, 11)
+
+
+def test_frames_faster_than_fps_are_skipped():
+    buffer = PrerollBuffer(seconds=10, memory_mb=64, jpeg_quality=0, fps=10)
+    kept = [buffer.add(_frame(0), index / 30) for index in range(30)]
+    assert sum(kept) == 10
+
+
+def test_disabled_buffer_keeps_nothing():
+    buffer = PrerollBuffer(seconds=0, memory_mb=64)
+    assert not buffer.add(_frame(0), 0.0)
+    assert buffer.save() == (False, "Nothing buffered to save")
+
+
+def test_raw_slots_are_not_recycled_while_a_save_holds_them(tmp_path):
+    buffer = PrerollBuffer(seconds=60, memory_mb=0.001, jpeg_quality=0, fps=30,
+                           directory=str(tmp_path))
+    _fill(buffer, 3)
+    buffer._saving += 1
+    clip = list(buffer._frames)
+    _fill(buffer, 3, start=1.0)
+    assert [int(data[0, 0, 0]) for _, data in clip] == [0, 1, 2]
+    buffer._saving -= 1
+
+
+def test_save_writes_the_clip_in_the_background(tmp_path):
+    buffer = PrerollBuffer(seconds=5, memory_mb=64, jpeg_quality=80, fps=10,
+                           directory=str(tmp_path))
+    done = threading.Event()
+    outcome = []
+    
+    def on_saved(success, msg):
+        outcome.append((success, msg))
+        done.set()
+    
+    buffer.on_saved = on_saved
+    for index in range(20):
+        buffer.add(_frame(index * 10, size=32), index / 10)
+    success, _ = buffer.save(seconds=1)
+    assert success
+    assert done.wait(10)
+    assert outcome[0][0], outcome[0][1]
+    files = os.listdir(tmp_path)
+    assert len(files) == 1 and os.path.getsize(tmp_path / files[0]) > 0
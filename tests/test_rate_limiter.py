@@ -0,0 +1,122 @@
+"""Tests for quota scheduling"""
+import asyncio
+import time
+
+import pytest
+
+from jarvis.api.rate_limiter import FairScheduler, QueueTimeoutError, TokenBucket
+
+
+def test_token_bucket_refills_over_time():
+    bucket = TokenBucket(per_minute=60)
+    now = time.monotonic()
+    assert bucket.wait_time(60, now) == 0
+    bucket.take(60)
+    assert bucket.wait_time(1, now) == pytest.approx(1.0, abs=0.01)
+    assert bucket.wait_time(1, now + 1.0) == 0
+    bucket.give(100)
+    assert bucket.level <= bucket.capacity
+
+
+def test_zero_rate_is_unlimited():
+    bucket = TokenBucket(per_minute=0)
+    assert bucket.wait_time(10 ** 9, time.monotonic()) == 0
+
+
+def test_users_are_admitted_round_robin():
+    # One request every 10 ms, none in reserve
+    scheduler = FairScheduler(requests_per_minute=6000, tokens_per_minute=0, max_wait=5)
+    scheduler.requests.take(scheduler.requests.capacity)
+    order = []
+    
+    async def request(user, index):
+        await scheduler.acquire_async(user, 1)
+        order.append(f"{user}{index}")
+    
+    async def main():
+        tasks = [asyncio.ensure_future(request("a", i)) for i in range(4)]
+        tasks += [asyncio.ensure_future(request("b", i)) for i in range(2)]
+        await asyncio.gather(*tasks)
+    
+    asyncio.run(main())
+    assert order == ["a0", "b0", "a1", "b1", "a2", "a3"]
+    assert scheduler.stats()['admitted'] == 6
+    assert scheduler.stats()['queue_depth'] == 0
+
+
+def test_waiting_uses_no_threads():
+    import threading
+    scheduler = FairScheduler(requests_per_minute=600, tokens_per_minute=0, max_wait=5)
+    scheduler.requests.take(scheduler.requests.capacity)
+    before = threading.active_count()
+    
+    async def main():
+        waiters = [asyncio.ensure_future(scheduler.acquire_async(f"u{i}", 1)) for i in range(50)]
+        await asyncio.sleep(0.05)
+        assert threading.active_count() == before
+        assert scheduler.stats()['queue_depth'] > 40
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+    
+    asyncio.run(main())
+    assert scheduler.stats()['queue_depth'] == 0
+
+
+def test_wait_times_out():
+    scheduler = FairScheduler(requests_per_minute=1, tokens_per_minute=0, max_wait=0.05)
+    scheduler.requests.take(1)
+    
+    async def main():
+        with pytest.raises(QueueTimeoutError):
+            await scheduler.acquire_async("a", 1)
+    
+    started = time.monotonic()
+    asyncio.run(main())
+    assert time.monotonic() - started < 1
+    stats = scheduler.stats()
+    assert stats['timed_out'] == 1
+    assert stats['queue_depth'] == 0
+
+
+def test_tokens_budget_limits_admission():
+    scheduler = FairScheduler(requests_per_minute=0, tokens_per_minute=60000, max_wait=5)
+    
+    async def main():
+        await scheduler.acquire_async("a", 60000)
+        started = time.monotonic()
+        # 1000 tokens/s: a 50-token request has to wait about 50 ms
+        await scheduler.acquire_async("a", 50)
+        return time.monotonic() - started
+    
+    assert 0.03 < asyncio.run(main()) < 0.5
+
+
+def test_cancelled_waiter_leaves_the_queue_without_using_quota():
+    scheduler = FairScheduler(requests_per_minute=600, tokens_per_minute=0, max_wait=5)
+    scheduler.requests.take(scheduler.requests.capacity)
+    
+    async def main():
+        cancelled = asyncio.ensure_future(scheduler.acquire_async("a", 1))
+        waiting = asyncio.ensure_future(scheduler.acquire_async("b", 1))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.gather(cancelled, return_exceptions=True)
+        started = time.monotonic()
+        await waiting
+        return time.monotonic() - started
+    
+    # b gets the first refilled request (100 ms) instead of waiting behind a
+    assert asyncio.run(main()) < 0.15
+    stats = scheduler.stats()
+    assert stats['admitted'] == 1
+    assert stats['cancelled'] == 1
+
+
+def test_split_divides_the_quota_between_processes():
+    scheduler = FairScheduler(requests_per_minute=60, tokens_per_minute=1200)
+    scheduler.split(4)
+    assert scheduler.requests.capacity == 15
+    assert scheduler.tokens.rate == pytest.approx(5.0)
+    scheduler.split(1)
+    assert scheduler.requests.capacity == 60
@@ -0,0 +1,248 @@
+"""Tests for upstream retries and circuit breaking"""
+import asyncio
+
+import pytest
+
+from jarvis.api import resilience
+from jarvis.api.resilience import CircuitBreaker, CircuitOpenError, ResilientCaller, is_retryable
+
+
+class Unavailable(Exception):
+    code = 503
+
+
+class FakeMonotonic:
+    def __init__(self):
+        self.now = 100.0
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeMonotonic()
+    monkeypatch.setattr(resilience.time, "monotonic", fake)
+    monkeypatch.setattr(resilience.time, "sleep", lambda seconds: None)
+    return fake
+
+
+@pytest.fixture
+def no_async_sleep(monkeypatch):
+    async def instant(seconds):
+        pass
+    monkeypatch.setattr(resilience.asyncio, "sleep", instant)
+
+
+def flaky(failures, error=Unavailable):
+    """A callable that fails `failures` times, then returns "ok" """
+    calls = []
+    
+    def fn():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise error("boom")
+        return "ok"
+    fn.calls = calls
+    return fn
+
+
+def test_is_retryable():
+    assert is_retryable(Unavailable())
+    assert is_retryable(ConnectionError())
+    assert not is_retryable(ValueError())
+    assert not is_retryable(CircuitOpenError())
+
+
+def test_breaker_opens_after_threshold_and_rejects(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    for _ in range(3):
+        breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+    assert breaker.stats()['rejected'] == 1
+
+
+def test_breaker_half_open_allows_one_probe(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.allow()
+
+
+def test_failed_probe_reopens_the_circuit(clock):
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30)
+    for _ in range(5):
+        breaker.record_failure()
+    clock.now += 31
+    breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+
+
+def test_lost_probe_is_replaced_after_cool_down(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    breaker.allow()
+    clock.now += 30
+    breaker.allow()
+
+
+def test_call_retries_transient_errors(clock):
+    caller = ResilientCaller(max_attempts=3)
+    fn = flaky(2)
+    assert caller.call(fn) == "ok"
+    assert len(fn.calls) == 3
+    assert caller.retries == 2
+    assert caller.breaker.state == CircuitBreaker.CLOSED
+    assert caller.stats()['upstream_latency']['count'] == 3
+
+
+def test_call_gives_up_after_max_attempts(clock):
+    caller = ResilientCaller(max_attempts=3, breaker=CircuitBreaker(failure_threshold=10))
+    fn = flaky(5)
+    with pytest.raises(Unavailable):
+        caller.call(fn)
+    assert len(fn.calls) == 3
+    assert caller.breaker.failures == 3
+
+
+def test_client_errors_are_not_retried_and_keep_the_circuit_closed(clock):
+    caller = ResilientCaller(max_attempts=3, breaker=CircuitBreaker(failure_threshold=1))
+    fn = flaky(1, ValueError)
+    with pytest.raises(ValueError):
+        caller.call(fn)
+    assert len(fn.calls) == 1
+    assert caller.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_client_error_during_half_open_does_not_close_the_circuit(clock):
+    caller = ResilientCaller(max_attempts=3, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=30))
+    caller.breaker.record_failure()
+    clock.now += 30
+    with pytest.raises(ValueError):
+        caller.call(flaky(1, ValueError))
+    assert caller.breaker.state == CircuitBreaker.HALF_OPEN
+    assert caller.breaker.failures == 1
+    # The probe slot is free again for the next request
+    assert caller.call(flaky(0)) == "ok"
+    assert caller.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_client_errors_do_not_reset_the_failure_count(clock):
+    caller = ResilientCaller(max_attempts=1, breaker=CircuitBreaker(failure_threshold=2))
+    with pytest.raises(Unavailable):
+        caller.call(flaky(1))
+    with pytest.raises(ValueError):
+        caller.call(flaky(1, ValueError))
+    with pytest.raises(Unavailable):
+        caller.call(flaky(1))
+    assert caller.breaker.state == CircuitBreaker.OPEN
+
+
+def test_retries_stop_at_the_deadline(clock, monkeypatch):
+    caller = ResilientCaller(max_attempts=10, base_delay=1, max_delay=1, deadline=2.5)
+    monkeypatch.setattr(resilience.random, "uniform", lambda low, high: high)
+    monkeypatch.setattr(resilience.time, "sleep", lambda seconds: setattr(clock, "now", clock.now + seconds))
+    fn = flaky(10)
+    with pytest.raises(Unavailable):
+        caller.call(fn)
+    assert len(fn.calls) == 3
+
+
+def test_open_circuit_fails_fast(clock):
+    caller = ResilientCaller(max_attempts=3, breaker=CircuitBreaker(failure_threshold=2))
+    # The second failure opens the circuit, so the third attempt is refused
+    with pytest.raises(CircuitOpenError):
+        caller.call(flaky(5))
+    fn = flaky(0)
+    with pytest.raises(CircuitOpenError):
+        caller.call(fn)
+    assert fn.calls == []
+
+
+def test_call_async_max_attempts_override(clock, no_async_sleep):
+    caller = ResilientCaller(max_attempts=3, breaker=CircuitBreaker(failure_threshold=10))
+    fn = flaky(5)
+    
+    async def attempt():
+        return fn()
+    
+    with pytest.raises(Unavailable):
+        asyncio.run(caller.call_async(attempt, max_attempts=1))
+    assert len(fn.calls) == 1
+
+
+class FakeStream:
+    def __init__(self, parts, fail_after=None):
+        self.parts = parts
+        self.fail_after = fail_after
+    
+    async def __aiter__(self):
+        for index, part in enumerate(self.parts):
+            if index == self.fail_after:
+                raise Unavailable("stream reset")
+            yield part
+
+
+def collect(caller, opener):
+    async def run():
+        return [chunk async for chunk in caller.stream_async(opener)]
+    return asyncio.run(run())
+
+
+def test_stream_records_full_stream_latency_separately(clock):
+    caller = ResilientCaller()
+    
+    async def opener():
+        return FakeStream(["a", "b"])
+    
+    assert collect(caller, opener) == ["a", "b"]
+    stats = caller.stats()
+    assert stats['stream_latency']['count'] == 1
+    assert stats['first_chunk_latency']['count'] == 1
+    assert stats['upstream_latency']['count'] == 0
+
+
+def test_mid_stream_failure_reaches_the_breaker_and_is_not_retried(clock, no_async_sleep):
+    caller = ResilientCaller(max_attempts=3, breaker=CircuitBreaker(failure_threshold=1))
+    opened = []
+    
+    async def opener():
+        opened.append(1)
+        return FakeStream(["a", "b", "c"], fail_after=1)
+    
+    received = []
+    with pytest.raises(Unavailable):
+        async def run():
+            async for chunk in caller.stream_async(opener):
+                received.append(chunk)
+        asyncio.run(run())
+    assert received == ["a"]
+    assert opened == [1]
+    assert caller.stream_failures == 1
+    assert caller.breaker.state == CircuitBreaker.OPEN
+
+
+def test_failure_before_first_chunk_is_retried(clock, no_async_sleep):
+    caller = ResilientCaller(max_attempts=3)
+    opened = []
+    
+    async def opener():
+        opened.append(1)
+        return FakeStream(["a", "b"], fail_after=0 if len(opened) == 1 else None)
+    
+    assert collect(caller, opener) == ["a", "b"]
+    assert len(opened) == 2
+    assert caller.stream_failures == 0
@@ -0,0 +1,121 @@
+"""Tests for hand region-of-interest tracking"""
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+
+from jarvis.desktop.motion.pipeline import FrameResult, GesturePipeline
+from jarvis.desktop.motion.roi import FULL_FRAME, HandRoiTracker
+
+
+def _hand(x0, y0, x1, y1):
+    """Fake NormalizedLandmarkList spanning a box"""
+    xs = np.linspace(x0, x1, 21)
+    ys = np.linspace(y0, y1, 21)
+    return SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, z=0.0) for x, y in zip(xs, ys)])
+
+
+def _frame(width=640, height=480):
+    return np.zeros((height, width, 3), dtype=np.uint8)
+
+
+def test_crops_around_the_tracked_hand():
+    tracker = HandRoiTracker(detect_width=320, roi_size=96, margin=0.25, full_interval=10)
+    image, region = tracker.crop(_frame())
+    assert region == FULL_FRAME
+    assert max(image.shape[:2]) == 320
+    
+    tracker.track([_hand(0.4, 0.4, 0.5, 0.5)], region)
+    image, region = tracker.crop(_frame())
+    assert region != FULL_FRAME
+    x0, y0, x1, y1 = region
+    assert x0 < 0.4 and y0 < 0.4 and x1 > 0.5 and y1 > 0.5
+    assert max(image.shape[:2]) <= 96
+
+
+def test_landmarks_are_mapped_back_to_the_whole_frame():
+    tracker = HandRoiTracker()
+    region = (0.5, 0.25, 0.75, 0.75)
+    hands = tracker.track([_hand(0.0, 0.0, 1.0, 1.0)], region)
+    assert hands[0].landmark[0].x == 0.5 and hands[0].landmark[0].y == 0.25
+    assert hands[0].landmark[-1].x == 0.75 and hands[0].landmark[-1].y == 0.75
+    assert tracker.bbox == (0.5, 0.25, 0.75, 0.75)
+
+
+def test_whole_frame_is_searched_periodically_and_after_a_miss():
+    tracker = HandRoiTracker(full_interval=3)
+    tracker.track([_hand(0.4, 0.4, 0.5, 0.5)], FULL_FRAME)
+    regions = [tracker.crop(_frame())[1] for _ in range(4)]
+    assert FULL_FRAME not in regions[:3]
+    assert regions[3] == FULL_FRAME
+    
+    tracker.track([_hand(0.4, 0.4, 0.5, 0.5)], FULL_FRAME)
+    _, region = tracker.crop(_frame())
+    tracker.track([], region)
+    assert tracker.crop(_frame())[1] == FULL_FRAME
+    assert tracker.stats()['roi_misses'] == 1
+
+
+def test_concurrent_crop_and_track_keep_counters_consistent():
+    tracker = HandRoiTracker(full_interval=5)
+    frame = _frame()
+    rounds = 2000
+    
+    def preprocess():
+        for _ in range(rounds):
+            tracker.crop(frame)
+    
+    def infer():
+        for index in range(rounds):
+            tracker.track([_hand(0.3, 0.3, 0.6, 0.6)] if index % 7 else [], FULL_FRAME)
+    
+    threads = [threading.Thread(target=preprocess), threading.Thread(target=infer)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = tracker.stats()
+    assert stats['full_detections'] + stats['roi_detections'] == rounds
+
+
+class RecordingRecognizer:
+    """Stands in for GestureRecognizer and records the size of every image it is given"""
+    
+    def __init__(self, results, tracks_hands):
+        self.tracks_hands = tracks_hands
+        self.shapes = []
+        self.results = list(results)
+    
+    def detect_hands(self, rgb_frame):
+        self.shapes.append(rgb_frame.shape[:2])
+        return self.results.pop(0)
+
+
+def _run(pipeline, frames):
+    regions = []
+    for seq in range(frames):
+        result = pipeline._infer(pipeline._preprocess(FrameResult(seq, 0.0, _frame())))
+        regions.append(result.region)
+    return regions
+
+
+def test_tracking_detector_only_ever_sees_whole_frames():
+    recognizer = RecordingRecognizer([[_hand(0.4, 0.4, 0.5, 0.5)] for _ in range(5)], tracks_hands=True)
+    pipeline = GesturePipeline(camera_controller=None, gesture_recognizer=recognizer)
+    assert _run(pipeline, 5) == [FULL_FRAME] * 5
+    assert set(recognizer.shapes) == {(480, 640)}
+    assert pipeline.roi_tracker.stats()['roi_detections'] == 0
+
+
+def test_crop_miss_falls_back_to_the_whole_frame():
+    recognizer = RecordingRecognizer([[_hand(0.4, 0.4, 0.5, 0.5)], [], [_hand(0.4, 0.4, 0.5, 0.5)]],
+                                     tracks_hands=False)
+    pipeline = GesturePipeline(camera_controller=None, gesture_recognizer=recognizer)
+    pipeline.roi_tracker.roi_size = 96
+    
+    first, second = _run(pipeline, 2)
+    assert first == FULL_FRAME
+    # The crop missed, so the same frame was searched again as a whole
+    assert second == FULL_FRAME
+    assert recognizer.shapes[1][0] <= 96 and recognizer.shapes[2] == (480, 640)
+    assert pipeline.roi_tracker.stats()['roi_misses'] == 1
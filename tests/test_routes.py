@@ -0,0 +1,102 @@
+"""Tests for the Server-Sent Events chat stream"""
+import json
+
+import pytest
+from flask import Flask
+
+from jarvis.api import routes
+
+
+def _events(body):
+    """Parse an SSE body into (event, data) pairs"""
+    events = []
+    for frame in body.split("\n\n"):
+        if not frame:
+            continue
+        event = None
+        for line in frame.split("\n"):
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                data = json.loads(line[len("data: "):])
+        events.append((event, data))
+    return events
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(routes, "is_api_configured", lambda: True)
+    app = Flask(__name__)
+    routes.register_routes(app)
+    return app.test_client()
+
+
+def test_tokens_are_sent_as_data_events_then_done(client, monkeypatch):
+    monkeypatch.setattr(routes, "stream_prompt", lambda prompt, user_id: iter(["Hel", "lo ", prompt]))
+    response = client.post("/api/chat/stream", json={"message": "there"})
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    assert response.headers["Cache-Control"] == "no-cache"
+    
+    events = _events(response.get_data(as_text=True))
+    assert events[:3] == [(None, {"token": "Hel"}), (None, {"token": "lo "}), (None, {"token": "there"})]
+    event, data = events[-1]
+    assert event == "done"
+    assert data["ttft_ms"] is not None and data["total_ms"] >= data["ttft_ms"]
+    assert len(events) == 4
+
+
+def test_session_streams_use_the_session(client, monkeypatch):
+    calls = []
+    
+    def stream_chat(prompt, session_id, user_id):
+        calls.append((prompt, session_id))
+        yield "ok"
+    
+    monkeypatch.setattr(routes, "stream_chat", stream_chat)
+    response = client.post("/api/chat/stream", json={"message": "hi", "session_id": "s1"})
+    assert _events(response.get_data(as_text=True))[0] == (None, {"token": "ok"})
+    assert calls == [("hi", "s1")]
+
+
+def test_upstream_failure_mid_stream_ends_with_an_error_event(client, monkeypatch):
+    def failing(prompt, user_id):
+        yield "partial"
+        raise RuntimeError("upstream went away")
+    
+    monkeypatch.setattr(routes, "stream_prompt", failing)
+    events = _events(client.post("/api/chat/stream", json={"message": "x"}).get_data(as_text=True))
+    assert events == [(None, {"token": "partial"}), ("error", {"error": "upstream went away"})]
+
+
+def test_client_disconnect_closes_the_upstream_stream(client, monkeypatch):
+    state = {"sent": 0, "closed": False}
+    
+    def endless(prompt, user_id):
+        try:
+            while True:
+                state["sent"] += 1
+                yield "token"
+        finally:
+            state["closed"] = True
+    
+    monkeypatch.setattr(routes, "stream_prompt", endless)
+    response = client.post("/api/chat/stream", json={"message": "x"}, buffered=False)
+    chunks = iter(response.response)
+    next(chunks)
+    next(chunks)
+    response.close()
+    assert state["closed"]
+    assert state["sent"] == 2
+
+
+def test_empty_message_is_rejected_before_streaming(client):
+    response = client.post("/api/chat/stream", json={"message": ""})
+    assert response.status_code == 400
+    assert response.get_json()["success"] is False
+
+
+def test_unconfigured_api_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(routes, "is_api_configured", lambda: False)
+    response = client.post("/api/chat/stream", json={"message": "hi"})
+    assert response.status_code == 400
@@ -0,0 +1,117 @@
+"""Tests for the near-duplicate cache layer"""
+import numpy as np
+import pytest
+
+from jarvis.api import semantic_cache
+from jarvis.api.semantic_cache import (
+    NormalizedCache, SemanticCache, benchmark, canonical_prompt, create_semantic_cache,
+    meaning_markers
+)
+
+
+def fixed_embedder(similarities):
+    """Embed "base" on the x axis and every other prompt at its given cosine similarity to it"""
+    def embed(text):
+        cosine = 1.0 if text == "base" else similarities[text]
+        return np.array([cosine, np.sqrt(1.0 - cosine ** 2)], dtype=np.float32)
+    return embed
+
+
+def test_canonical_prompt_drops_case_punctuation_and_filler():
+    assert canonical_prompt("Hey Jarvis, what's the time?") == canonical_prompt("whats the time")
+    assert canonical_prompt("Can you help me?") != canonical_prompt("Can I help you?")
+
+
+def test_canonical_prompt_drops_framing_openings():
+    assert canonical_prompt("what's the weather in kolkata") == canonical_prompt("weather in Kolkata?")
+    assert canonical_prompt("Tell me a joke") == canonical_prompt("a joke")
+    assert canonical_prompt("who made you") != canonical_prompt("made you")
+
+
+@pytest.mark.parametrize("prompt", ["hi", "OK", "hey jarvis", "Hi!", "um... okay"])
+def test_filler_only_prompts_have_no_canonical_form(prompt):
+    assert canonical_prompt(prompt) == ""
+
+
+def test_filler_only_prompts_are_not_cached():
+    cache = NormalizedCache()
+    cache.set("hi", "Hello! How can I help?")
+    assert cache.get("hey jarvis") is None
+    assert cache.stats()['entries'] == 0
+    
+    embedded = []
+    semantic = SemanticCache(lambda text: embedded.append(text) or np.ones(2, np.float32) / np.sqrt(2),
+                             dim=2, threshold=0.9)
+    semantic.set("ok", "Okay!")
+    assert semantic.get("hi") is None
+    assert embedded == []
+    assert semantic.stats()['entries'] == 0
+
+
+def test_meaning_markers():
+    assert meaning_markers("Is it not safe?") == {"not"}
+    assert meaning_markers("I don't know") == {"dont"}
+    assert meaning_markers("alarm at 7am") == {"7", "am"}
+    assert meaning_markers("tell me a joke") == frozenset()
+
+
+def test_normalized_cache_matches_rewordings_only():
+    cache = NormalizedCache()
+    cache.set("What's the weather in Kolkata?", "sunny")
+    assert cache.get("hey jarvis whats the weather in kolkata") == "sunny"
+    assert cache.get("What's the weather in Mumbai?") is None
+    assert cache.stats()['backend'] == "normalized"
+
+
+@pytest.mark.parametrize("similarity, hit", [(0.95, True), (0.9, True), (0.89, False), (0.5, False)])
+def test_semantic_cache_threshold(similarity, hit):
+    cache = SemanticCache(fixed_embedder({"query": similarity}), dim=2, threshold=0.9)
+    cache.set("base", "answer")
+    assert (cache.get("query") == "answer") is hit
+
+
+def test_semantic_cache_requires_matching_markers():
+    similarities = {"is it not safe": 0.99, "alarm 7 pm": 0.99}
+    cache = SemanticCache(fixed_embedder(similarities), dim=2, threshold=0.9)
+    cache.set("base", "answer")
+    assert cache.get("is it not safe") is None
+    assert cache.get("alarm 7 pm") is None
+    assert cache.stats()['misses'] == 2
+
+
+def test_semantic_cache_prefers_closest_match_with_same_markers():
+    embeddings = {
+        "near": np.array([1.0, 0.0], dtype=np.float32),
+        "not near": np.array([1.0, 0.0], dtype=np.float32),
+        "query": np.array([0.96, 0.28], dtype=np.float32),
+    }
+    cache = SemanticCache(embeddings.__getitem__, dim=2, threshold=0.9)
+    cache.set("not near", "negated")
+    cache.set("near", "plain")
+    assert cache.get("query") == "plain"
+
+
+def test_semantic_cache_evicts_to_capacity():
+    vectors = {f"p{i}": np.eye(4, dtype=np.float32)[i] for i in range(4)}
+    cache = SemanticCache(vectors.__getitem__, dim=4, threshold=0.9, max_entries=3)
+    for key in ["p0", "p1", "p2", "p3"]:
+        cache.set(key, key)
+    assert cache.stats()['entries'] == 3
+    assert cache.stats()['evictions'] == 1
+    assert cache.get("p3") == "p3"
+
+
+def test_create_semantic_cache_falls_back_without_model(monkeypatch):
+    assert create_semantic_cache(False) is None
+    assert isinstance(create_semantic_cache(True), NormalizedCache)
+    monkeypatch.setattr(semantic_cache, "SENTENCE_TRANSFORMERS_AVAILABLE", False)
+    assert isinstance(create_semantic_cache(True, "all-MiniLM-L6-v2"), NormalizedCache)
+
+
+def test_benchmark_normalized_matching_has_no_false_hits():
+    result = benchmark(entries=64)
+    assert result['backend'] == "normalized"
+    assert result['false_hit_rate'] == 0.0
+    assert result['precision'] == 1.0
+    # Only the rewordings match; real paraphrases need an embedding model
+    assert result['recall'] == pytest.approx(4 / 9, abs=0.001)
@@ -0,0 +1,82 @@
+"""Tests for draining the waitress server on shutdown"""
+import http.client
+import threading
+import time
+
+import pytest
+
+from jarvis.web import serve
+
+waitress = pytest.importorskip("waitress")
+
+
+def _slow_app(started, release):
+    def app(environ, start_response):
+        started.set()
+        release.wait(5)
+        start_response("200 OK", [("Content-Type", "text/plain")])
+        return [b"finished"]
+    return app
+
+
+def _get(port):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    conn.request("GET", "/")
+    response = conn.getresponse()
+    return response.status, response.read()
+
+
+def test_in_flight_request_finishes_after_stop_is_requested():
+    started, release, stopping = threading.Event(), threading.Event(), threading.Event()
+    server = waitress.create_server(_slow_app(started, release), host="127.0.0.1", port=0, threads=2,
+                                    asyncore_loop_timeout=0.1)
+    port = server.effective_port
+    runner = threading.Thread(target=serve.run_waitress, args=(server, stopping, 5))
+    runner.start()
+    
+    results = []
+    client = threading.Thread(target=lambda: results.append(_get(port)))
+    client.start()
+    assert started.wait(5)
+    
+    stopping.set()
+    time.sleep(0.3)
+    # The listener is closed while the accepted request is still running
+    with pytest.raises(OSError):
+        _get(port)
+    release.set()
+    
+    client.join(5)
+    runner.join(5)
+    assert results == [(200, b"finished")]
+    assert not runner.is_alive()
+    assert server.task_dispatcher.threads == set()
+
+
+def test_drain_gives_up_after_the_grace_period():
+    started, release, stopping = threading.Event(), threading.Event(), threading.Event()
+    server = waitress.create_server(_slow_app(started, release), host="127.0.0.1", port=0, threads=1,
+                                    asyncore_loop_timeout=0.1)
+    runner = threading.Thread(target=serve.run_waitress, args=(server, stopping, 0.2))
+    runner.start()
+    outcome = []
+    
+    def request():
+        try:
+            outcome.append(_get(server.effective_port))
+        except OSError as e:
+            outcome.append(e)
+    
+    client = threading.Thread(target=request)
+    client.start()
+    assert started.wait(5)
+    
+    begun = time.monotonic()
+    stopping.set()
+    runner.join(3)
+    assert not runner.is_alive()
+    assert time.monotonic() - begun < 3
+    # The abandoned request's connection is closed without a response
+    client.join(5)
+    assert isinstance(outcome[0], OSError)
+    release.set()
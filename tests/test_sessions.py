@@ -0,0 +1,70 @@
+"""Tests for server-side conversation sessions"""
+from jarvis.api import sessions as sessions_module
+from jarvis.api.sessions import SessionStore, estimate_tokens
+
+
+def test_turns_are_kept_while_within_budget():
+    store = SessionStore(history_tokens=1000)
+    session = store.get("s")
+    store.record_turn(session, "hello", "hi there")
+    store.record_turn(session, "how are you", "fine")
+    assert session.turns == [("hello", "hi there"), ("how are you", "fine")]
+    assert session.to_history()[0] == {'role': 'user', 'parts': ["hello"]}
+    assert store.stats()['compactions'] == 0
+
+
+def test_old_turns_are_folded_into_a_bounded_summary():
+    store = SessionStore(history_tokens=200)
+    session = store.get("s")
+    for i in range(20):
+        store.record_turn(session, f"question {i} " + "x" * 80, f"answer {i} " + "y" * 80)
+    
+    assert session.history_tokens() <= 200
+    assert session.turns[-1][0].startswith("question 19")
+    assert sum(estimate_tokens(line) for line in session.summary_lines) <= 200 // 4
+    assert store.stats()['compactions'] > 0
+    history = session.to_history()
+    assert history[0]['parts'][0].startswith("Summary of earlier conversation:")
+    assert history[1] == {'role': 'model', 'parts': ["Understood."]}
+
+
+def test_latest_turn_is_kept_even_if_over_budget():
+    store = SessionStore(history_tokens=10)
+    session = store.get("s")
+    store.record_turn(session, "a" * 400, "b" * 400)
+    assert len(session.turns) == 1
+
+
+def test_memory_accounting_follows_compaction_and_delete():
+    store = SessionStore(history_tokens=100)
+    session = store.get("s")
+    for i in range(10):
+        store.record_turn(session, "q" * 100, "a" * 100)
+    assert store.stats()['memory_bytes'] == session.size_bytes()
+    assert store.delete("s")
+    assert store.stats()['memory_bytes'] == 0
+    assert not store.delete("s")
+
+
+def test_least_recently_used_sessions_are_evicted():
+    store = SessionStore(max_sessions=2)
+    store.get("a")
+    store.get("b")
+    store.get("a")
+    store.get("c")
+    assert store.stats()['sessions'] == 2
+    assert store.stats()['evictions'] == 1
+    assert store.get("a").turns == []
+    assert store.stats()['evictions'] == 1
+
+
+def test_idle_sessions_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(sessions_module.time, "time", lambda: now[0])
+    store = SessionStore(idle_timeout=60)
+    session = store.get("old")
+    store.record_turn(session, "hi", "hello")
+    now[0] += 61
+    assert store.get("new").session_id == "new"
+    assert store.stats()['sessions'] == 1
+    assert store.get("old").turns == []
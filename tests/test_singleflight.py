@@ -0,0 +1,85 @@
+"""Tests for request coalescing"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from jarvis.api.singleflight import SingleFlight
+
+
+def test_concurrent_calls_with_same_key_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+    
+    def slow(value):
+        calls.append(value)
+        release.wait(5)
+        return value * 2
+    
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [executor.submit(flight.do, "key", slow, 21) for _ in range(5)]
+        # Let every caller join before the leader finishes
+        while flight.stats()['deduplicated'] < 4:
+            time.sleep(0.001)
+        release.set()
+        results = [future.result(5) for future in futures]
+    
+    assert results == [42] * 5
+    assert calls == [21]
+    assert flight.stats() == {'in_flight': 0, 'executed': 1, 'deduplicated': 4}
+
+
+def test_different_keys_and_later_calls_run_separately():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+    assert flight.do("a", lambda: 3) == 3
+    assert flight.stats()['executed'] == 3
+
+
+def test_exception_reaches_every_waiter_and_is_not_cached():
+    flight = SingleFlight()
+    
+    def fail():
+        raise ValueError("upstream down")
+    
+    with pytest.raises(ValueError):
+        flight.do("key", fail)
+    assert flight.do("key", lambda: "recovered") == "recovered"
+
+
+def test_do_async_shares_one_task():
+    flight = SingleFlight()
+    calls = []
+    
+    async def slow(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value
+    
+    async def main():
+        return await asyncio.gather(*(flight.do_async("key", slow, "x") for _ in range(4)))
+    
+    assert asyncio.run(main()) == ["x"] * 4
+    assert calls == ["x"]
+    assert flight.stats() == {'in_flight': 0, 'executed': 1, 'deduplicated': 3}
+
+
+def test_cancelled_waiter_does_not_cancel_shared_call():
+    flight = SingleFlight()
+    
+    async def slow():
+        await asyncio.sleep(0.02)
+        return "done"
+    
+    async def main():
+        first = asyncio.ensure_future(flight.do_async("key", slow))
+        second = asyncio.ensure_future(flight.do_async("key", slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+    
+    assert asyncio.run(main()) == "done"
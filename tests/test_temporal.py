@@ -0,0 +1,113 @@
+"""Tests for temporal gesture filtering"""
+import numpy as np
+
+from jarvis.desktop.motion.temporal import GestureSmoother, SwipeDetector
+
+
+def _feed(smoother, gestures, fps=30.0, start=0.0, confidence=1.0):
+    """Feed one prediction per frame and return (timestamp, fired) for every event"""
+    fired = []
+    for index, gesture in enumerate(gestures):
+        timestamp = start + index / fps
+        event = smoother.update(gesture, confidence, timestamp)
+        if event:
+            fired.append((timestamp, event))
+    return fired
+
+
+def test_held_gesture_fires_once():
+    smoother = GestureSmoother(window=0.5, enter=0.6, release=0.3, cooldown=1.0)
+    fired = _feed(smoother, ["open palm"] * 90)
+    assert [event for _, event in fired] == ["open palm"]
+    # Not before half a window of evidence
+    assert fired[0][0] >= 0.25
+
+
+def test_timing_does_not_depend_on_frame_rate():
+    for fps in (10.0, 30.0, 120.0):
+        smoother = GestureSmoother(window=0.5, cooldown=1.0)
+        fired = _feed(smoother, ["fist"] * int(fps * 2), fps=fps)
+        assert len(fired) == 1
+        assert 0.25 <= fired[0][0] <= 0.35
+
+
+def test_single_frame_glitches_are_ignored():
+    smoother = GestureSmoother(window=0.5, enter=0.6, release=0.3, cooldown=0.0)
+    frames = ["open palm"] * 30
+    frames[20] = "fist"
+    frames[25] = "thumbs down"
+    fired = _feed(smoother, frames)
+    assert [event for _, event in fired] == ["open palm"]
+
+
+def test_hysteresis_keeps_state_until_share_drops_below_release():
+    smoother = GestureSmoother(window=0.5, enter=0.6, release=0.3, cooldown=0.0)
+    _feed(smoother, ["open palm"] * 30)
+    assert smoother.state == "open palm"
+    # Mixed frames keep the palm above the release share: no new event
+    mixed = ["open palm", "fist"] * 15
+    assert _feed(smoother, mixed, start=1.0) == []
+    assert smoother.state == "open palm"
+
+
+def test_new_gesture_fires_after_the_old_one_is_released():
+    smoother = GestureSmoother(window=0.5, enter=0.6, release=0.3, cooldown=0.0)
+    fired = _feed(smoother, ["open palm"] * 30 + ["fist"] * 30)
+    assert [event for _, event in fired] == ["open palm", "fist"]
+
+
+def test_cooldown_suppresses_quick_repeats():
+    smoother = GestureSmoother(window=0.2, cooldown=2.0)
+    frames = ["fist"] * 15 + [None] * 15 + ["fist"] * 15
+    assert len(_feed(smoother, frames)) == 1
+    smoother = GestureSmoother(window=0.2, cooldown=0.5)
+    assert len(_feed(smoother, frames)) == 2
+
+
+def test_gesture_held_through_the_cooldown_fires_when_it_expires():
+    smoother = GestureSmoother(window=0.2, cooldown=1.0)
+    fired = _feed(smoother, ["fist"] * 15 + ["open palm"] * 45)
+    assert [event for _, event in fired] == ["fist", "open palm"]
+    first, second = fired[0][0], fired[1][0]
+    assert second - first >= 1.0
+    assert second - first < 1.0 + 2 / 30.0
+
+
+def test_gesture_released_during_the_cooldown_never_fires():
+    smoother = GestureSmoother(window=0.2, cooldown=1.0)
+    fired = _feed(smoother, ["fist"] * 15 + ["open palm"] * 12 + [None] * 30)
+    assert [event for _, event in fired] == ["fist"]
+
+
+def test_no_hand_and_unknown_never_fire():
+    smoother = GestureSmoother(window=0.5, cooldown=0.0)
+    assert _feed(smoother, [None] * 30 + ["Unknown"] * 30 + ["None"] * 30) == []
+
+
+def test_low_confidence_predictions_need_more_agreement():
+    smoother = GestureSmoother(window=0.5, enter=0.6, release=0.3, cooldown=0.0)
+    assert _feed(smoother, ["fist"] * 30, confidence=0.5) == []
+    assert len(_feed(smoother, ["fist"] * 30, start=2.0, confidence=0.9)) == 1
+
+
+def test_reset_forgets_the_held_gesture():
+    smoother = GestureSmoother(window=0.5, cooldown=0.0)
+    _feed(smoother, ["fist"] * 30)
+    smoother.reset()
+    assert smoother.state is None
+    assert len(_feed(smoother, ["fist"] * 30, start=5.0)) == 1
+
+
+def test_swipe_is_detected_and_mirrored():
+    detector = SwipeDetector(window=0.4, min_distance=0.25, cooldown=0.0)
+    events = [detector.update(np.array([0.8 - 0.05 * i, 0.5]), i / 30) for i in range(10)]
+    assert "swipe right" in events
+    detector.reset()
+    events = [detector.update(np.array([0.5, 0.8 - 0.05 * i]), 1 + i / 30) for i in range(10)]
+    assert "swipe up" in events
+
+
+def test_slow_drift_is_not_a_swipe():
+    detector = SwipeDetector(window=0.4, min_distance=0.25, cooldown=0.0)
+    events = [detector.update(np.array([0.2 + 0.002 * i, 0.5]), i / 30) for i in range(120)]
+    assert not any(events)
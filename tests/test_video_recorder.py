@@ -0,0 +1,133 @@
+"""Tests for background video recording, against a fake video writer"""
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from jarvis.desktop.camera import video_recorder
+from jarvis.desktop.camera.video_recorder import VideoRecorder
+
+
+class FakeWriter:
+    """Records frames instead of encoding them; writes wait while `gate` is closed"""
+    
+    def __init__(self, path, gate):
+        self.path = path
+        self.gate = gate
+        self.frames = []
+        self.released = False
+    
+    def write(self, frame):
+        self.gate.wait(5)
+        self.frames.append(int(frame[0, 0, 0]))
+    
+    def release(self):
+        self.released = True
+
+
+@pytest.fixture
+def recorder(tmp_path, monkeypatch):
+    gate = threading.Event()
+    gate.set()
+    writers = []
+    
+    def open_writer(self, shape):
+        self.segments.append(str(tmp_path / f"{self._prefix}_{len(self.segments) + 1:03d}.mp4"))
+        writers.append(FakeWriter(self.segments[-1], gate))
+        return writers[-1]
+    
+    monkeypatch.setattr(VideoRecorder, "_open_writer", open_writer)
+    recorder = VideoRecorder(str(tmp_path), fps=10, segment_seconds=0, segment_mb=0, queue_size=2)
+    recorder.gate = gate
+    recorder.writers = writers
+    yield recorder
+    gate.set()
+    if recorder.is_recording():
+        recorder.stop()
+
+
+def _frame(value, size=4):
+    return np.full((size, size, 3), value, dtype=np.uint8)
+
+
+def _record(recorder, timestamps):
+    assert recorder.start()[0]
+    for index, timestamp in enumerate(timestamps):
+        assert recorder.write(_frame(index), timestamp, block=True)
+    return recorder.stop()
+
+
+def test_frames_are_encoded_in_order_on_the_encoder_thread(recorder):
+    threads = []
+    write = FakeWriter.write
+    FakeWriter.write = lambda self, frame: threads.append(threading.current_thread().name) or write(self, frame)
+    try:
+        success, msg = _record(recorder, [index / 10 for index in range(20)])
+    finally:
+        FakeWriter.write = write
+    
+    assert success and "Video saved" in msg
+    assert recorder.writers[0].frames == list(range(20))
+    assert recorder.writers[0].released
+    assert set(threads) == {"video-encoder"}
+    assert recorder.stats()['frames_written'] == 20
+
+
+def test_short_gaps_are_filled_and_long_stalls_are_cut(recorder):
+    # One frame missing, then a 2-second stall
+    _record(recorder, [0.0, 0.1, 0.3, 0.4, 2.4, 2.5])
+    frames = recorder.writers[0].frames
+    assert frames == [0, 1, 2, 2, 3, 4, 4, 4, 5]
+    assert recorder.frames_cut == 20 - video_recorder._MAX_REPEATS
+    assert recorder.frames_written == len(frames)
+
+
+def test_frames_faster_than_fps_are_skipped(recorder):
+    _record(recorder, [index / 30 for index in range(9)])
+    # Each output slot takes the frame nearest its time
+    assert recorder.writers[0].frames == [0, 2, 5, 8]
+
+
+def test_segments_rotate_by_duration(recorder):
+    recorder.segment_frames = 10
+    success, msg = _record(recorder, [index / 10 for index in range(25)])
+    assert success and "2 more segment(s)" in msg
+    assert [len(writer.frames) for writer in recorder.writers] == [10, 10, 5]
+    assert all(writer.released for writer in recorder.writers)
+    # Each segment starts where the previous one ended
+    assert recorder.writers[1].frames[0] == 10 and recorder.writers[2].frames[0] == 20
+
+
+def test_frames_are_dropped_when_every_buffer_waits_for_the_encoder(recorder):
+    recorder.gate.clear()
+    assert recorder.start()[0]
+    results = [recorder.write(_frame(index), index / 10) for index in range(10)]
+    
+    # The encoder holds one buffer; the rest of the pool fills the queue
+    assert results[:recorder.pool_size] == [True] * recorder.pool_size
+    assert not all(results)
+    assert recorder.frames_dropped == results.count(False)
+    assert recorder._allocated == recorder.pool_size
+    
+    recorder.gate.set()
+    deadline = time.monotonic() + 2
+    while recorder._free.qsize() < recorder.pool_size and time.monotonic() < deadline:
+        time.sleep(0.01)
+    buffers = {id(buffer) for buffer in list(recorder._free.queue)}
+    assert recorder.write(_frame(99), 1.0)
+    assert recorder._allocated == recorder.pool_size
+    success, msg = recorder.stop()
+    assert success and "frames dropped" in msg
+    # Every frame after the first fill reused a pooled buffer
+    assert buffers <= {id(buffer) for buffer in list(recorder._free.queue)}
+
+
+def test_recordings_started_in_the_same_second_get_distinct_files(recorder, monkeypatch):
+    monkeypatch.setattr(video_recorder.time, "time", lambda: 1_700_000_000.25)
+    prefixes = []
+    for _ in range(3):
+        _record(recorder, [0.0])
+        prefixes.append(recorder._prefix)
+    assert len(set(prefixes)) == 3
+    assert len({writer.path for writer in recorder.writers}) == 3